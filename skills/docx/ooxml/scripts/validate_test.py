@@ -0,0 +1,114 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import lxml.etree
+
+from validate import validate_document
+from validation.base import BaseSchemaValidator
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def document_xml(body):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    )
+
+
+def write_docx(path, body):
+    """Write a minimal .docx whose w:body holds the given XML."""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+        zf.writestr("_rels/.rels", PACKAGE_RELS)
+        zf.writestr("word/document.xml", document_xml(body))
+
+
+def write_edit(directory, name, original_body, edited_body):
+    """Write an original .docx and its unpacked copy with an edited w:body."""
+    original = directory / f"{name}.docx"
+    write_docx(original, original_body)
+    unpacked = directory / name
+    with zipfile.ZipFile(original) as zf:
+        zf.extractall(unpacked)
+    (unpacked / "word" / "document.xml").write_text(document_xml(edited_body))
+    return unpacked, original
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestBatchValidation(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        original = "<w:p><w:r><w:t>Pay within 30 days</w:t></w:r></w:p>"
+        tracked = (
+            '<w:p><w:r><w:t xml:space="preserve">Pay within </w:t></w:r>'
+            '<w:del w:id="1" w:author="Claude"><w:r><w:delText>30</w:delText></w:r>'
+            '</w:del><w:ins w:id="2" w:author="Claude"><w:r><w:t>45</w:t></w:r>'
+            '</w:ins><w:r><w:t xml:space="preserve"> days</w:t></w:r></w:p>'
+        )
+        # An untracked edit next to a tracked one fails redlining with a git diff
+        untracked = tracked.replace("days", "weeks")
+        self.entries = [
+            write_edit(self.dir, "tracked", original, tracked),
+            write_edit(self.dir, "untracked", original, untracked),
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_batch_matches_separate_runs(self):
+        separate = [validate_document(*entry) for entry in self.entries]
+        self.assertEqual([r["valid"] for r in separate], [True, False])
+        self.assertIn("Differences:", separate[1]["output"])
+
+        manifest = self.dir / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                [
+                    {"unpacked_dir": str(unpacked), "original": str(original)}
+                    for unpacked, original in self.entries
+                ]
+            )
+        )
+        result = subprocess.run(
+            [sys.executable, "validate.py", "--batch", str(manifest), "-j", "2"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 1)
+        # The report is the only output: git's diff stays in its entry
+        self.assertEqual(result.stderr, "")
+        self.assertEqual(json.loads(result.stdout), separate)
+
+    def test_schemas_compiled_once(self):
+        BaseSchemaValidator._schema_cache.clear()
+        expected = validate_document(*self.entries[0])
+        self.assertTrue(BaseSchemaValidator._schema_cache)
+        with mock.patch.object(
+            lxml.etree, "XMLSchema", side_effect=AssertionError("recompiled")
+        ):
+            self.assertEqual(validate_document(*self.entries[0]), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -103,6 +103,10 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
+    # Compiled XSD schemas keyed by schema path, shared by all validators in the
+    # process so batch runs compile each schema once per worker
+    _schema_cache = {}
+
     def __init__(self, unpacked_dir, original_file, verbose=False):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
@@ -830,13 +834,7 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            schema = self._load_schema(schema_path)
 
             # Load and preprocess XML
             with open(xml_file, "r") as f:
@@ -866,6 +864,19 @@ class BaseSchemaValidator:
         except Exception as e:
             return False, {str(e)}
 
+    @classmethod
+    def _load_schema(cls, schema_path):
+        """Load and compile an XSD schema, reusing a cached compiled copy."""
+        key = str(schema_path)
+        schema = cls._schema_cache.get(key)
+        if schema is None:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            cls._schema_cache[key] = schema
+        return schema
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
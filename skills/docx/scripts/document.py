@@ -17,6 +17,10 @@ Usage:
     doc.add_comment(start=node, end=node, text="Comment text")
     doc.reply_to_comment(parent_comment_id=0, text="Reply text")
 
+    # Find text that spans several runs
+    para, start = doc.find_text("within 30 days")[0]
+    runs = para.runs_between(start, start + len("within 30 days"))
+
     # Suggest tracked changes
     doc["word/document.xml"].suggest_deletion(node)  # Delete content
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
@@ -26,6 +30,7 @@ Usage:
     doc.save()
 """
 
+import bisect
 import html
 import random
 import shutil
@@ -44,6 +49,247 @@ from .utilities import XMLEditor
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
 
+class TextSpan:
+    """A w:t element's slice of its paragraph's concatenated text.
+
+    Attributes:
+        start: Offset of the first character within the paragraph text
+        end: Offset one past the last character within the paragraph text
+        run: The enclosing w:r element (None for a w:t without a run parent)
+        text_elem: The w:t element holding the characters
+    """
+
+    def __init__(self, start, end, run, text_elem):
+        self.start = start
+        self.end = end
+        self.run = run
+        self.text_elem = text_elem
+
+    def __repr__(self):
+        return f"TextSpan({self.start}, {self.end})"
+
+
+class ParagraphText:
+    """Concatenated text of a single w:p with run boundaries.
+
+    Only w:t content is indexed; deleted text (w:delText), tabs and breaks do not
+    contribute characters. Text of nested paragraphs (text boxes, tables inside
+    content controls) belongs to those paragraphs, not to the enclosing one.
+
+    Attributes:
+        elem: The w:p element
+        index: Position of the paragraph in document order
+    """
+
+    def __init__(self, elem, index):
+        self.elem = elem
+        self.index = index
+        self._text = None
+        self._spans = None
+        self._starts = None
+
+    @property
+    def text(self) -> str:
+        """Concatenated w:t text of this paragraph."""
+        if self._text is None:
+            self._build()
+        return self._text  # type: ignore
+
+    @property
+    def spans(self) -> list:
+        """TextSpan entries in document order, one per non-empty w:t."""
+        if self._spans is None:
+            self._build()
+        return self._spans  # type: ignore
+
+    def invalidate(self):
+        """Drop cached text so it is rebuilt from the DOM on next access."""
+        self._text = None
+        self._spans = None
+        self._starts = None
+
+    def locate(self, offset: int) -> TextSpan:
+        """Get the span containing the character at offset.
+
+        Args:
+            offset: Character offset within the paragraph text
+
+        Returns:
+            TextSpan: The span whose w:t holds that character
+
+        Raises:
+            ValueError: If offset is outside the paragraph text
+        """
+        spans = self.spans
+        if not 0 <= offset < len(self.text):
+            raise ValueError(
+                f"Offset {offset} out of range for paragraph of length {len(self.text)}"
+            )
+        return spans[bisect.bisect_right(self._starts, offset) - 1]  # type: ignore
+
+    def runs_between(self, start: int, end: int) -> list:
+        """Get the spans overlapping the character range [start, end).
+
+        The first and last spans may extend beyond the range; compare their
+        start/end with the range to know where to split the runs.
+
+        Args:
+            start: Offset of the first character
+            end: Offset one past the last character
+
+        Returns:
+            list[TextSpan]: Overlapping spans in document order
+        """
+        spans = self.spans
+        if start >= end:
+            return []
+        first = bisect.bisect_right(self._starts, start) - 1  # type: ignore
+        result = []
+        for span in spans[max(first, 0) :]:
+            if span.start >= end:
+                break
+            if span.end > start:
+                result.append(span)
+        return result
+
+    def _build(self):
+        """Collect w:t text of this paragraph in a single walk of its subtree."""
+        spans = []
+        parts = []
+        offset = 0
+        stack = list(reversed(self.elem.childNodes))
+        while stack:
+            node = stack.pop()
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            if node.tagName == "w:p":
+                # Nested paragraphs are indexed on their own
+                continue
+            if node.tagName == "w:t":
+                text = "".join(
+                    child.data
+                    for child in node.childNodes
+                    if child.nodeType == child.TEXT_NODE
+                )
+                if text:
+                    run = node.parentNode
+                    if run is None or run.nodeName != "w:r":
+                        run = None
+                    spans.append(TextSpan(offset, offset + len(text), run, node))
+                    parts.append(text)
+                    offset += len(text)
+                continue
+            stack.extend(reversed(node.childNodes))
+        self._text = "".join(parts)
+        self._spans = spans
+        self._starts = [span.start for span in spans]
+
+
+class DocumentTextModel:
+    """Paragraph-level read model over a WordprocessingML DOM.
+
+    Built lazily in one pass over all w:p elements and kept in sync by
+    DocxXMLEditor: edits inside a paragraph only invalidate that paragraph,
+    while edits that add or remove paragraphs rebuild the paragraph list.
+    Call invalidate() after manipulating the DOM directly.
+
+    Example:
+        model = doc["word/document.xml"].text_model
+        for para, start in model.find("within 30 days"):
+            spans = para.runs_between(start, start + len("within 30 days"))
+    """
+
+    def __init__(self, dom):
+        self.dom = dom
+        self._paragraphs = None
+        self._by_elem = {}
+
+    @property
+    def paragraphs(self) -> list:
+        """ParagraphText entries for every w:p in document order."""
+        if self._paragraphs is None:
+            self._build()
+        return self._paragraphs  # type: ignore
+
+    def paragraph_for(self, node):
+        """Get the ParagraphText for the w:p containing node (or node itself).
+
+        Args:
+            node: Any DOM node inside word/document.xml
+
+        Returns:
+            ParagraphText or None if node is not inside a paragraph
+        """
+        if self._paragraphs is None:
+            self._build()
+        return self._by_elem.get(_enclosing_paragraph(node))
+
+    def find(self, text: str) -> list:
+        """Find all occurrences of text, including matches that span several runs.
+
+        Args:
+            text: Text to search for. Supports both entity notation (&#8220;) and
+                  Unicode characters (\u201c), like XMLEditor.get_node(contains=...).
+
+        Returns:
+            list[tuple[ParagraphText, int]]: (paragraph, start offset) per match
+        """
+        needle = html.unescape(text)
+        if not needle:
+            return []
+        hits = []
+        for para in self.paragraphs:
+            haystack = para.text
+            pos = haystack.find(needle)
+            while pos != -1:
+                hits.append((para, pos))
+                pos = haystack.find(needle, pos + 1)
+        return hits
+
+    def invalidate(self, node=None):
+        """Invalidate cached text after an edit.
+
+        Args:
+            node: Node that was edited. If it lies inside a known paragraph only
+                  that paragraph is rebuilt; otherwise (or if None) the whole
+                  paragraph list is rebuilt on next access.
+        """
+        if node is not None and self._paragraphs is not None:
+            entry = self._by_elem.get(_enclosing_paragraph(node))
+            if entry is not None:
+                entry.invalidate()
+                return
+        self._paragraphs = None
+        self._by_elem = {}
+
+    def _build(self):
+        """Index all paragraphs; their text is collected on first access."""
+        self._paragraphs = [
+            ParagraphText(elem, i)
+            for i, elem in enumerate(self.dom.getElementsByTagName("w:p"))
+        ]
+        self._by_elem = {para.elem: para for para in self._paragraphs}
+
+
+def _enclosing_paragraph(node):
+    """Return the nearest w:p ancestor-or-self of node, or None."""
+    while node is not None:
+        if node.nodeType == node.ELEMENT_NODE and node.tagName == "w:p":
+            return node
+        node = node.parentNode
+    return None
+
+
+def _contains_paragraph(nodes):
+    """Check whether any of the given nodes is or contains a w:p element."""
+    for node in nodes:
+        if node.nodeType != node.ELEMENT_NODE:
+            continue
+        if node.tagName == "w:p" or node.getElementsByTagName("w:p"):
+            return True
+    return False
+
+
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
 
@@ -71,6 +317,28 @@ class DocxXMLEditor(XMLEditor):
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self._text_model = None
+
+    @property
+    def text_model(self) -> DocumentTextModel:
+        """Paragraph/run text model of this file, kept in sync with edits."""
+        if self._text_model is None:
+            self._text_model = DocumentTextModel(self.dom)
+        return self._text_model
+
+    def _invalidate_text(self, anchor, nodes=()):
+        """Invalidate the text model around an edit.
+
+        Args:
+            anchor: Node inside the edited paragraph (or its container)
+            nodes: Newly inserted nodes; inserting paragraphs rebuilds the list
+        """
+        if self._text_model is None:
+            return
+        if _contains_paragraph(nodes):
+            self._text_model.invalidate()
+        else:
+            self._text_model.invalidate(anchor)
 
     def _get_next_change_id(self):
         """Get the next available change ID by checking all tracked change elements."""
@@ -239,26 +507,32 @@ class DocxXMLEditor(XMLEditor):
 
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
+        parent = elem.parentNode
+        removes_paragraph = _contains_paragraph([elem])
         nodes = super().replace_node(elem, new_content)
         self._inject_attributes_to_nodes(nodes)
+        self._invalidate_text(parent, [elem] if removes_paragraph else nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
         """Insert after with automatic attribute injection."""
         nodes = super().insert_after(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        self._invalidate_text(elem.parentNode, nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
         """Insert before with automatic attribute injection."""
         nodes = super().insert_before(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        self._invalidate_text(elem.parentNode, nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
         """Append to with automatic attribute injection."""
         nodes = super().append_to(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        self._invalidate_text(elem, nodes)
         return nodes
 
     def revert_insertion(self, elem):
@@ -337,6 +611,7 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+        self._invalidate_text(elem)
         return [elem]
 
     def revert_deletion(self, elem):
@@ -529,6 +804,7 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+            self._invalidate_text(del_wrapper)
             return del_wrapper
 
         elif elem.nodeName == "w:p":
@@ -587,6 +863,7 @@ class DocxXMLEditor(XMLEditor):
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+            self._invalidate_text(elem)
             return elem
 
         else:
@@ -710,6 +987,23 @@ class Document:
             )
         return self._editors[xml_path]
 
+    def find_text(self, text: str) -> list:
+        """
+        Find text in word/document.xml, including matches split across runs.
+
+        Args:
+            text: Text to search for (entity notation and Unicode both work)
+
+        Returns:
+            list[tuple[ParagraphText, int]]: (paragraph, start offset) per match
+
+        Example:
+            para, start = doc.find_text("within 30 days")[0]
+            spans = para.runs_between(start, start + len("within 30 days"))
+            first_run = spans[0].run
+        """
+        return self._document.text_model.find(text)
+
     def add_comment(self, start, end, text: str) -> int:
         """
         Add a comment spanning from one element to another.
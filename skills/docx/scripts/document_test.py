@@ -0,0 +1,148 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from scripts.document import Document
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>"""
+
+SETTINGS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="{W_NS}"><w:defaultTabStop w:val="720"/></w:settings>"""
+
+
+def write_unpacked(path, body):
+    """Write a minimal unpacked .docx whose w:body holds the given XML."""
+    word = Path(path) / "word"
+    (word / "_rels").mkdir(parents=True)
+    (Path(path) / "_rels").mkdir()
+    (Path(path) / "[Content_Types].xml").write_text(CONTENT_TYPES)
+    (Path(path) / "_rels" / ".rels").write_text(PACKAGE_RELS)
+    (word / "_rels" / "document.xml.rels").write_text(DOCUMENT_RELS)
+    (word / "settings.xml").write_text(SETTINGS)
+    (word / "document.xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDocumentTextModel(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def open(self, body):
+        write_unpacked(self.dir / "unpacked", body)
+        with redirect_stdout(StringIO()):
+            doc = Document(self.dir / "unpacked")
+        self.addCleanup(doc.__del__)
+        return doc
+
+    def test_match_spanning_two_runs(self):
+        doc = self.open(
+            "<w:p><w:r><w:t>Pay within 3</w:t></w:r>"
+            "<w:r><w:rPr><w:b/></w:rPr><w:t>0 days</w:t></w:r></w:p>"
+        )
+        editor = doc["word/document.xml"]
+        # No single run contains the phrase, so get_node(contains=...) cannot find it
+        with self.assertRaises(ValueError):
+            editor.get_node(tag="w:r", contains="within 30 days")
+
+        hits = doc.find_text("within 30 days")
+        self.assertEqual(len(hits), 1)
+        para, start = hits[0]
+        self.assertEqual((para.index, start), (0, 4))
+
+        spans = para.runs_between(start, start + len("within 30 days"))
+        first_run, second_run = para.elem.getElementsByTagName("w:r")
+        self.assertEqual([span.run for span in spans], [first_run, second_run])
+        # The match starts inside the first run and ends with the second one
+        self.assertEqual(
+            [(span.start, span.end) for span in spans], [(0, 12), (12, 18)]
+        )
+
+    def test_offset_mapping(self):
+        doc = self.open(
+            "<w:p><w:r><w:t>ab</w:t></w:r>"
+            "<w:del><w:r><w:delText>gone</w:delText></w:r></w:del>"
+            "<w:r><w:t></w:t><w:tab/><w:t>cde</w:t></w:r>"
+            "<w:r><w:pict><w:txbxContent><w:p><w:r><w:t>box</w:t></w:r></w:p>"
+            "</w:txbxContent></w:pict></w:r>"
+            "<w:r><w:t>f</w:t></w:r></w:p>"
+        )
+        outer, inner = doc["word/document.xml"].text_model.paragraphs
+        # Deleted text, empty w:t and the text box paragraph contribute nothing
+        self.assertEqual(outer.text, "abcdef")
+        self.assertEqual(inner.text, "box")
+        self.assertEqual(
+            [(span.start, span.end) for span in outer.spans],
+            [(0, 2), (2, 5), (5, 6)],
+        )
+
+        expected = {0: "ab", 1: "ab", 2: "cde", 4: "cde", 5: "f"}
+        for offset, text in expected.items():
+            with self.subTest(offset=offset):
+                span = outer.locate(offset)
+                self.assertEqual(span.text_elem.firstChild.data, text)
+                self.assertIs(span.run, span.text_elem.parentNode)
+        for offset in (-1, 6):
+            with self.subTest(offset=offset), self.assertRaises(ValueError):
+                outer.locate(offset)
+
+        self.assertEqual(outer.runs_between(1, 3), outer.spans[:2])
+        self.assertEqual(outer.runs_between(3, 3), [])
+        model = doc["word/document.xml"].text_model
+        self.assertIs(model.paragraph_for(inner.spans[0].run), inner)
+
+    def test_edit_invalidates_only_the_edited_paragraph(self):
+        doc = self.open(
+            "<w:p><w:r><w:t>first draft</w:t></w:r></w:p>"
+            "<w:p><w:r><w:t>untouched</w:t></w:r></w:p>"
+        )
+        editor = doc["word/document.xml"]
+        model = editor.text_model
+        first, second = model.paragraphs
+        second_spans = second.spans
+        self.assertEqual(doc.find_text("draft")[0][0], first)
+
+        run = editor.get_node(tag="w:r", contains="first draft")
+        editor.replace_node(
+            run, "<w:r><w:t>final</w:t></w:r><w:r><w:t> text</w:t></w:r>"
+        )
+        self.assertEqual(doc.find_text("draft"), [])
+        self.assertEqual(doc.find_text("final text"), [(first, 0)])
+        self.assertEqual(len(first.spans), 2)
+        # The other paragraph keeps its cached spans and the list is not rebuilt
+        self.assertIs(second.spans, second_spans)
+        self.assertEqual(model.paragraphs, [first, second])
+
+        editor.insert_after(first.elem, "<w:p><w:r><w:t>inserted</w:t></w:r></w:p>")
+        texts = [para.text for para in model.paragraphs]
+        self.assertEqual(texts, ["final text", "inserted", "untouched"])
+        self.assertEqual(doc.find_text("untouched")[0][0].index, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
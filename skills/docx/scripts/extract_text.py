@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Stream paragraphs out of a .docx without unpacking it or building a DOM.
+
+word/document.xml is read straight from the zip archive with iterparse, and each
+paragraph is discarded as soon as it has been yielded (as are tables and other
+elements between paragraphs once they close), so memory stays flat even for very
+large documents.
+
+Usage:
+    python extract_text.py <file.docx> [-o output.jsonl] [--skip-empty]
+
+Each output line is one JSON object:
+    {"index": 0, "para_id": "1A2B3C4D", "text": "Current text",
+     "deleted_text": "", "mark": null, "changes": [...]}
+
+Library usage:
+    from scripts.extract_text import iter_paragraphs
+
+    for para in iter_paragraphs("contract.docx"):
+        if para["changes"]:
+            print(para["index"], para["text"])
+"""
+
+import argparse
+import json
+import sys
+import zipfile
+from typing import Iterator
+
+from defusedxml.ElementTree import iterparse
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+P_TAG = f"{{{W_NS}}}p"
+T_TAG = f"{{{W_NS}}}t"
+DELTEXT_TAG = f"{{{W_NS}}}delText"
+INS_TAG = f"{{{W_NS}}}ins"
+DEL_TAG = f"{{{W_NS}}}del"
+MOVE_FROM_TAG = f"{{{W_NS}}}moveFrom"
+MOVE_TO_TAG = f"{{{W_NS}}}moveTo"
+# Tracked change elements and the change type they are reported as
+CHANGE_TYPES = {
+    INS_TAG: "ins",
+    DEL_TAG: "del",
+    MOVE_TO_TAG: "ins",
+    MOVE_FROM_TAG: "del",
+}
+RPR_TAG = f"{{{W_NS}}}rPr"
+PPR_TAG = f"{{{W_NS}}}pPr"
+ID_ATTR = f"{{{W_NS}}}id"
+AUTHOR_ATTR = f"{{{W_NS}}}author"
+DATE_ATTR = f"{{{W_NS}}}date"
+PARA_ID_ATTR = f"{{{W14_NS}}}paraId"
+
+
+def iter_paragraphs(docx_path, part="word/document.xml") -> Iterator[dict]:
+    """
+    Yield the paragraphs of a Word document one at a time.
+
+    Text inside w:t is reported as the paragraph's current text; text inside
+    w:delText is reported separately as deleted_text. Every w:ins/w:del wrapping
+    content of the paragraph is listed in changes with its author, date and text.
+    A w:ins/w:del inside the paragraph mark's run properties (pPr/rPr) sets mark
+    to "ins" or "del". Moved text counts as deleted where it came from
+    (w:moveFrom, whose w:t text goes to deleted_text) and inserted where it
+    went (w:moveTo). Nested paragraphs (text boxes) are yielded on their own
+    and their text is not repeated in the enclosing paragraph.
+
+    Args:
+        docx_path: Path to the .docx file
+        part: Part name inside the archive (default: "word/document.xml")
+
+    Yields:
+        dict: index, para_id, text, deleted_text, mark and changes of one paragraph.
+              Paragraphs are yielded when they close, so a text box paragraph is
+              yielded before the paragraph that anchors it; index reflects document
+              order.
+
+    Raises:
+        ValueError: If the part is missing from the archive
+    """
+    with zipfile.ZipFile(docx_path) as zf:
+        try:
+            stream = zf.open(part)
+        except KeyError:
+            raise ValueError(f"{part} not found in {docx_path}")
+
+        with stream:
+            # Open elements; used to find a finished element's parent
+            element_stack = []
+            # Open paragraphs and, per paragraph, its open tracked changes
+            para_stack = []
+            change_stacks = []
+            in_para_rpr = 0
+            in_move_from = 0
+            index = 0
+
+            for event, elem in iterparse(stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    element_stack.append(elem)
+                    if tag == P_TAG:
+                        para_stack.append(
+                            {
+                                "index": index,
+                                "para_id": elem.get(PARA_ID_ATTR),
+                                "text": [],
+                                "deleted_text": [],
+                                "mark": None,
+                                "changes": [],
+                            }
+                        )
+                        change_stacks.append([])
+                        index += 1
+                    elif tag in CHANGE_TYPES and para_stack:
+                        if in_para_rpr:
+                            para_stack[-1]["mark"] = CHANGE_TYPES[tag]
+                        else:
+                            in_move_from += tag == MOVE_FROM_TAG
+                            change = {
+                                "type": CHANGE_TYPES[tag],
+                                "id": elem.get(ID_ATTR),
+                                "author": elem.get(AUTHOR_ATTR),
+                                "date": elem.get(DATE_ATTR),
+                                "text": [],
+                            }
+                            para_stack[-1]["changes"].append(change)
+                            change_stacks[-1].append(change)
+                    elif tag == RPR_TAG and element_stack[-2].tag == PPR_TAG:
+                        in_para_rpr += 1
+                    continue
+
+                element_stack.pop()
+                if tag in (T_TAG, DELTEXT_TAG):
+                    if para_stack and elem.text:
+                        para = para_stack[-1]
+                        deleted = tag == DELTEXT_TAG or in_move_from
+                        key = "deleted_text" if deleted else "text"
+                        para[key].append(elem.text)
+                        if change_stacks[-1]:
+                            change_stacks[-1][-1]["text"].append(elem.text)
+                elif tag in CHANGE_TYPES:
+                    if para_stack and not in_para_rpr:
+                        change_stacks[-1].pop()
+                        in_move_from -= tag == MOVE_FROM_TAG
+                elif (
+                    tag == RPR_TAG
+                    and in_para_rpr
+                    and element_stack[-1].tag == PPR_TAG
+                ):
+                    in_para_rpr -= 1
+                elif tag == P_TAG:
+                    para = para_stack.pop()
+                    change_stacks.pop()
+                    _release(elem, element_stack)
+                    yield _finish_paragraph(para)
+                    continue
+
+                # Elements outside paragraphs (tables, rows, section properties)
+                # are not needed once closed either
+                if not para_stack:
+                    _release(elem, element_stack)
+
+
+def _release(elem, element_stack):
+    """Free a closed element; it is the last child of the innermost open one."""
+    elem.clear()
+    if element_stack:
+        element_stack[-1].remove(elem)
+
+
+def _finish_paragraph(para):
+    """Join collected text fragments into strings."""
+    para["text"] = "".join(para["text"])
+    para["deleted_text"] = "".join(para["deleted_text"])
+    for change in para["changes"]:
+        change["text"] = "".join(change["text"])
+    return para
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream paragraphs of a .docx as JSON lines"
+    )
+    parser.add_argument("docx_file", help="Word document (.docx)")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output JSONL file (default: stdout)",
+    )
+    parser.add_argument(
+        "--skip-empty",
+        action="store_true",
+        help="Omit paragraphs without current or deleted text",
+    )
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for para in iter_paragraphs(args.docx_file):
+            if args.skip_empty and not para["text"] and not para["deleted_text"]:
+                continue
+            out.write(json.dumps(para, ensure_ascii=False) + "\n")
+    except (ValueError, zipfile.BadZipFile) as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
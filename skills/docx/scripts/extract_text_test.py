@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from scripts import extract_text
+from scripts.extract_text import iter_paragraphs
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+
+def write_docx(path, body):
+    """Write a .docx holding only a word/document.xml with the given w:body XML."""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{W_NS}" xmlns:w14="{W14_NS}">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestIterParagraphs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "doc.docx"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_tracked_changes(self):
+        write_docx(
+            self.path,
+            '<w:p w14:paraId="1A2B3C4D"><w:pPr><w:rPr><w:ins w:id="9" '
+            'w:author="A"/></w:rPr></w:pPr><w:r><w:t>Keep </w:t></w:r>'
+            '<w:del w:id="1" w:author="A" w:date="2024-01-01T00:00:00Z"><w:r>'
+            "<w:delText>old</w:delText></w:r></w:del>"
+            '<w:ins w:id="2" w:author="B"><w:r><w:t>new</w:t></w:r></w:ins></w:p>',
+        )
+        (para,) = iter_paragraphs(self.path)
+        self.assertEqual(para["para_id"], "1A2B3C4D")
+        self.assertEqual(para["text"], "Keep new")
+        self.assertEqual(para["deleted_text"], "old")
+        self.assertEqual(para["mark"], "ins")
+        self.assertEqual(
+            [(c["type"], c["id"], c["author"], c["text"]) for c in para["changes"]],
+            [("del", "1", "A", "old"), ("ins", "2", "B", "new")],
+        )
+
+    def test_moved_text_appears_once(self):
+        write_docx(
+            self.path,
+            '<w:p><w:moveFromRangeStart w:id="1" w:name="move1"/>'
+            '<w:moveFrom w:id="2" w:author="A"><w:r><w:t>Moved</w:t></w:r>'
+            '</w:moveFrom><w:moveFromRangeEnd w:id="1"/><w:r><w:t>Stays</w:t></w:r>'
+            "</w:p>"
+            '<w:p><w:pPr><w:rPr><w:moveTo w:id="5" w:author="A"/></w:rPr></w:pPr>'
+            '<w:moveToRangeStart w:id="3" w:name="move1"/>'
+            '<w:moveTo w:id="4" w:author="A"><w:r><w:t>Moved</w:t></w:r></w:moveTo>'
+            '<w:moveToRangeEnd w:id="3"/></w:p>',
+        )
+        source, target = iter_paragraphs(self.path)
+        self.assertEqual(source["text"], "Stays")
+        self.assertEqual(source["deleted_text"], "Moved")
+        self.assertEqual(
+            [(c["type"], c["id"], c["text"]) for c in source["changes"]],
+            [("del", "2", "Moved")],
+        )
+        self.assertEqual(target["text"], "Moved")
+        self.assertEqual(target["deleted_text"], "")
+        self.assertEqual(target["mark"], "ins")
+        self.assertEqual(
+            [(c["type"], c["id"], c["text"]) for c in target["changes"]],
+            [("ins", "4", "Moved")],
+        )
+
+    def test_nested_paragraph_text_stays_in_text_box(self):
+        write_docx(
+            self.path,
+            '<w:p><w:ins w:id="1" w:author="A"><w:r><w:t>before </w:t></w:r>'
+            "<w:r><w:pict><w:txbxContent><w:p><w:r><w:t>box</w:t></w:r>"
+            '<w:del w:id="2" w:author="B"><w:r><w:delText>x</w:delText></w:r>'
+            "</w:del></w:p></w:txbxContent></w:pict></w:r>"
+            "<w:r><w:t>after</w:t></w:r></w:ins></w:p>",
+        )
+        text_box, outer = iter_paragraphs(self.path)
+        self.assertEqual(outer["index"], 0)
+        self.assertEqual(outer["text"], "before after")
+        self.assertEqual(outer["deleted_text"], "")
+        self.assertEqual(
+            [(c["id"], c["text"]) for c in outer["changes"]], [("1", "before after")]
+        )
+        self.assertEqual(text_box["index"], 1)
+        self.assertEqual(text_box["text"], "box")
+        self.assertEqual(
+            [(c["id"], c["text"]) for c in text_box["changes"]], [("2", "x")]
+        )
+
+    def test_releases_elements_between_paragraphs(self):
+        rows = "".join(
+            f"<w:tr><w:trPr/><w:tc><w:tcPr/><w:p><w:r><w:t>{i}</w:t></w:r></w:p>"
+            "</w:tc></w:tr>"
+            for i in range(50)
+        )
+        write_docx(
+            self.path,
+            f"<w:tbl><w:tblPr/>{rows}</w:tbl><w:bookmarkStart w:id='0'/>"
+            "<w:p><w:r><w:t>end</w:t></w:r></w:p><w:sectPr/>",
+        )
+        roots = []
+        iterparse = extract_text.iterparse
+
+        def recording_iterparse(*args, **kwargs):
+            for event, elem in iterparse(*args, **kwargs):
+                if not roots:
+                    roots.append(elem)
+                yield event, elem
+
+        with mock.patch.object(extract_text, "iterparse", recording_iterparse):
+            texts = [para["text"] for para in iter_paragraphs(self.path)]
+        self.assertEqual(texts, [str(i) for i in range(50)] + ["end"])
+        # Table rows, cells and the body were released once they closed
+        self.assertEqual(list(roots[0].iter()), [roots[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
+from collections import defaultdict
 from dataclasses import dataclass
+import heapq
 import json
 import sys
 
@@ -14,36 +16,64 @@ class RectAndField:
     field: dict
 
 
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+# Returns the (i, j) index pairs, i < j, of intersecting rects on one page.
+# A line sweeps down the page and each rect is only compared with the rects
+# the line currently crosses, which on a form is about one row of fields, so
+# this is close to linear in the number of rects rather than quadratic.
+def find_intersections(rects) -> list[tuple[int, int]]:
+    pairs = []
+    active = []  # Heap of (bottom, index) for rects the line crosses
+    for i in sorted(range(len(rects)), key=lambda i: rects[i][1]):
+        top = rects[i][1]
+        # Rects that end at or above this one's top edge can't overlap it
+        while active and active[0][0] <= top:
+            heapq.heappop(active)
+        for _, j in active:
+            if rects_intersect(rects[i], rects[j]):
+                pairs.append((min(i, j), max(i, j)))
+        heapq.heappush(active, (rects[i][3], i))
+    return pairs
+
+
 # Returns a list of messages that are printed to stdout for Claude to read.
 def get_bounding_box_messages(fields_json_stream) -> list[str]:
     messages = []
     fields = json.load(fields_json_stream)
     messages.append(f"Read {len(fields['form_fields'])} fields")
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
-
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
+    # Only rects on the same page can intersect.
+    pages = defaultdict(list)
+    for i, rf in enumerate(rects_and_fields):
+        pages[rf.field["page_number"]].append(i)
+    intersecting = defaultdict(list)
+    for indices in pages.values():
+        pairs = find_intersections([rects_and_fields[i].rect for i in indices])
+        for a, b in pairs:
+            intersecting[indices[a]].append(indices[b])
+
     has_error = False
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        for j in sorted(intersecting[i]):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            has_error = True
+            if ri.field is rj.field:
+                messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+            else:
+                messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+            if len(messages) >= 20:
+                messages.append("Aborting further checks; fix bounding boxes and try again")
+                return messages
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
@@ -1,7 +1,44 @@
 import unittest
 import json
 import io
-from check_bounding_boxes import get_bounding_box_messages
+import random
+import time
+from check_bounding_boxes import get_bounding_box_messages, rects_intersect
+
+
+def get_bounding_box_messages_pairwise(fields_json_stream):
+    """Reference implementation comparing every pair of rects"""
+    messages = []
+    fields = json.load(fields_json_stream)
+    messages.append(f"Read {len(fields['form_fields'])} fields")
+    rects = []
+    for f in fields["form_fields"]:
+        rects.append((f["label_bounding_box"], "label", f))
+        rects.append((f["entry_bounding_box"], "entry", f))
+    has_error = False
+    for i, (rect_i, type_i, field_i) in enumerate(rects):
+        for rect_j, type_j, field_j in rects[i + 1:]:
+            if field_i["page_number"] == field_j["page_number"] and rects_intersect(rect_i, rect_j):
+                has_error = True
+                if field_i is field_j:
+                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{field_i['description']}` ({rect_i}, {rect_j})")
+                else:
+                    messages.append(f"FAILURE: intersection between {type_i} bounding box for `{field_i['description']}` ({rect_i}) and {type_j} bounding box for `{field_j['description']}` ({rect_j})")
+                if len(messages) >= 20:
+                    messages.append("Aborting further checks; fix bounding boxes and try again")
+                    return messages
+        if type_i == "entry" and "entry_text" in field_i:
+            font_size = field_i["entry_text"].get("font_size", 14)
+            entry_height = rect_i[3] - rect_i[1]
+            if entry_height < font_size:
+                has_error = True
+                messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{field_i['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
+                if len(messages) >= 20:
+                    messages.append("Aborting further checks; fix bounding boxes and try again")
+                    return messages
+    if not has_error:
+        messages.append("SUCCESS: All bounding boxes are valid")
+    return messages
 
 
 # Currently this is not run automatically in CI; it's just for documentation and manual checking.
@@ -221,6 +258,60 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
     
+    def test_matches_pairwise_check(self):
+        """Test that messages and their order match comparing every pair of rects"""
+        rng = random.Random(7)
+        for _ in range(200):
+            fields = []
+            for i in range(rng.randint(1, 12)):
+                boxes = []
+                for _ in range(2):
+                    # A coarse grid, so that many boxes touch or share edges
+                    x0, y0 = rng.randint(0, 20) * 10, rng.randint(0, 20) * 10
+                    boxes.append([x0, y0, x0 + rng.randint(0, 6) * 10, y0 + rng.randint(0, 3) * 10])
+                field = {
+                    "description": f"Field{i}",
+                    "page_number": rng.randint(1, 3),
+                    "label_bounding_box": boxes[0],
+                    "entry_bounding_box": boxes[1],
+                }
+                if rng.random() < 0.3:
+                    field["entry_text"] = {"font_size": 12}
+                fields.append(field)
+            data = {"form_fields": fields}
+            self.assertEqual(
+                get_bounding_box_messages(self.create_json_stream(data)),
+                get_bounding_box_messages_pairwise(self.create_json_stream(data)),
+            )
+    
+    def test_many_fields(self):
+        """Test a 100-page form with 10,000 fields, printing how long the check takes"""
+        fields = []
+        for page in range(1, 101):
+            for row in range(50):
+                for column in range(2):
+                    x = column * 300
+                    y = row * 15
+                    fields.append({
+                        "description": f"Field {page}-{row}-{column}",
+                        "page_number": page,
+                        "label_bounding_box": [x, y, x + 100, y + 12],
+                        "entry_bounding_box": [x + 100, y, x + 290, y + 15],
+                        "entry_text": {"font_size": 10},
+                    })
+        data = {"form_fields": fields}
+        
+        start = time.perf_counter()
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        elapsed = time.perf_counter() - start
+        print(f"\n{len(fields)} fields: {elapsed * 1000:.0f} ms")
+        self.assertEqual(messages, ["Read 10000 fields", "SUCCESS: All bounding boxes are valid"])
+        
+        # One overlap among them is still found
+        fields[-1]["label_bounding_box"] = [0, 0, 120, 12]
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        self.assertEqual(len(messages), 3)
+        self.assertIn("Field 100-49-1", messages[1])
 
 if __name__ == '__main__':
     unittest.main()
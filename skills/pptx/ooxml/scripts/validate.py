@@ -4,26 +4,176 @@ Command line tool to validate Office document XML files against XSD schemas and
 
 Usage:
     python validate.py <dir> --original <original_file>
+    python validate.py --batch <manifest.json> [--jobs N]
+
+The batch manifest is a JSON list of documents to validate:
+    [{"unpacked_dir": "edits/contract1", "original": "originals/contract1.docx"}, ...]
+
+Batch mode validates documents in a worker pool (compiled schemas are reused by
+every document a worker handles) and prints one consolidated JSON report.
 """
 
 import argparse
+import contextlib
+import io
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
 
 
+def get_validators(file_extension):
+    """Return the validator classes for a file extension, or None if unsupported."""
+    match file_extension:
+        case ".docx":
+            return [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            return [PPTXSchemaValidator]
+        case _:
+            return None
+
+
+def validate_document(unpacked_dir, original_file, verbose=False):
+    """
+    Validate one unpacked document and capture the validators' output (stdout
+    and stderr; the git word diff of failed redlining checks is part of it).
+
+    Args:
+        unpacked_dir: Path to unpacked Office document directory
+        original_file: Path to original file (.docx/.pptx/.xlsx)
+        verbose: Enable verbose validator output
+
+    Returns:
+        dict: unpacked_dir, original, valid, per-validator results and the
+              captured output (or an error message if validation could not run)
+    """
+    result = {
+        "unpacked_dir": str(unpacked_dir),
+        "original": str(original_file),
+        "valid": False,
+        "validators": {},
+        "output": "",
+    }
+
+    unpacked_dir = Path(unpacked_dir)
+    original_file = Path(original_file)
+    if not unpacked_dir.is_dir():
+        result["error"] = f"{unpacked_dir} is not a directory"
+        return result
+    if not original_file.is_file():
+        result["error"] = f"{original_file} is not a file"
+        return result
+
+    validators = get_validators(original_file.suffix.lower())
+    if validators is None:
+        result["error"] = (
+            f"Validation not supported for file type {original_file.suffix.lower()}"
+        )
+        return result
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            for V in validators:
+                validator = V(unpacked_dir, original_file, verbose=verbose)
+                result["validators"][V.__name__] = bool(validator.validate())
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    else:
+        result["valid"] = all(result["validators"].values())
+    result["output"] = output.getvalue()
+    return result
+
+
+def _validate_manifest_entry(args):
+    """Worker entry point: unpack the (unpacked_dir, original, verbose) tuple."""
+    return validate_document(*args)
+
+
+def validate_batch(entries, jobs=None, verbose=False):
+    """
+    Validate many documents concurrently.
+
+    Args:
+        entries: Iterable of (unpacked_dir, original_file) pairs
+        jobs: Number of worker processes (default: CPU count)
+        verbose: Enable verbose validator output
+
+    Returns:
+        list[dict]: validate_document() results in manifest order
+    """
+    tasks = [(unpacked_dir, original, verbose) for unpacked_dir, original in entries]
+    if not tasks:
+        return []
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs == 1:
+        return [_validate_manifest_entry(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_validate_manifest_entry, tasks))
+
+
+def load_manifest(manifest_path):
+    """
+    Load a batch manifest.
+
+    Args:
+        manifest_path: JSON file holding a list of {"unpacked_dir", "original"}
+                       objects or [unpacked_dir, original] pairs. Relative paths
+                       are resolved against the manifest's directory.
+
+    Returns:
+        list[tuple[Path, Path]]: (unpacked_dir, original) pairs
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    manifest_path = Path(manifest_path)
+    base_dir = manifest_path.parent
+    with open(manifest_path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("Manifest must be a JSON list")
+
+    entries = []
+    for i, item in enumerate(data):
+        if isinstance(item, dict) and "unpacked_dir" in item and "original" in item:
+            pair = (item["unpacked_dir"], item["original"])
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            pair = tuple(item)
+        else:
+            raise ValueError(
+                f"Manifest entry {i} must have 'unpacked_dir' and 'original'"
+            )
+        entries.append(tuple(base_dir / Path(p) for p in pair))
+    return entries
+
+
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
+        nargs="?",
         help="Path to unpacked Office document directory",
     )
     parser.add_argument(
         "--original",
-        required=True,
         help="Path to original file (.docx/.pptx/.xlsx)",
     )
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help="JSON manifest of (unpacked_dir, original) pairs to validate together",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -32,6 +182,20 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.batch:
+        if args.unpacked_dir or args.original:
+            parser.error("--batch cannot be combined with unpacked_dir/--original")
+        try:
+            entries = load_manifest(args.batch)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Error: {e}")
+        results = validate_batch(entries, jobs=args.jobs, verbose=args.verbose)
+        print(json.dumps(results, indent=2))
+        sys.exit(0 if all(r["valid"] for r in results) else 1)
+
+    if not args.unpacked_dir or not args.original:
+        parser.error("unpacked_dir and --original are required unless --batch is used")
+
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
@@ -43,14 +207,10 @@ def main():
     )
 
     # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    validators = get_validators(file_extension)
+    if validators is None:
+        print(f"Error: Validation not supported for file type {file_extension}")
+        sys.exit(1)
 
     # Run validators
     success = True
@@ -161,6 +161,7 @@ class RedliningValidator:
                         str(original_file),
                         str(modified_file),
                     ],
+                    stdin=subprocess.DEVNULL,
                     capture_output=True,
                     text=True,
                 )
@@ -192,6 +193,7 @@ class RedliningValidator:
                         str(original_file),
                         str(modified_file),
                     ],
+                    stdin=subprocess.DEVNULL,
                     capture_output=True,
                     text=True,
                 )
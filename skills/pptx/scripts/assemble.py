@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+"""
+Assemble a presentation from slides of several source presentations.
+
+Usage:
+    python assemble.py output.pptx report.pptx:0,3 appendix.pptx:2,2,5 report.pptx:7
+
+Each source argument is a .pptx path and a comma-separated list of 0-based slide
+indices; slides appear in the output in argument order and may repeat. The first
+source (or --base) provides the presentation settings, slide size, notes master
+and document properties.
+
+The output is built at the package level: parts are streamed from the source
+zip archives into the output archive without loading the presentations into
+python-pptx. Slide masters (with their layouts and theme) and shared parts such
+as images and media are deduplicated by content hash, so slides from the same
+template share one master and a logo used on every slide is stored once. Parts
+a slide owns (charts, SmartArt, embedded objects, notes) are copied per slide.
+"""
+
+import argparse
+import hashlib
+import os
+import posixpath
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from collections import namedtuple
+from pathlib import Path
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from rearrange import OWNED_PART_RELTYPES
+
+NS_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+NS_PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PRESENTATION_PARTNAME = "/ppt/presentation.xml"
+# Slide master and layout IDs share one range, starting at 2^31
+MIN_MASTER_ID = 2147483648
+MIN_SLIDE_ID = 256
+# presentation.xml extension listing slide sections by slide ID
+SECTION_LIST_EXT_URI = "{521415D9-36F7-43E2-AB2F-B90AF26B5E84}"
+
+# Relationships that are not carried over to assembled slides
+SKIPPED_RELTYPES = {RT.COMMENTS}
+# Parts a slide owns, copied for every occurrence of the slide
+SLIDE_OWNED_RELTYPES = OWNED_PART_RELTYPES | {RT.NOTES_SLIDE}
+
+Relationship = namedtuple("Relationship", "rId reltype target external")
+
+
+class SourcePackage:
+    """Read-only view of a .pptx archive: parts, content types and relationships."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(self.path)
+        types = etree.fromstring(self.zip.read("[Content_Types].xml"))
+        self.default_types = {
+            el.get("Extension").lower(): el.get("ContentType")
+            for el in types.iter(f"{{{NS_CT}}}Default")
+        }
+        self.override_types = {
+            el.get("PartName"): el.get("ContentType")
+            for el in types.iter(f"{{{NS_CT}}}Override")
+        }
+        self._rels = {}
+        self._slide_partnames = None
+
+    def close(self):
+        self.zip.close()
+
+    def content_type(self, partname):
+        if partname in self.override_types:
+            return self.override_types[partname]
+        return self.default_types.get(posixpath.splitext(partname)[1][1:].lower())
+
+    def info(self, partname):
+        return self.zip.getinfo(partname[1:])
+
+    def read(self, partname):
+        return self.zip.read(partname[1:])
+
+    def open(self, partname):
+        return self.zip.open(partname[1:])
+
+    def rels(self, partname):
+        """Relationships of a part ("/" for the package), targets as partnames."""
+        rels = self._rels.get(partname)
+        if rels is None:
+            directory, name = posixpath.split(partname)
+            rels_name = posixpath.join(directory, "_rels", f"{name}.rels")[1:]
+            rels = []
+            if rels_name in self.zip.NameToInfo:
+                root = etree.fromstring(self.zip.read(rels_name))
+                for el in root.iter(f"{{{NS_PKG_RELS}}}Relationship"):
+                    external = el.get("TargetMode") == "External"
+                    target = el.get("Target")
+                    if not external:
+                        target = posixpath.normpath(
+                            target
+                            if target.startswith("/")
+                            else posixpath.join(directory, target)
+                        )
+                        if target[1:] not in self.zip.NameToInfo:
+                            continue  # Broken relationship (e.g. to "NULL")
+                    rels.append(
+                        Relationship(el.get("Id"), el.get("Type"), target, external)
+                    )
+            self._rels[partname] = rels
+        return rels
+
+    def related(self, partname, reltype):
+        """Target of the first relationship of reltype, or None."""
+        return next(
+            (rel.target for rel in self.rels(partname) if rel.reltype == reltype), None
+        )
+
+    def presentation(self):
+        return etree.fromstring(self.read(PRESENTATION_PARTNAME))
+
+    def slide_partnames(self):
+        """Slide partnames in presentation order."""
+        if self._slide_partnames is None:
+            targets = {rel.rId: rel.target for rel in self.rels(PRESENTATION_PARTNAME)}
+            self._slide_partnames = [
+                targets[sld_id.get(f"{{{NS_R}}}id")]
+                for sld_id in self.presentation().iter(f"{{{NS_P}}}sldId")
+            ]
+        return self._slide_partnames
+
+    def slide_size(self):
+        sld_sz = self.presentation().find(f"{{{NS_P}}}sldSz")
+        return None if sld_sz is None else (sld_sz.get("cx"), sld_sz.get("cy"))
+
+
+class _SlideContext:
+    """Parts copied for one output slide: {source partname: output partname}."""
+
+    def __init__(self, source, slide_partname, output_partname):
+        self.source = source
+        self.output_slide = output_partname
+        self.copied = {slide_partname: output_partname}
+
+
+class DeckAssembler:
+    """Writes an output package from slides of several SourcePackages.
+
+    Shared parts are recorded by content key, so an identical master or image
+    coming from different sources (or reached through different slides) is
+    written once. Parts are copied byte for byte with their relationship IDs;
+    only slide masters (whose layout IDs must be unique) and presentation.xml
+    are rewritten.
+    """
+
+    def __init__(self, base, output_path):
+        self.base = base
+        self.output = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+        self.partnames = {PRESENTATION_PARTNAME}
+        self.content_types = {}
+        # (source path, partname) -> output partname, for shared parts
+        self._copied = {}
+        # content key -> output partname
+        self._by_key = {}
+        self._keys = {}
+        self._next_master_id = MIN_MASTER_ID
+        # [(output master partname, master ID)] and their {rId: layout}, theme
+        self.masters = []
+        self._master_layouts = {}
+        self._master_themes = {}
+        # (source path, slide partname) -> output partname of its first copy
+        self._slide_targets = {}
+        self.slides = []
+
+        # Presentation-level parts of the base (slides and masters come later)
+        self.presentation_rels = []
+        self.notes_master = None
+        for rel in base.rels(PRESENTATION_PARTNAME):
+            if rel.reltype in (RT.SLIDE, RT.SLIDE_MASTER, RT.THEME):
+                continue
+            target = rel.target
+            if not rel.external:
+                target = self._copy_shared(base, rel.target)
+                if rel.reltype == RT.NOTES_MASTER:
+                    self.notes_master = target
+            self.presentation_rels.append(rel._replace(target=target))
+
+    def plan_slides(self, selections):
+        """Reserve output slide partnames, in order, for (source, index) pairs.
+
+        Slides must be planned before they are copied so hyperlinks between
+        slides can point at slides later in the output.
+        """
+        planned = []
+        for source, index in selections:
+            slide_partnames = source.slide_partnames()
+            if not 0 <= index < len(slide_partnames):
+                raise ValueError(
+                    f"Slide index {index} out of range (0-{len(slide_partnames) - 1})"
+                    f" in {source.path}"
+                )
+            partname = slide_partnames[index]
+            output_partname = f"/ppt/slides/slide{len(planned) + 1}.xml"
+            self.partnames.add(output_partname)
+            self._slide_targets.setdefault((source.path, partname), output_partname)
+            planned.append((source, partname, output_partname))
+        return planned
+
+    def copy_slide(self, source, partname, output_partname):
+        """Copy a planned slide with the parts it owns and uses."""
+        context = _SlideContext(source, partname, output_partname)
+        self._copy_part(source, partname, output_partname, context)
+        self.slides.append(output_partname)
+
+    def _copy_part(self, source, partname, output_partname, context=None, data=None):
+        """Write a part and its relationships (targets copied as needed)."""
+        rels = []
+        for rel in source.rels(partname):
+            target = self._rel_target(source, partname, rel, context)
+            if target is not None:
+                rels.append(rel._replace(target=target))
+        if data is None:
+            self._stream(source, partname, output_partname)
+        else:
+            self.output.writestr(output_partname[1:], data)
+        self._write_rels(output_partname, rels)
+        self.content_types[output_partname] = source.content_type(partname)
+
+    def _rel_target(self, source, partname, rel, context):
+        """Output target for a relationship of a copied part, or None to drop it."""
+        if rel.external:
+            return rel.target
+        if rel.reltype in SKIPPED_RELTYPES:
+            return None
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            return self._layout(source, rel.target)
+        if rel.reltype == RT.SLIDE_MASTER:
+            return self._copy_master(source, rel.target)
+        if rel.reltype == RT.NOTES_MASTER:
+            return self.notes_master
+        if context is not None:
+            if rel.target in context.copied:
+                return context.copied[rel.target]
+            if rel.reltype == RT.SLIDE:
+                # Links to slides left out of the output point back at the slide
+                return self._slide_targets.get(
+                    (source.path, rel.target), context.output_slide
+                )
+            if rel.reltype == RT.NOTES_SLIDE and self.notes_master is None:
+                return None
+            if rel.reltype in SLIDE_OWNED_RELTYPES:
+                output_partname = self._new_partname(rel.target)
+                context.copied[rel.target] = output_partname
+                self._copy_part(source, rel.target, output_partname, context)
+                return output_partname
+        return self._copy_shared(source, rel.target)
+
+    def _copy_shared(self, source, partname):
+        """Copy a part used by many parts once per distinct content."""
+        copied = self._copied.get((source.path, partname))
+        if copied is not None:
+            return copied
+        key = self._content_key(source, partname)
+        output_partname = self._by_key.get(key)
+        if output_partname is not None:
+            self._copied[(source.path, partname)] = output_partname
+            return output_partname
+
+        output_partname = self._by_key[key] = self._new_partname(partname)
+        self._copied[(source.path, partname)] = output_partname
+        self._copy_part(source, partname, output_partname)
+        return output_partname
+
+    def _copy_master(self, source, partname):
+        """Copy a slide master with its layouts and theme, once per content."""
+        copied = self._copied.get((source.path, partname))
+        if copied is not None:
+            return copied
+        key = self._content_key(source, partname)
+        output_master = self._by_key.get(key)
+        if output_master is not None:
+            self._copied[(source.path, partname)] = output_master
+            return output_master
+
+        output_master = self._by_key[key] = self._new_partname(partname)
+        self._copied[(source.path, partname)] = output_master
+        layouts = self._master_layouts[output_master] = {}
+        rels = []
+        for rel in source.rels(partname):
+            if rel.reltype == RT.SLIDE_LAYOUT:
+                layout = self._new_partname(rel.target)
+                layouts[rel.rId] = layout
+                self._copied[(source.path, rel.target)] = layout
+                self._copy_part(source, rel.target, layout)
+                target = layout
+            elif rel.reltype == RT.THEME:
+                # Every master gets its own theme part
+                target = self._new_partname(rel.target)
+                self._copy_part(source, rel.target, target)
+                self._master_themes[output_master] = target
+            else:
+                target = self._rel_target(source, partname, rel, None)
+                if target is None:
+                    continue
+            rels.append(rel._replace(target=target))
+
+        # Layout IDs must be unique across all masters of the output
+        master = etree.fromstring(source.read(partname))
+        for layout_id in master.iter(f"{{{NS_P}}}sldLayoutId"):
+            layout_id.set("id", str(self._new_master_id()))
+        self.masters.append((output_master, self._new_master_id()))
+        self.output.writestr(output_master[1:], _serialize(master))
+        self._write_rels(output_master, rels)
+        self.content_types[output_master] = source.content_type(partname)
+        return output_master
+
+    def _layout(self, source, partname):
+        """Output partname of a slide layout, copying its master if needed."""
+        copied = self._copied.get((source.path, partname))
+        if copied is not None:
+            return copied
+        master = source.related(partname, RT.SLIDE_MASTER)
+        output_master = self._copy_master(source, master)
+        # A deduplicated master has the same layouts under the same rIds
+        rId = next(rel.rId for rel in source.rels(master) if rel.target == partname)
+        layout = self._master_layouts[output_master][rId]
+        self._copied[(source.path, partname)] = layout
+        return layout
+
+    def _content_key(self, source, partname, visiting=()):
+        """Hash of a part's bytes and (recursively) of what it relates to.
+
+        Parts already being hashed higher up (e.g. a layout's master while
+        hashing the master) contribute only their relationship type.
+        """
+        top_level = not visiting
+        if top_level and (source.path, partname) in self._keys:
+            return self._keys[(source.path, partname)]
+        digest = hashlib.sha256(partname.rsplit(".", 1)[-1].encode())
+        with source.open(partname) as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        visiting = visiting + (partname,)
+        for rel in source.rels(partname):
+            digest.update(f"|{rel.rId}|{rel.reltype}|".encode())
+            if rel.external:
+                digest.update(rel.target.encode())
+            elif rel.target in visiting:
+                digest.update(b"<cycle>")
+            else:
+                digest.update(self._content_key(source, rel.target, visiting).encode())
+        key = digest.hexdigest()
+        if top_level:
+            self._keys[(source.path, partname)] = key
+        return key
+
+    def _new_partname(self, partname):
+        """partname itself if free, else the first free one numbered like it."""
+        if partname not in self.partnames:
+            self.partnames.add(partname)
+            return partname
+        template = re.sub(r"\d*(\.\w+)$", r"%d\1", partname)
+        number = 1
+        while template % number in self.partnames:
+            number += 1
+        self.partnames.add(template % number)
+        return template % number
+
+    def _new_master_id(self):
+        self._next_master_id += 1
+        return self._next_master_id - 1
+
+    def _stream(self, source, partname, output_partname):
+        """Copy a part's bytes between archives, keeping its compression."""
+        info = source.info(partname)
+        output_info = zipfile.ZipInfo(output_partname[1:], date_time=info.date_time)
+        output_info.compress_type = info.compress_type
+        with source.open(partname) as src, self.output.open(output_info, "w") as dst:
+            shutil.copyfileobj(src, dst, 1 << 16)
+
+    def _write_rels(self, partname, rels):
+        if not rels:
+            return
+        directory, name = posixpath.split(partname)
+        root = etree.Element(
+            f"{{{NS_PKG_RELS}}}Relationships", nsmap={None: NS_PKG_RELS}
+        )
+        for rel in rels:
+            el = etree.SubElement(root, f"{{{NS_PKG_RELS}}}Relationship")
+            el.set("Id", rel.rId)
+            el.set("Type", rel.reltype)
+            if rel.external:
+                el.set("Target", rel.target)
+                el.set("TargetMode", "External")
+            else:
+                el.set("Target", posixpath.relpath(rel.target, directory or "/"))
+        self.output.writestr(
+            posixpath.join(directory, "_rels", f"{name}.rels")[1:], _serialize(root)
+        )
+
+    def finish(self):
+        """Write presentation.xml, package relationships and content types."""
+        if not self.slides:
+            raise ValueError("No slides to assemble")
+        base = self.base
+        presentation = base.presentation()
+        rels = list(self.presentation_rels)
+        # The presentation theme is the first master's theme
+        theme_rel = next(
+            (r for r in base.rels(PRESENTATION_PARTNAME) if r.reltype == RT.THEME), None
+        )
+        used_rIds = {rel.rId for rel in rels}
+        if theme_rel:
+            used_rIds.add(theme_rel.rId)
+        counter = iter(range(1, 1 << 31))
+
+        def new_rId():
+            rId = f"rId{next(counter)}"
+            while rId in used_rIds:
+                rId = f"rId{next(counter)}"
+            used_rIds.add(rId)
+            return rId
+
+        master_list = _child(presentation, "sldMasterIdLst")
+        master_list.clear()
+        for output_master, master_id in self.masters:
+            rId = new_rId()
+            rels.append(Relationship(rId, RT.SLIDE_MASTER, output_master, False))
+            etree.SubElement(
+                master_list,
+                f"{{{NS_P}}}sldMasterId",
+                {"id": str(master_id), f"{{{NS_R}}}id": rId},
+            )
+
+        slide_list = _child(presentation, "sldIdLst")
+        slide_list.clear()
+        for slide_id, output_slide in enumerate(self.slides, start=MIN_SLIDE_ID):
+            rId = new_rId()
+            rels.append(Relationship(rId, RT.SLIDE, output_slide, False))
+            etree.SubElement(
+                slide_list,
+                f"{{{NS_P}}}sldId",
+                {"id": str(slide_id), f"{{{NS_R}}}id": rId},
+            )
+
+        rels.append(
+            Relationship(
+                theme_rel.rId if theme_rel else new_rId(),
+                RT.THEME,
+                self._master_themes[self.masters[0][0]],
+                False,
+            )
+        )
+
+        # Custom shows and sections refer to slides of the base only
+        for custom_shows in presentation.findall(f"{{{NS_P}}}custShowLst"):
+            presentation.remove(custom_shows)
+        for ext in presentation.iterfind(f"{{{NS_P}}}extLst/{{{NS_P}}}ext"):
+            if ext.get("uri") == SECTION_LIST_EXT_URI:
+                ext.getparent().remove(ext)
+
+        self.output.writestr(PRESENTATION_PARTNAME[1:], _serialize(presentation))
+        self._write_rels(PRESENTATION_PARTNAME, rels)
+        self.content_types[PRESENTATION_PARTNAME] = base.content_type(
+            PRESENTATION_PARTNAME
+        )
+
+        # Package relationships: document properties and the presentation
+        package_rels = []
+        for rel in base.rels("/"):
+            target = rel.target
+            if not rel.external and rel.target != PRESENTATION_PARTNAME:
+                target = self._copy_shared(base, rel.target)
+            package_rels.append(rel._replace(target=target))
+        self._write_rels("/", package_rels)
+        self._write_content_types()
+        self.output.close()
+
+    def _write_content_types(self):
+        root = etree.Element(f"{{{NS_CT}}}Types", nsmap={None: NS_CT})
+        defaults = {"rels": "application/vnd.openxmlformats-package.relationships+xml"}
+        defaults["xml"] = "application/xml"
+        overrides = {}
+        for partname, content_type in sorted(self.content_types.items()):
+            extension = posixpath.splitext(partname)[1][1:].lower()
+            if extension not in defaults and extension not in ("xml", "rels"):
+                defaults[extension] = content_type
+            if defaults.get(extension) != content_type:
+                overrides[partname] = content_type
+        for extension, content_type in sorted(defaults.items()):
+            etree.SubElement(
+                root,
+                f"{{{NS_CT}}}Default",
+                {"Extension": extension, "ContentType": content_type},
+            )
+        for partname, content_type in overrides.items():
+            etree.SubElement(
+                root,
+                f"{{{NS_CT}}}Override",
+                {"PartName": partname, "ContentType": content_type},
+            )
+        self.output.writestr("[Content_Types].xml", _serialize(root))
+
+
+def _child(presentation, tag):
+    """A direct child of p:presentation, created in schema order if missing."""
+    el = presentation.find(f"{{{NS_P}}}{tag}")
+    if el is None:
+        el = etree.Element(f"{{{NS_P}}}{tag}")
+        if tag == "sldMasterIdLst":
+            presentation.insert(0, el)
+        else:
+            # sldIdLst follows the master lists and precedes sldSz
+            anchor = presentation.find(f"{{{NS_P}}}sldSz")
+            if anchor is not None:
+                anchor.addprevious(el)
+            else:
+                presentation.append(el)
+    return el
+
+
+def _serialize(element):
+    return etree.tostring(
+        element, xml_declaration=True, encoding="UTF-8", standalone=True
+    )
+
+
+def assemble_presentation(output_path, selections, base_path=None):
+    """
+    Create a presentation from slides of several source presentations.
+
+    Args:
+        output_path: Path for output PPTX file
+        selections: List of (source path, slide index) pairs in output order
+        base_path: Presentation providing slide size, properties and notes
+            master (default: the first selected source)
+
+    Returns:
+        Number of slides written
+
+    Raises:
+        ValueError: If no slides are selected, an index is out of range or the
+            output is one of the sources
+    """
+    if not selections:
+        raise ValueError("No slides selected")
+    output_path = Path(output_path)
+    sources = {}
+
+    def source_for(path):
+        path = Path(path).resolve()
+        if path not in sources:
+            sources[path] = SourcePackage(path)
+        return sources[path]
+
+    try:
+        base = source_for(base_path or selections[0][0])
+        selections = [(source_for(path), index) for path, index in selections]
+        base_size = base.slide_size()
+        for source in sources.values():
+            if source.slide_size() != base_size:
+                print(
+                    f"Warning: {source.path.name} has a different slide size than "
+                    f"{base.path.name}; its slides keep their original geometry"
+                )
+
+        if output_path.exists() and any(
+            os.path.samefile(output_path, path) for path in sources
+        ):
+            raise ValueError(f"Output {output_path} is also a source presentation")
+
+        # Build the deck next to the output and move it into place only once it
+        # is complete, so a failed run leaves any existing output untouched
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{output_path.stem}-", suffix=".pptx", dir=output_path.parent
+        )
+        os.close(fd)
+        try:
+            assembler = DeckAssembler(base, tmp_path)
+            try:
+                planned = assembler.plan_slides(selections)
+                for source, partname, output_partname in planned:
+                    assembler.copy_slide(source, partname, output_partname)
+                assembler.finish()
+            except BaseException:
+                assembler.output.close()
+                raise
+            _copy_output_mode(output_path, tmp_path)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    finally:
+        for source in sources.values():
+            source.close()
+
+    print(
+        f"Assembled {len(assembler.slides)} slides from {len(sources)} source(s) "
+        f"with {len(assembler.masters)} slide master(s) into {output_path}"
+    )
+    return len(assembler.slides)
+
+
+def _copy_output_mode(output_path, tmp_path):
+    """Give the temporary file the permissions the output would have had.
+
+    mkstemp creates files readable only by their owner; an existing output
+    keeps its mode and a new one gets the default mode for the umask.
+    """
+    if output_path.exists():
+        shutil.copymode(output_path, tmp_path)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+
+
+def parse_selection(spec):
+    """Parse "deck.pptx:0,3,3" into [(Path("deck.pptx"), 0), ...]."""
+    path, sep, indices = spec.rpartition(":")
+    if not sep or not path:
+        raise ValueError(f"Expected <file.pptx>:<indices>, got '{spec}'")
+    try:
+        return [(Path(path), int(x.strip())) for x in indices.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid slide indices in '{spec}'") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Assemble a presentation from slides of several presentations.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python assemble.py report.pptx intro.pptx:0 data.pptx:3,4 intro.pptx:5
+    Creates report.pptx from slide 0 of intro.pptx, slides 3 and 4 of data.pptx
+    and slide 5 of intro.pptx, using intro.pptx's settings and properties
+
+Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
+        """,
+    )
+    parser.add_argument("output", help="Path for output PPTX file")
+    parser.add_argument(
+        "slides",
+        nargs="+",
+        help="Source file and comma-separated slide indices (e.g. deck.pptx:0,2,2)",
+    )
+    parser.add_argument(
+        "--base",
+        help="Presentation providing slide size, properties and notes master "
+        "(default: first source)",
+    )
+    args = parser.parse_args()
+
+    try:
+        selections = [
+            selection for spec in args.slides for selection in parse_selection(spec)
+        ]
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    paths = {path for path, _ in selections}
+    if args.base:
+        paths.add(Path(args.base))
+    for path in sorted(paths):
+        if not path.exists():
+            print(f"Error: Source file not found: {path}")
+            sys.exit(1)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        assemble_presentation(output_path, selections, args.base)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error processing presentations: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import os
+import re
+import tempfile
+import time
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from assemble import assemble_presentation
+from rearrange import rearrange_presentation
+
+
+def build_deck(path, name, slide_count, logo=None, master_tweak=False):
+    """Save a deck titled "<name> <i>", optionally with a logo on every slide."""
+    prs = Presentation()
+    if master_tweak:
+        # A different master than the default template's
+        prs.slide_master.placeholders[0].left += Inches(1)
+    for idx in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"{name} {idx}"
+        if logo:
+            slide.shapes.add_picture(str(logo), Inches(8), Inches(6))
+        slide.notes_slide.notes_text_frame.text = f"Notes for {name} {idx}"
+    prs.save(path)
+
+
+def save_logo(path, color="blue"):
+    Image.new("RGB", (64, 64), color).save(path)
+    return path
+
+
+def zip_names(path, prefix):
+    with zipfile.ZipFile(path) as zf:
+        return [n for n in zf.namelist() if re.fullmatch(rf"{prefix}[^/]+", n)]
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestAssemblePresentation(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assemble(self, selections, **kwargs):
+        output = self.dir / "output.pptx"
+        with redirect_stdout(StringIO()):
+            assemble_presentation(output, selections, **kwargs)
+        return output
+
+    def test_slides_in_order_with_shared_masters_and_media(self):
+        logo = save_logo(self.dir / "logo.png")
+        a, b = self.dir / "a.pptx", self.dir / "b.pptx"
+        build_deck(a, "A", 4, logo)
+        build_deck(b, "B", 3, logo)
+        selections = [(a, 2), (b, 0), (a, 0), (b, 2), (b, 2)]
+        output = self.assemble(selections)
+
+        prs = Presentation(output)
+        self.assertEqual(
+            [slide.shapes.title.text for slide in prs.slides],
+            ["A 2", "B 0", "A 0", "B 2", "B 2"],
+        )
+        self.assertEqual(
+            [slide.notes_slide.notes_text_frame.text for slide in prs.slides],
+            [f"Notes for {t}" for t in ["A 2", "B 0", "A 0", "B 2", "B 2"]],
+        )
+        # Both decks use the default template and the same logo
+        self.assertEqual(len(prs.slide_masters), 1)
+        self.assertEqual(len(zip_names(output, "ppt/slideLayouts/")), 11)
+        self.assertEqual(len(zip_names(output, "ppt/media/")), 1)
+        self.assertEqual(len(zip_names(output, "ppt/theme/")), 2)  # master + notes
+
+    def test_different_masters_are_kept_apart(self):
+        a, b = self.dir / "a.pptx", self.dir / "b.pptx"
+        build_deck(a, "A", 2)
+        build_deck(b, "B", 2, master_tweak=True)
+        output = self.assemble([(a, 0), (b, 1), (a, 1)])
+
+        prs = Presentation(output)
+        self.assertEqual(len(prs.slide_masters), 2)
+        masters = [slide.slide_layout.slide_master for slide in prs.slides]
+        self.assertIs(masters[0], masters[2])
+        self.assertIsNot(masters[0], masters[1])
+        self.assertEqual(
+            masters[1].placeholders[0].left - masters[0].placeholders[0].left,
+            Inches(1),
+        )
+
+        # Master and layout IDs are unique across masters
+        with zipfile.ZipFile(output) as zf:
+            presentation = etree.fromstring(zf.read("ppt/presentation.xml"))
+        ids = [el.get("id") for el in presentation.iter("{*}sldMasterId")]
+        for master in prs.slide_masters:
+            ids.extend(el.get("id") for el in master.element.iter("{*}sldLayoutId"))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_charts_are_copied_per_slide(self):
+        deck = self.dir / "charts.pptx"
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        chart_data = CategoryChartData()
+        chart_data.categories = ["East", "West"]
+        chart_data.add_series("Sales", (1.0, 2.0))
+        slide.shapes.add_chart(
+            XL_CHART_TYPE.COLUMN_CLUSTERED,
+            Inches(1),
+            Inches(2),
+            Inches(4),
+            Inches(3),
+            chart_data,
+        )
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text_frame.text = "Linked"
+        run = slide.shapes.title.text_frame.paragraphs[0].runs[0]
+        run.hyperlink.address = "https://example.com/"
+        prs.save(deck)
+
+        output = self.assemble([(deck, 0), (deck, 0), (deck, 1)])
+        prs = Presentation(output)
+        charts = [
+            next(shape for shape in prs.slides[idx].shapes if shape.has_chart).chart
+            for idx in (0, 1)
+        ]
+        self.assertNotEqual(charts[0].part.partname, charts[1].part.partname)
+        self.assertEqual(list(charts[1].plots[0].categories), ["East", "West"])
+        self.assertEqual(len(zip_names(output, "ppt/embeddings/")), 2)
+        run = prs.slides[2].shapes.title.text_frame.paragraphs[0].runs[0]
+        self.assertEqual(run.hyperlink.address, "https://example.com/")
+
+    def test_rejects_bad_index(self):
+        deck = self.dir / "a.pptx"
+        build_deck(deck, "A", 2)
+        with self.assertRaisesRegex(ValueError, "out of range"):
+            self.assemble([(deck, 2)])
+        self.assertFalse((self.dir / "output.pptx").exists())
+
+    def test_rejects_output_that_is_a_source(self):
+        deck = self.dir / "deck.pptx"
+        build_deck(deck, "A", 3)
+        original = deck.read_bytes()
+        link = self.dir / "link.pptx"
+        link.symlink_to(deck)
+        for output in (deck, self.dir / "." / "deck.pptx", link):
+            with self.subTest(output=output):
+                with self.assertRaisesRegex(ValueError, "also a source"):
+                    with redirect_stdout(StringIO()):
+                        assemble_presentation(output, [(deck, 2), (deck, 0)])
+                self.assertEqual(deck.read_bytes(), original)
+        # No temporary files are left behind
+        files = sorted(path.name for path in self.dir.iterdir())
+        self.assertEqual(files, ["deck.pptx", "link.pptx"])
+
+    def test_failed_run_keeps_existing_output(self):
+        deck = self.dir / "a.pptx"
+        build_deck(deck, "A", 2)
+        output = self.assemble([(deck, 1)])
+        output.chmod(0o640)
+        before = output.read_bytes()
+        with self.assertRaisesRegex(ValueError, "out of range"):
+            self.assemble([(deck, 0), (deck, 5)])
+        self.assertEqual(output.read_bytes(), before)
+        files = sorted(path.name for path in self.dir.iterdir())
+        self.assertEqual(files, ["a.pptx", "output.pptx"])
+
+        # Replacing the output keeps its permissions; new outputs get the default
+        self.assemble([(deck, 0)])
+        titles = [slide.shapes.title.text for slide in Presentation(output).slides]
+        self.assertEqual(titles, ["A 0"])
+        self.assertEqual(output.stat().st_mode & 0o777, 0o640)
+        output.unlink()
+        umask = os.umask(0o022)
+        try:
+            self.assemble([(deck, 0)])
+        finally:
+            os.umask(umask)
+        self.assertEqual(output.stat().st_mode & 0o777, 0o644)
+
+    def test_benchmark(self):
+        """Print timings for a 200-slide deck assembled from four sources."""
+        logo = save_logo(self.dir / "logo.png")
+        sources = []
+        for idx in range(4):
+            path = self.dir / f"source{idx}.pptx"
+            build_deck(path, f"S{idx}", 50, logo, master_tweak=idx % 2 == 1)
+            sources.append(path)
+        selections = [(sources[n % 4], n // 4) for n in range(200)]
+
+        start = time.perf_counter()
+        output = self.assemble(selections)
+        elapsed = time.perf_counter() - start
+        prs = Presentation(output)
+        self.assertEqual(len(prs.slides), 200)
+        self.assertEqual(len(prs.slide_masters), 2)
+        self.assertEqual(prs.slides[5].shapes.title.text, "S1 1")
+
+        # Baseline: one deck per source via rearrange, for comparison only
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            for path in sources:
+                rearrange_presentation(path, self.dir / "copy.pptx", list(range(50)))
+        rearrange_time = time.perf_counter() - start
+        print(
+            f"\n200 slides from 4 decks: assemble {elapsed * 1000:.0f} ms "
+            f"({output.stat().st_size // 1024} KB); rearranging the 4 sources alone "
+            f"{rearrange_time * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,21 +16,36 @@ Classes:
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    iter_text_inventory: Same, yielding one slide at a time
+    extract_text_inventory_parallel: Same, with slides split across processes
     save_inventory: Save extracted data to JSON
+    write_inventory: Stream slides to JSON or JSON Lines as they are extracted
+    iter_inventory_file: Read a saved inventory back one slide at a time
+
+Slide results are cached on disk (see InventoryCache, limited to
+INVENTORY_CACHE_MAX_BYTES), so running the tools again on a deck only
+re-inventories slides whose XML changed.
 
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--issues-only] [--jobs N] [--no-cache]
+    python inventory.py input.pptx output.jsonl   # one slide per line
 """
 
 import argparse
+import hashlib
 import json
+import os
 import platform
+import re
 import sys
+import weakref
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
+import PIL
+from PIL import Image, ImageDraw, ImageFont, features
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
@@ -46,6 +61,24 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Maximum width change, in ems, that kerning can cause between two characters.
+# Joining two words adds two pairs (word end and space, space and word start),
+# and line wrapping measures exactly within that margin per join
+WRAP_KERNING_SLACK_EM = 0.5
+
+# Directory for cached slide inventories; "off" (or "0") disables the cache
+INVENTORY_CACHE_ENV = "PPTX_INVENTORY_CACHE"
+# Bump when ShapeData results change so stale cache entries are not reused
+INVENTORY_CACHE_VERSION = 3
+# Size limit of the cache directory; least recently used entries beyond it
+# are deleted
+INVENTORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Word widths in pixels per loaded font, shared by all shapes
+_word_widths: "weakref.WeakKeyDictionary[Any, Dict[str, float]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -60,6 +93,15 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py large-deck.pptx inventory.json --jobs 8
+    Extracts slides in 8 worker processes (same output, faster on large decks)
+
+  python inventory.py huge-deck.pptx inventory.jsonl
+    Writes one {"slide-N": {...}} object per line (JSON Lines)
+
+Slides are written as they are extracted, so memory use does not grow with
+the number of slides.
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -70,12 +112,26 @@ The output JSON includes:
     )
 
     parser.add_argument("input", help="Input PowerPoint file (.pptx)")
-    parser.add_argument("output", help="Output JSON file for inventory")
+    parser.add_argument(
+        "output", help="Output JSON file for inventory (.jsonl for JSON Lines)"
+    )
     parser.add_argument(
         "--issues-only",
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for slide extraction (default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Do not read or write the slide inventory cache (or set {INVENTORY_CACHE_ENV}=off)",
+    )
 
     args = parser.parse_args()
 
@@ -94,17 +150,25 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        if args.jobs > 1:
+            slides = extract_text_inventory_parallel(
+                input_path,
+                args.jobs,
+                issues_only=args.issues_only,
+                use_cache=not args.no_cache,
+            ).items()
+        else:
+            slides = iter_text_inventory(
+                input_path, issues_only=args.issues_only, use_cache=not args.no_cache
+            )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        save_inventory(inventory, output_path)
+        total_slides, total_shapes = write_inventory(slides, output_path)
 
         print(f"Output saved to: {args.output}")
 
         # Report statistics
-        total_slides = len(inventory)
-        total_shapes = sum(len(shapes) for shapes in inventory.values())
         if args.issues_only:
             if total_shapes > 0:
                 print(
@@ -125,6 +189,274 @@ The output JSON includes:
         sys.exit(1)
 
 
+def normalize_font_name(name: str) -> str:
+    """Normalize a font family or file name for matching.
+
+    Like fontconfig, matching ignores case, spaces, hyphens and underscores,
+    so 'Times New Roman', 'times-new-roman' and 'TimesNewRoman' are equal.
+    """
+    return re.sub(r"[\s_-]+", "", name).casefold()
+
+
+@lru_cache(maxsize=None)
+def _font_index() -> Dict[str, str]:
+    """Index the system font directories once per process.
+
+    Returns:
+        Dict of normalized file stem -> font file path. Directories are scanned
+        recursively; when several files share a stem, earlier directories and
+        preferred extensions win.
+    """
+    if platform.system() == "Darwin":  # macOS
+        font_dirs = [
+            "/System/Library/Fonts/",
+            "/Library/Fonts/",
+            "~/Library/Fonts/",
+        ]
+        extensions = [".ttf", ".otf", ".ttc", ".dfont"]
+    else:  # Linux
+        font_dirs = [
+            "/usr/share/fonts/",
+            "/usr/local/share/fonts/",
+            "~/.local/share/fonts/",
+            "~/.fonts/",
+        ]
+        extensions = [".ttf", ".otf"]
+
+    index: Dict[str, str] = {}
+    for font_dir in font_dirs:
+        font_dir_path = Path(font_dir).expanduser()
+        if not font_dir_path.is_dir():
+            continue
+
+        try:
+            font_files = [
+                path
+                for path in font_dir_path.rglob("*")
+                if path.suffix.lower() in extensions and path.is_file()
+            ]
+        except (OSError, PermissionError):
+            continue
+
+        font_files.sort(key=lambda p: (extensions.index(p.suffix.lower()), str(p)))
+        for path in font_files:
+            index.setdefault(normalize_font_name(path.stem), str(path))
+
+    return index
+
+
+@lru_cache(maxsize=None)
+def resolve_font_path(font_name: str) -> Optional[str]:
+    """Get the font file path for a font name using the process-wide font index.
+
+    Exact (normalized) file name matches are preferred; otherwise the first
+    indexed file whose name contains the font name is used.
+
+    Args:
+        font_name: Name of the font (e.g., 'Arial', 'Calibri')
+
+    Returns:
+        Path to the font file, or None if not found
+    """
+    index = _font_index()
+    key = normalize_font_name(font_name)
+    if not key:
+        return None
+    if key in index:
+        return index[key]
+    for name, path in index.items():
+        if key in name:
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def _measurement_fingerprint() -> bytes:
+    """Hash of what text measurement depends on besides the deck itself.
+
+    Overflow and wrapping estimates change with the installed fonts and the
+    Pillow/FreeType versions, so cached inventories are keyed by them too.
+    """
+    digest = hashlib.sha256(
+        f"{PIL.__version__}/{features.version('freetype2')}".encode()
+    )
+    for name, path in sorted(_font_index().items()):
+        digest.update(f"{name}\0{path}\0".encode())
+    return digest.digest()
+
+
+def prune_cache_directory(
+    directory: Path,
+    max_bytes: int,
+    pattern: str = "*/*.json",
+    keep: Iterable[Path] = (),
+) -> None:
+    """Delete least recently used cache files until the directory fits max_bytes.
+
+    Readers touch entries on every hit, so modification time orders files by
+    last use. Files that disappear or cannot be deleted are skipped.
+
+    Args:
+        directory: Cache directory
+        max_bytes: Total size allowed for files matching pattern
+        pattern: Glob of the cache entries relative to directory
+        keep: Paths still in use, never deleted (their size still counts)
+    """
+    keep = set(keep)
+    entries = []
+    for path in Path(directory).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+@lru_cache(maxsize=256)
+def load_font(font_path: Optional[str], size: int):
+    """Load a font for text measurement, cached by (path, size).
+
+    Args:
+        font_path: Font file path, or None for PIL's default font
+        size: Font size in pixels
+
+    Returns:
+        PIL font object (PIL's default font if the file cannot be loaded)
+    """
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
+class StyleResolver:
+    """Default font sizes of slide masters and layouts, computed once per part.
+
+    Walking a master's text styles or a layout's placeholders for every shape
+    dominates inventory time on large decks. A resolver is shared by all shapes
+    of a presentation: each master and layout is indexed on first use, and
+    later lookups are dictionary reads.
+    """
+
+    def __init__(self):
+        # master part -> style name -> outline level -> size; the style's first
+        # size is under None and serves levels without a size of their own
+        self._master_styles: Dict[
+            Any, Dict[str, Dict[Optional[int], Optional[int]]]
+        ] = {}
+        # layout part -> placeholder type -> size (None if the layout has no size)
+        self._layout_sizes: Dict[Any, Dict[Any, Optional[float]]] = {}
+
+    def master_font_size(
+        self, slide_master: Any, placeholder_type: Optional[str], level: int = 0
+    ) -> Optional[int]:
+        """Get the master text style font size for a placeholder type and level.
+
+        Args:
+            slide_master: Slide master of the shape's layout
+            placeholder_type: Placeholder type name (e.g., 'TITLE', 'BODY') or None
+            level: Outline level of the paragraph (0 for the first level)
+
+        Returns:
+            Font size in points from the level's lvlNpPr in titleStyle (title
+            placeholders) or bodyStyle, falling back to the first size in the
+            style, or None if the style defines no size
+        """
+        styles = self._master_styles.get(slide_master.part)
+        if styles is None:
+            styles = self._index_master(slide_master)
+            self._master_styles[slide_master.part] = styles
+
+        style_name = "bodyStyle"  # Default
+        if placeholder_type and "TITLE" in placeholder_type:
+            style_name = "titleStyle"
+
+        sizes = styles.get(style_name)
+        if sizes is None:
+            return None
+        size = sizes.get(level)
+        return size if size is not None else sizes[None]
+
+    def layout_font_size(
+        self, slide_layout: Any, placeholder_type: Any
+    ) -> Optional[float]:
+        """Get the default font size of a layout placeholder.
+
+        Args:
+            slide_layout: Slide layout containing the placeholder definition
+            placeholder_type: placeholder_format.type of the slide placeholder
+
+        Returns:
+            Size of the first defRPr with sz in the first layout placeholder of
+            that type, in points, or None if not found
+        """
+        sizes = self._layout_sizes.get(slide_layout.part)
+        if sizes is None:
+            sizes = self._index_layout(slide_layout)
+            self._layout_sizes[slide_layout.part] = sizes
+        return sizes.get(placeholder_type)
+
+    @staticmethod
+    def _index_master(
+        slide_master: Any,
+    ) -> Dict[str, Dict[Optional[int], Optional[int]]]:
+        """Collect the font sizes of the master's title/body/other styles: the
+        first size in each style and the defRPr size of each lvlNpPr."""
+        styles: Dict[str, Dict[Optional[int], Optional[int]]] = {}
+        for child in slide_master.element.iter():
+            if not isinstance(child.tag, str):
+                continue
+            tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+            if tag not in ("titleStyle", "bodyStyle", "otherStyle") or tag in styles:
+                continue
+
+            sizes: Dict[Optional[int], Optional[int]] = {None: None}
+            styles[tag] = sizes
+            for elem in child.iter():
+                if "sz" in elem.attrib:
+                    sizes[None] = int(elem.attrib["sz"]) // 100
+                    break
+            # lvl1pPr..lvl9pPr hold the defaults of outline levels 0..8
+            for level_props in child:
+                match = re.fullmatch(r"(?:\{.*\})?lvl(\d)pPr", str(level_props.tag))
+                if not match:
+                    continue
+                for elem in level_props:
+                    if str(elem.tag).endswith("defRPr") and (sz := elem.get("sz")):
+                        sizes[int(match.group(1)) - 1] = int(sz) // 100
+        return styles
+
+    @staticmethod
+    def _index_layout(slide_layout: Any) -> Dict[Any, Optional[float]]:
+        """Collect the default font size of each placeholder type in a layout."""
+        sizes: Dict[Any, Optional[float]] = {}
+        for layout_placeholder in slide_layout.placeholders:
+            placeholder_type = layout_placeholder.placeholder_format.type
+            if placeholder_type in sizes:
+                continue  # Only the first placeholder of each type counts
+            sizes[placeholder_type] = None
+            # Find first defRPr element with sz (size) attribute
+            for elem in layout_placeholder.element.iter():
+                if "defRPr" in elem.tag and (sz := elem.get("sz")):
+                    sizes[placeholder_type] = float(sz) / 100.0  # Convert to points
+                    break
+        return sizes
+
+
 @dataclass
 class ShapeWithPosition:
     """A shape with its absolute position on the slide."""
@@ -132,18 +464,44 @@ class ShapeWithPosition:
     shape: BaseShape
     absolute_left: int  # in EMUs
     absolute_top: int  # in EMUs
+    path: Tuple[int, ...] = ()  # Indices from slide.shapes down through groups
 
 
 class ParagraphData:
     """Data structure for paragraph properties extracted from a PowerPoint paragraph."""
 
-    def __init__(self, paragraph: Any):
+    __slots__ = (
+        "index",
+        "raw_text",
+        "outline_level",
+        "text",
+        "bullet",
+        "level",
+        "alignment",
+        "space_before",
+        "space_after",
+        "font_name",
+        "font_size",
+        "bold",
+        "italic",
+        "underline",
+        "color",
+        "theme_color",
+        "line_spacing",
+    )
+
+    def __init__(self, paragraph: Any, index: int = 0):
         """Initialize from a PowerPoint paragraph object.
 
         Args:
             paragraph: The PowerPoint paragraph object
+            index: Position of the paragraph in its text frame, counting empty
+                paragraphs
         """
-        self.text: str = paragraph.text.strip()
+        self.index = index
+        self.raw_text: str = paragraph.text
+        self.outline_level: int = getattr(paragraph, "level", 0) or 0
+        self.text: str = self.raw_text.strip()
         self.bullet: bool = False
         self.level: Optional[int] = None
         self.alignment: Optional[str] = None
@@ -228,6 +586,25 @@ class ParagraphData:
                 font_size = self.font_size if self.font_size else 12.0
                 self.line_spacing = round(paragraph.line_spacing * font_size, 2)
 
+    @classmethod
+    def from_dict(
+        cls, data: ParagraphDict, index: int, raw_text: str, outline_level: int
+    ) -> "ParagraphData":
+        """Rebuild from to_dict() output, e.g. a cached inventory entry.
+
+        to_dict() leaves out the paragraph's position, unstripped text and
+        outline level, which text measurement needs, so they are passed
+        separately.
+        """
+        para = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(para, name, data.get(name))
+        para.bullet = bool(data.get("bullet", False))
+        para.index = index
+        para.raw_text = raw_text
+        para.outline_level = outline_level
+        return para
+
     def to_dict(self) -> ParagraphDict:
         """Convert to dictionary for JSON serialization, excluding None values."""
         result: ParagraphDict = {"text": self.text}
@@ -266,6 +643,30 @@ class ParagraphData:
 class ShapeData:
     """Data structure for shape properties extracted from a PowerPoint shape."""
 
+    __slots__ = (
+        "shape",
+        "shape_id",
+        "style_resolver",
+        "slide_width_emu",
+        "slide_height_emu",
+        "placeholder_type",
+        "default_font_size",
+        "left",
+        "top",
+        "width",
+        "height",
+        "left_emu",
+        "top_emu",
+        "width_emu",
+        "height_emu",
+        "frame_overflow_bottom",
+        "slide_overflow_right",
+        "slide_overflow_bottom",
+        "overlapping_shapes",
+        "warnings",
+        "_paragraphs",
+    )
+
     @staticmethod
     def emu_to_inches(emu: int) -> float:
         """Convert EMUs (English Metric Units) to inches."""
@@ -286,61 +687,7 @@ class ShapeData:
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        return resolve_font_path(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -359,12 +706,17 @@ class ShapeData:
             return None, None
 
     @staticmethod
-    def get_default_font_size(shape: BaseShape, slide_layout: Any) -> Optional[float]:
+    def get_default_font_size(
+        shape: BaseShape,
+        slide_layout: Any,
+        style_resolver: Optional[StyleResolver] = None,
+    ) -> Optional[float]:
         """Extract default font size from slide layout for a placeholder shape.
 
         Args:
             shape: Placeholder shape
             slide_layout: Slide layout containing the placeholder definition
+            style_resolver: Optional shared StyleResolver caching layout lookups
 
         Returns:
             Default font size in points, or None if not found
@@ -373,14 +725,11 @@ class ShapeData:
             if not hasattr(shape, "placeholder_format"):
                 return None
 
-            shape_type = shape.placeholder_format.type  # type: ignore
-            for layout_placeholder in slide_layout.placeholders:
-                if layout_placeholder.placeholder_format.type == shape_type:
-                    # Find first defRPr element with sz (size) attribute
-                    for elem in layout_placeholder.element.iter():
-                        if "defRPr" in elem.tag and (sz := elem.get("sz")):
-                            return float(sz) / 100.0  # Convert EMUs to points
-                    break
+            resolver = style_resolver or StyleResolver()
+            return resolver.layout_font_size(
+                slide_layout,
+                shape.placeholder_format.type,  # type: ignore
+            )
         except Exception:
             pass
         return None
@@ -391,6 +740,7 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        style_resolver: Optional[StyleResolver] = None,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,9 +749,13 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            style_resolver: Optional StyleResolver shared by all shapes of the
+                presentation; a private one is used if omitted
         """
         self.shape = shape  # Store reference to original shape
         self.shape_id: str = ""  # Will be set after sorting
+        self.style_resolver = style_resolver or StyleResolver()
+        self._paragraphs: Optional[List[ParagraphData]] = None
 
         # Get slide dimensions from slide object
         self.slide_width_emu, self.slide_height_emu = (
@@ -420,7 +774,7 @@ class ShapeData:
                 # Get default font size from layout
                 if slide and hasattr(slide, "slide_layout"):
                     self.default_font_size = self.get_default_font_size(
-                        shape, slide.slide_layout
+                        shape, slide.slide_layout, self.style_resolver
                     )
 
         # Get position information
@@ -465,20 +819,95 @@ class ShapeData:
         self._calculate_slide_overflow()
         self._detect_bullet_issues()
 
+    @classmethod
+    def from_dict(
+        cls,
+        shape: BaseShape,
+        data: ShapeDict,
+        emu: Tuple[int, int, int, int],
+        slide: Optional[Any] = None,
+        style_resolver: Optional[StyleResolver] = None,
+        paragraph_info: Optional[List[Tuple[int, str, int]]] = None,
+    ) -> "ShapeData":
+        """Rebuild a ShapeData from to_dict() output without measuring the shape.
+
+        Args:
+            shape: The live PowerPoint shape the data was extracted from
+            data: ShapeData.to_dict() result
+            emu: (left, top, width, height) in EMUs, absolute as in __init__
+            slide: Optional slide object to get dimensions from
+            style_resolver: Optional StyleResolver shared by all shapes
+            paragraph_info: (index, raw_text, outline_level) of each
+                paragraph in data["paragraphs"]
+
+        With paragraph_info, paragraphs are rebuilt from the dictionary as
+        well; without it they are read from the shape when first needed.
+        """
+        shape_data = cls.__new__(cls)
+        shape_data.shape = shape
+        shape_data.shape_id = ""
+        shape_data.style_resolver = style_resolver or StyleResolver()
+        shape_data.slide_width_emu, shape_data.slide_height_emu = (
+            cls.get_slide_dimensions(slide) if slide else (None, None)
+        )
+        shape_data.placeholder_type = data.get("placeholder_type")  # type: ignore
+        shape_data.default_font_size = data.get("default_font_size")  # type: ignore
+        shape_data.left = data["left"]  # type: ignore
+        shape_data.top = data["top"]  # type: ignore
+        shape_data.width = data["width"]  # type: ignore
+        shape_data.height = data["height"]  # type: ignore
+        (
+            shape_data.left_emu,
+            shape_data.top_emu,
+            shape_data.width_emu,
+            shape_data.height_emu,
+        ) = emu
+
+        overflow: Dict[str, Any] = data.get("overflow") or {}  # type: ignore
+        frame_overflow = overflow.get("frame", {})
+        slide_overflow = overflow.get("slide", {})
+        shape_data.frame_overflow_bottom = frame_overflow.get("overflow_bottom")
+        shape_data.slide_overflow_right = slide_overflow.get("overflow_right")
+        shape_data.slide_overflow_bottom = slide_overflow.get("overflow_bottom")
+        overlap: Dict[str, Any] = data.get("overlap") or {}  # type: ignore
+        shape_data.overlapping_shapes = dict(overlap.get("overlapping_shapes", {}))
+        shape_data.warnings = list(data.get("warnings") or [])  # type: ignore
+        shape_data._paragraphs = None
+        if paragraph_info is not None:
+            shape_data._paragraphs = [
+                ParagraphData.from_dict(para, *info)
+                for para, info in zip(
+                    data.get("paragraphs") or [], paragraph_info  # type: ignore
+                )
+            ]
+        return shape_data
+
     @property
     def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return []
+        """Non-empty paragraphs of the shape's text frame.
 
-        paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
-        return paragraphs
+        Extracted on first access and cached; call invalidate_paragraphs() after
+        editing the shape's text.
+        """
+        if self._paragraphs is None:
+            self._paragraphs = []
+            if self.shape and hasattr(self.shape, "text_frame"):
+                text_frame = self.shape.text_frame  # type: ignore
+                for idx, paragraph in enumerate(text_frame.paragraphs):
+                    if paragraph.text.strip():
+                        self._paragraphs.append(ParagraphData(paragraph, idx))
+        return self._paragraphs
+
+    def invalidate_paragraphs(self) -> None:
+        """Drop cached paragraphs so they are re-read from the shape."""
+        self._paragraphs = None
+
+    def _get_default_font_size(self, level: int = 0) -> int:
+        """Get default font size from theme text styles or use conservative default.
 
-    def _get_default_font_size(self) -> int:
-        """Get default font size from theme text styles or use conservative default."""
+        Args:
+            level: Outline level of the paragraph (0 for the first level)
+        """
         try:
             if not (
                 hasattr(self.shape, "part") and hasattr(self.shape.part, "slide_layout")
@@ -489,18 +918,12 @@ class ShapeData:
             if not hasattr(slide_master, "element"):
                 return 14
 
-            # Determine theme style based on placeholder type
-            style_name = "bodyStyle"  # Default
-            if self.placeholder_type and "TITLE" in self.placeholder_type:
-                style_name = "titleStyle"
-
-            # Find font size in theme styles
-            for child in slide_master.element.iter():
-                tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-                if tag == style_name:
-                    for elem in child.iter():
-                        if "sz" in elem.attrib:
-                            return int(elem.attrib["sz"]) // 100
+            # Font size from the master's title or body text style
+            font_size = self.style_resolver.master_font_size(
+                slide_master, self.placeholder_type, level
+            )
+            if font_size is not None:
+                return font_size
         except Exception:
             pass
 
@@ -531,8 +954,15 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
+    @staticmethod
+    def _wrap_text_line(line: str, max_width_px: int, draw, font) -> List[str]:
+        """Wrap a single line of text to fit within max_width_px.
+
+        Candidate line widths are accumulated from cached per-word widths. The
+        exact width of a candidate line is only measured when the estimate is
+        within the kerning slack of max_width_px, so wrap decisions are the same
+        as measuring every candidate line.
+        """
         if not line:
             return [""]
 
@@ -540,19 +970,59 @@ class ShapeData:
         if draw.textlength(line, font=font) <= max_width_px:
             return [line]
 
+        try:
+            widths = _word_widths.setdefault(font, {})
+        except TypeError:  # Font object does not support weak references
+            widths = {}
+
+        def width_of(text: str) -> float:
+            width = widths.get(text)
+            if width is None:
+                width = widths[text] = draw.textlength(text, font=font)
+            return width
+
+        space_width = width_of(" ")
+        junction_slack = 2 * getattr(font, "size", 0) * WRAP_KERNING_SLACK_EM
+
         # Need to wrap - split into words
         wrapped = []
-        words = line.split(" ")
         current_line = ""
+        current_width = 0.0
+        # Word boundaries whose kerning is not reflected in current_width
+        unmeasured_junctions = 0
+
+        for word in line.split(" "):
+            word_width = width_of(word)
+            if current_line:
+                test_line = current_line + " " + word
+                test_width = current_width + space_width + word_width
+                test_junctions = unmeasured_junctions + 1
+            else:
+                test_line = word
+                test_width = word_width
+                test_junctions = 0
+
+            slack = test_junctions * junction_slack
+            if test_width + slack <= max_width_px:
+                fits = True
+            elif test_width - slack > max_width_px:
+                fits = False
+            else:
+                # Too close to call from the estimate - measure the real line
+                test_width = draw.textlength(test_line, font=font)
+                test_junctions = 0
+                fits = test_width <= max_width_px
 
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
+            if fits:
                 current_line = test_line
+                current_width = test_width
+                unmeasured_junctions = test_junctions
             else:
                 if current_line:
                     wrapped.append(current_line)
                 current_line = word
+                current_width = word_width
+                unmeasured_junctions = 0
 
         if current_line:
             wrapped.append(current_line)
@@ -565,7 +1035,7 @@ class ShapeData:
             return
 
         text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
+        if not text_frame or not self.paragraphs:
             return
 
         # Get usable dimensions after accounting for margins
@@ -577,35 +1047,23 @@ class ShapeData:
         dummy_img = Image.new("RGB", (1, 1))
         draw = ImageDraw.Draw(dummy_img)
 
-        # Get default font size from placeholder or use conservative estimate
-        default_font_size = self._get_default_font_size()
-
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
-
-            para_data = ParagraphData(paragraph)
-
+        for para_data in self.paragraphs:
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
-            font_size = int(para_data.font_size or default_font_size)
+            # Default size of the paragraph's outline level in the master style
+            font_size = int(
+                para_data.font_size
+                or self._get_default_font_size(para_data.outline_level)
+            )
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            font = load_font(self.get_font_path(font_name), font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
+            for line in para_data.raw_text.split("\n"):
                 wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
                 all_wrapped_lines.extend(wrapped)
 
@@ -619,7 +1077,7 @@ class ShapeData:
                     line_height_px = font_size * 96 / 72
 
                 # Add space_before (except first paragraph)
-                if para_idx > 0 and para_data.space_before:
+                if para_data.index > 0 and para_data.space_before:
                     total_height_px += para_data.space_before * 96 / 72
 
                 # Add paragraph text height
@@ -659,20 +1117,13 @@ class ShapeData:
 
     def _detect_bullet_issues(self) -> None:
         """Detect bullet point formatting issues in paragraphs."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
-
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
-            return
-
         # Common bullet symbols that indicate manual bullets
         bullet_symbols = ["•", "●", "○"]
 
-        for paragraph in text_frame.paragraphs:
-            text = paragraph.text.strip()
+        for para_data in self.paragraphs:
+            text = para_data.text
             # Check for manual bullet symbols
-            if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
+            if any(text.startswith(symbol + " ") for symbol in bullet_symbols):
                 self.warnings.append(
                     "manual_bullet_symbol: use proper bullet formatting"
                 )
@@ -764,7 +1215,10 @@ def is_valid_shape(shape: BaseShape) -> bool:
 
 
 def collect_shapes_with_absolute_positions(
-    shape: BaseShape, parent_left: int = 0, parent_top: int = 0
+    shape: BaseShape,
+    parent_left: int = 0,
+    parent_top: int = 0,
+    path: Tuple[int, ...] = (),
 ) -> List[ShapeWithPosition]:
     """Recursively collect all shapes with valid text, calculating absolute positions.
 
@@ -776,6 +1230,7 @@ def collect_shapes_with_absolute_positions(
         shape: The shape to process
         parent_left: Accumulated left offset from parent groups (in EMUs)
         parent_top: Accumulated top offset from parent groups (in EMUs)
+        path: Index path of this shape (see ShapeWithPosition.path)
 
     Returns:
         List of ShapeWithPosition objects with absolute positions
@@ -791,10 +1246,10 @@ def collect_shapes_with_absolute_positions(
         abs_group_top = parent_top + group_top
 
         # Process children with accumulated offsets
-        for child in shape.shapes:  # type: ignore
+        for child_idx, child in enumerate(shape.shapes):  # type: ignore
             result.extend(
                 collect_shapes_with_absolute_positions(
-                    child, abs_group_left, abs_group_top
+                    child, abs_group_left, abs_group_top, path + (child_idx,)
                 )
             )
         return result
@@ -810,6 +1265,7 @@ def collect_shapes_with_absolute_positions(
                 shape=shape,
                 absolute_left=parent_left + shape_left,
                 absolute_top=parent_top + shape_top,
+                path=path,
             )
         ]
 
@@ -879,65 +1335,209 @@ def calculate_overlap(
     return False, 0
 
 
-def detect_overlaps(shapes: List[ShapeData]) -> None:
+def detect_overlaps(shapes: List[ShapeData], tolerance: float = 0.05) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Uses a sweep line over the shapes' left edges so that calculate_overlap is
+    only called for pairs whose horizontal extents overlap by more than the
+    tolerance. Results (including the order of overlapping_shapes entries) are
+    the same as comparing every pair.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
+        tolerance: Minimum overlap in inches to consider as overlapping (default: 0.05")
     """
-    n = len(shapes)
-
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
-
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
-
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
-
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
-
+    for i, shape in enumerate(shapes):
+        # Ensure shape IDs are set
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
+    order = sorted(range(len(shapes)), key=lambda k: rects[k][0])
+
+    found = []  # (i, j, overlap_area) with i < j
+    active: List[int] = []  # Indices whose right edge may still reach later shapes
+    for k in order:
+        left = rects[k][0]
+        # Drop shapes that end before this left edge (plus tolerance); every later
+        # shape starts at or after this edge, so they can no longer overlap
+        active = [a for a in active if rects[a][0] + rects[a][2] - left > tolerance]
+        for a in active:
+            overlaps, overlap_area = calculate_overlap(rects[a], rects[k], tolerance)
             if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+                found.append((min(a, k), max(a, k), overlap_area))
+        active.append(k)
+
+    # Apply in pairwise (i, j) order so dict insertion order matches a full scan
+    found.sort(key=lambda pair: (pair[0], pair[1]))
+    for i, j, overlap_area in found:
+        shape1 = shapes[i]
+        shape2 = shapes[j]
+        # Add shape IDs with overlap area in square inches
+        shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+        shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+class InventoryCache:
+    """On-disk cache of slide inventories, keyed by the XML they depend on.
+
+    A slide's entry is keyed by a hash of its slide part XML, its layout and
+    master XML, the slide size, the installed fonts, the Pillow version and
+    INVENTORY_CACHE_VERSION. inventory.py,
+    replace.py and thumbnail.py all go through extract_slide_inventory, so
+    after one tool has inventoried a deck the others only re-measure slides
+    whose XML changed. Entries store each shape's to_dict() output, the
+    position, unstripped text and outline level of its paragraphs, its EMU
+    geometry and its index path in the shape tree; on a hit the ShapeData is
+    rebuilt around the live shape without touching its text frame.
+
+    The directory is kept under max_bytes by deleting the least recently used
+    entries; this happens on the first write of each InventoryCache and after
+    every further max_bytes / 10 written.
+
+    Reading and writing are best effort: unreadable entries are recomputed
+    and write errors are ignored.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = INVENTORY_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # layout/master part -> hash of its XML, shared by many slides
+        self._part_hashes: Dict[Any, bytes] = {}
+        # Bytes written since the last prune; None before the first write
+        self._unpruned_bytes: Optional[int] = None
+
+    @classmethod
+    def default(cls) -> Optional["InventoryCache"]:
+        """Cache in $PPTX_INVENTORY_CACHE or ~/.cache/pptx-inventory, or None if
+        the variable is set to off/0/false/no."""
+        setting = os.environ.get(INVENTORY_CACHE_ENV)
+        if setting is not None and setting.lower() in ("off", "0", "false", "no"):
+            return None
+        if setting:
+            return cls(Path(setting))
+        return cls(Path.home() / ".cache" / "pptx-inventory")
+
+    def _part_hash(self, part: Any) -> bytes:
+        digest = self._part_hashes.get(part)
+        if digest is None:
+            digest = self._part_hashes[part] = hashlib.sha256(part.blob).digest()
+        return digest
+
+    def slide_key(self, slide: Any) -> str:
+        """Cache key of a slide in its current (possibly edited) state."""
+        slide_layout = slide.slide_layout
+        digest = hashlib.sha256(f"v{INVENTORY_CACHE_VERSION}".encode())
+        digest.update(_measurement_fingerprint())
+        digest.update(hashlib.sha256(slide.part.blob).digest())
+        digest.update(self._part_hash(slide_layout.part))
+        digest.update(self._part_hash(slide_layout.slide_master.part))
+        digest.update(str(ShapeData.get_slide_dimensions(slide)).encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def load(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached shape entries of a slide in shape-N order, or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)["shapes"]
+            os.utime(path)  # Mark as recently used for pruning
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entries
+
+    def store(self, key: str, entries: List[Dict[str, Any]]) -> None:
+        """Write a slide's shape entries (atomically, so readers never see
+        partial files)."""
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"shapes": entries}, f, ensure_ascii=False)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # Caching is an optimization; extraction already succeeded
+
+        if self._unpruned_bytes is not None:
+            self._unpruned_bytes += size
+            if self._unpruned_bytes < self.max_bytes // 10:
+                return
+        prune_cache_directory(self.directory, self.max_bytes)
+        self._unpruned_bytes = 0
+
+
+def _shapes_from_cache(
+    slide: Any,
+    entries: List[Dict[str, Any]],
+    style_resolver: Optional[StyleResolver],
+) -> Optional[List[ShapeData]]:
+    """Rebuild a slide's sorted ShapeData list from cache entries.
+
+    Returns None if an entry does not match the slide's shape tree.
+    """
+    top_level = list(slide.shapes)
+    shape_data_list = []
+    try:
+        for idx, entry in enumerate(entries):
+            path = entry["path"]
+            shape = top_level[path[0]]
+            for child_idx in path[1:]:
+                shape = shape.shapes[child_idx]  # type: ignore
+            shape_data = ShapeData.from_dict(
+                shape,
+                entry["shape"],
+                tuple(entry["emu"]),
+                slide,
+                style_resolver,
+                entry["paragraph_info"],
+            )
+            shape_data.shape_id = f"shape-{idx}"
+            shape_data_list.append(shape_data)
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return None
+    return shape_data_list
 
 
-def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
-) -> InventoryData:
-    """Extract text content from all slides in a PowerPoint presentation.
+def extract_slide_inventory(
+    slide: Any,
+    issues_only: bool = False,
+    style_resolver: Optional[StyleResolver] = None,
+    cache: Optional[InventoryCache] = None,
+) -> Dict[str, ShapeData]:
+    """Extract text shapes of a single slide.
 
     Args:
-        pptx_path: Path to the PowerPoint file
-        prs: Optional Presentation object to use. If not provided, will load from pptx_path.
+        slide: The slide to process
         issues_only: If True, only include shapes that have overflow or overlap issues
+        style_resolver: Optional StyleResolver shared across slides
+        cache: Optional InventoryCache to reuse and store the slide's results
 
-    Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
-    Shapes are sorted by visual position (top-to-bottom, left-to-right).
-    The ShapeData objects contain the full shape information and can be
-    converted to dictionaries for JSON serialization using to_dict().
+    Returns:
+        Dict of shape-N -> ShapeData, sorted by visual position (empty if the
+        slide has no text shapes)
     """
-    if prs is None:
-        prs = Presentation(str(pptx_path))
-    inventory: InventoryData = {}
-
-    for slide_idx, slide in enumerate(prs.slides):
+    # Key the cache on the slide as it is now, before extraction touches it
+    cache_key = cache.slide_key(slide) if cache else None
+    sorted_shapes = None
+    if cache and cache_key:
+        entries = cache.load(cache_key)
+        if entries is not None:
+            sorted_shapes = _shapes_from_cache(slide, entries, style_resolver)
+
+    if sorted_shapes is None:
         # Collect all valid shapes from this slide with absolute positions
         shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
-
-        if not shapes_with_positions:
-            continue
+        for idx, shape in enumerate(slide.shapes):  # type: ignore
+            shapes_with_positions.extend(
+                collect_shapes_with_absolute_positions(shape, path=(idx,))
+            )
 
         # Convert to ShapeData with absolute positions and slide reference
         shape_data_list = [
@@ -946,9 +1546,14 @@ def extract_text_inventory(
                 swp.absolute_left,
                 swp.absolute_top,
                 slide,
+                style_resolver,
             )
             for swp in shapes_with_positions
         ]
+        paths = {
+            id(shape_data): swp.path
+            for shape_data, swp in zip(shape_data_list, shapes_with_positions)
+        }
 
         # Sort by visual position and assign stable IDs in one step
         sorted_shapes = sort_shapes_by_position(shape_data_list)
@@ -959,22 +1564,160 @@ def extract_text_inventory(
         if len(sorted_shapes) > 1:
             detect_overlaps(sorted_shapes)
 
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+        if cache and cache_key:
+            cache.store(
+                cache_key,
+                [
+                    {
+                        "path": list(paths[id(sd)]),
+                        "emu": [sd.left_emu, sd.top_emu, sd.width_emu, sd.height_emu],
+                        "shape": sd.to_dict(),
+                        "paragraph_info": [
+                            [para.index, para.raw_text, para.outline_level]
+                            for para in sd.paragraphs
+                        ],
+                    }
+                    for sd in sorted_shapes
+                ],
+            )
 
-        if not sorted_shapes:
-            continue
+    if not sorted_shapes:
+        return {}
 
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+
+    # Create slide inventory using the stable shape IDs
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
+
+
+def extract_text_inventory(
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    use_cache: bool = True,
+) -> InventoryData:
+    """Extract text content from all slides in a PowerPoint presentation.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        prs: Optional Presentation object to use. If not provided, will load from pptx_path.
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        use_cache: Reuse and update the on-disk InventoryCache (unless disabled
+            through the PPTX_INVENTORY_CACHE environment variable)
+
+    Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
+    Shapes are sorted by visual position (top-to-bottom, left-to-right).
+    The ShapeData objects contain the full shape information and can be
+    converted to dictionaries for JSON serialization using to_dict().
+    """
+    return dict(iter_text_inventory(pptx_path, prs, issues_only, use_cache))
+
+
+def iter_text_inventory(
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    use_cache: bool = True,
+) -> Iterator[Tuple[str, Dict[str, ShapeData]]]:
+    """Yield (slide-N, {shape-N: ShapeData}) for each slide with text shapes.
+
+    Same results as extract_text_inventory, produced one slide at a time so
+    callers can write or process each slide and drop it before the next one.
+    """
+    if prs is None:
+        prs = Presentation(str(pptx_path))
+    style_resolver = StyleResolver()
+    cache = InventoryCache.default() if use_cache else None
+
+    for slide_idx, slide in enumerate(prs.slides):
+        slide_inventory = extract_slide_inventory(
+            slide, issues_only, style_resolver, cache
+        )
+        if slide_inventory:
+            yield f"slide-{slide_idx}", slide_inventory
+
+
+def _extract_slides_as_dict(
+    task: Tuple[str, List[int], bool, bool],
+) -> List[Tuple[int, Dict[str, ShapeDict]]]:
+    """Worker entry point: inventory a subset of slides from its own Presentation.
+
+    Args:
+        task: (pptx_path, slide indices, issues_only, use_cache)
+
+    Returns:
+        List of (slide index, {shape-N: shape dict}) for slides with text shapes
+    """
+    pptx_path, slide_indices, issues_only, use_cache = task
+    prs = Presentation(pptx_path)
+    slides = prs.slides
+    style_resolver = StyleResolver()
+    cache = InventoryCache.default() if use_cache else None
+
+    results = []
+    for slide_idx in slide_indices:
+        slide_inventory = extract_slide_inventory(
+            slides[slide_idx], issues_only, style_resolver, cache
+        )
+        if slide_inventory:
+            results.append(
+                (
+                    slide_idx,
+                    {key: sd.to_dict() for key, sd in slide_inventory.items()},
+                )
+            )
+    return results
+
+
+def extract_text_inventory_parallel(
+    pptx_path: Path, jobs: int, issues_only: bool = False, use_cache: bool = True
+) -> InventoryDict:
+    """Extract the text inventory with slides partitioned across worker processes.
+
+    Each worker opens the presentation itself and returns JSON-serializable
+    shape dictionaries (ShapeData holds live python-pptx objects, which cannot
+    cross process boundaries). Slides are dealt round-robin so dense sections
+    of a deck are spread over all workers, and results are merged back in
+    slide order, giving the same output as the sequential extraction.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        jobs: Number of worker processes
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        use_cache: Reuse and update the on-disk InventoryCache
 
-    return inventory
+    Returns:
+        Nested dictionary {slide-N: {shape-N: shape dict}}
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    slide_count = len(Presentation(str(pptx_path)).slides)
+    jobs = max(1, min(jobs, slide_count))
+    tasks = [
+        (
+            str(pptx_path),
+            list(range(worker, slide_count, jobs)),
+            issues_only,
+            use_cache,
+        )
+        for worker in range(jobs)
+    ]
+
+    if jobs == 1:
+        results = [_extract_slides_as_dict(tasks[0])] if slide_count else []
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_extract_slides_as_dict, tasks))
 
+    merged = sorted(item for worker_results in results for item in worker_results)
+    return {f"slide-{slide_idx}": shapes for slide_idx, shapes in merged}
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+
+def get_inventory_as_dict(
+    pptx_path: Path, issues_only: bool = False, jobs: int = 1, use_cache: bool = True
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
@@ -984,11 +1727,18 @@ def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> Invento
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Number of worker processes; values above 1 extract slides in parallel
+        use_cache: Reuse and update the on-disk InventoryCache
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
+    if jobs > 1:
+        return extract_text_inventory_parallel(pptx_path, jobs, issues_only, use_cache)
+
+    inventory = extract_text_inventory(
+        pptx_path, issues_only=issues_only, use_cache=use_cache
+    )
 
     # Convert ShapeData objects to dictionaries
     dict_inventory: InventoryDict = {}
@@ -1000,20 +1750,169 @@ def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> Invento
     return dict_inventory
 
 
-def save_inventory(inventory: InventoryData, output_path: Path) -> None:
+def save_inventory(
+    inventory: Union[InventoryData, InventoryDict], output_path: Path
+) -> None:
     """Save inventory to JSON file with proper formatting.
 
-    Converts ShapeData objects to dictionaries for JSON serialization.
+    Converts ShapeData objects to dictionaries for JSON serialization; shapes
+    that are already dictionaries (parallel extraction) are written as-is.
+    A .jsonl output path writes JSON Lines (see write_inventory).
     """
-    # Convert ShapeData objects to dictionaries
-    json_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        json_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    write_inventory(inventory.items(), output_path)
+
+
+def write_inventory(
+    slides: Iterable[Tuple[str, Dict[str, Union[ShapeData, ShapeDict]]]],
+    output_path: Path,
+) -> Tuple[int, int]:
+    """Write (slide-N, shapes) pairs to a file as they are produced.
+
+    Each slide is serialized and written before the next one is requested, so
+    with a generator such as iter_text_inventory only one slide's ShapeData
+    objects (and their python-pptx shape references) are alive at a time.
+
+    A .jsonl path gets one {"slide-N": {...}} object per line; any other path
+    gets the same indented JSON document json.dump(inventory, indent=2) writes.
+
+    Returns:
+        (number of slides, number of shapes) written
+    """
+    jsonl = Path(output_path).suffix.lower() == ".jsonl"
+    slide_count = shape_count = 0
 
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(json_inventory, f, indent=2, ensure_ascii=False)
+        for slide_key, shapes in slides:
+            slide_dict = {
+                shape_key: shape_data.to_dict()
+                if isinstance(shape_data, ShapeData)
+                else shape_data
+                for shape_key, shape_data in shapes.items()
+            }
+            if jsonl:
+                f.write(json.dumps({slide_key: slide_dict}, ensure_ascii=False))
+                f.write("\n")
+            else:
+                # Nested value of an indent=2 document: indent every line but the
+                # first by one more level (JSON strings never contain raw newlines)
+                value = json.dumps(slide_dict, indent=2, ensure_ascii=False)
+                f.write("{\n" if slide_count == 0 else ",\n")
+                f.write(f"  {json.dumps(slide_key)}: ")
+                f.write(value.replace("\n", "\n  "))
+            slide_count += 1
+            shape_count += len(slide_dict)
+
+        if not jsonl:
+            f.write("\n}" if slide_count else "{}")
+
+    return slide_count, shape_count
+
+
+def iter_inventory_file(
+    path: Path,
+    object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[Tuple[str, Any]]:
+    """Yield the top-level (key, value) pairs of an inventory file one at a time.
+
+    Reads JSON Lines files (write_inventory's .jsonl output) line by line and
+    JSON documents whose top level is an object incrementally, decoding each
+    member as soon as it has been read, so memory stays proportional to the
+    largest slide rather than the whole file. Works for any JSON object with
+    this layout, such as replace.py's replacement files.
+
+    Args:
+        path: .json or .jsonl file
+        object_pairs_hook: Passed to the JSON decoder for nested objects
+        chunk_size: Number of characters read at a time
+
+    Raises:
+        ValueError: If the file is not a JSON object (or object per line)
+    """
+    decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+
+    if Path(path).suffix.lower() == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = decoder.decode(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: {e}") from e
+                if isinstance(record, list):  # object_pairs_hook returned pairs
+                    yield from record
+                elif isinstance(record, dict):
+                    yield from record.items()
+                else:
+                    raise ValueError(f"{path}:{line_number}: expected a JSON object")
+        return
+
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            """Append the next chunk; drop consumed text. False at end of file."""
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            return not eof
+
+        def skip_whitespace() -> str:
+            """Advance past whitespace and return the next character ("" at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return buffer[pos:pos + 1]
+
+        def decode_value() -> Any:
+            """Decode the JSON value at pos, reading more input as needed."""
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # A number at the end of the buffer may continue in the next chunk
+                if end == len(buffer) and not eof and fill():
+                    continue
+                pos = end
+                return value
+
+        def expect(char: str) -> None:
+            nonlocal pos
+            if skip_whitespace() != char:
+                raise ValueError(f"{path}: expected '{char}'")
+            pos += 1
+
+        try:
+            expect("{")
+            if skip_whitespace() == "}":
+                return
+            while True:
+                skip_whitespace()
+                key = decode_value()
+                if not isinstance(key, str):
+                    raise ValueError(f"{path}: object keys must be strings")
+                expect(":")
+                skip_whitespace()
+                yield key, decode_value()
+                char = skip_whitespace()
+                pos += 1
+                if char == "}":
+                    return
+                if char != ",":
+                    raise ValueError(f"{path}: expected ',' or '}}' after '{key}'")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}") from e
 
 
 if __name__ == "__main__":
@@ -0,0 +1,384 @@
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from inventory import (
+    ShapeData,
+    _font_index,
+    _measurement_fingerprint,
+    calculate_overlap,
+    detect_overlaps,
+    iter_inventory_file,
+    load_font,
+    resolve_font_path,
+    write_inventory,
+)
+
+
+def make_shapes(count, seed=0, slide_width=13.33, slide_height=7.5, max_size=1.5):
+    """Create random shape stand-ins with the attributes detect_overlaps uses."""
+    rng = random.Random(seed)
+    shapes = []
+    for idx in range(count):
+        width = round(rng.uniform(0.1, max_size), 2)
+        height = round(rng.uniform(0.1, max_size), 2)
+        shapes.append(
+            SimpleNamespace(
+                shape_id=f"shape-{idx}",
+                left=round(rng.uniform(0, slide_width - width), 2),
+                top=round(rng.uniform(0, slide_height - height), 2),
+                width=width,
+                height=height,
+                overlapping_shapes={},
+            )
+        )
+    return shapes
+
+
+def detect_overlaps_all_pairs(shapes):
+    """Reference implementation comparing every pair of shapes."""
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            shape1, shape2 = shapes[i], shapes[j]
+            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
+            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDetectOverlaps(unittest.TestCase):
+    def assert_same_as_all_pairs(self, shapes):
+        expected = [
+            SimpleNamespace(**{**vars(s), "overlapping_shapes": {}}) for s in shapes
+        ]
+        detect_overlaps_all_pairs(expected)
+        detect_overlaps(shapes)
+        for got, want in zip(shapes, expected):
+            # Compare as lists to check the insertion order used in JSON output
+            self.assertEqual(
+                list(got.overlapping_shapes.items()),
+                list(want.overlapping_shapes.items()),
+            )
+
+    def test_no_shapes(self):
+        detect_overlaps([])
+
+    def test_touching_edges_do_not_overlap(self):
+        shapes = make_shapes(2)
+        shapes[0].left, shapes[0].top, shapes[0].width, shapes[0].height = 1, 1, 1, 1
+        shapes[1].left, shapes[1].top, shapes[1].width, shapes[1].height = 2, 1, 1, 1
+        detect_overlaps(shapes)
+        self.assertEqual(shapes[0].overlapping_shapes, {})
+        self.assertEqual(shapes[1].overlapping_shapes, {})
+
+    def test_overlap_within_tolerance_ignored(self):
+        shapes = make_shapes(2)
+        shapes[0].left, shapes[0].top, shapes[0].width, shapes[0].height = 1, 1, 1, 1
+        shapes[1].left, shapes[1].top, shapes[1].width, shapes[1].height = 1.96, 1, 1, 1
+        detect_overlaps(shapes)
+        self.assertEqual(shapes[0].overlapping_shapes, {})
+
+    def test_simple_overlap(self):
+        shapes = make_shapes(2)
+        shapes[0].left, shapes[0].top, shapes[0].width, shapes[0].height = 1, 1, 2, 2
+        shapes[1].left, shapes[1].top, shapes[1].width, shapes[1].height = 2, 2, 2, 2
+        detect_overlaps(shapes)
+        self.assertEqual(shapes[0].overlapping_shapes, {"shape-1": 1.0})
+        self.assertEqual(shapes[1].overlapping_shapes, {"shape-0": 1.0})
+
+    def test_matches_all_pairs_on_random_slides(self):
+        for seed in range(20):
+            self.assert_same_as_all_pairs(make_shapes(60, seed=seed))
+
+    def test_matches_all_pairs_on_dense_slide(self):
+        self.assert_same_as_all_pairs(make_shapes(400, seed=1, max_size=0.6))
+
+    def test_benchmark_dense_slide(self):
+        """Print timings for a dense synthetic slide (diagram-like, 1000 small shapes)."""
+        shapes = make_shapes(1000, seed=2, max_size=0.4)
+        reference = [
+            SimpleNamespace(**{**vars(s), "overlapping_shapes": {}}) for s in shapes
+        ]
+
+        start = time.perf_counter()
+        detect_overlaps_all_pairs(reference)
+        all_pairs_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detect_overlaps(shapes)
+        sweep_time = time.perf_counter() - start
+
+        print(
+            f"\n1000 shapes: all pairs {all_pairs_time * 1000:.1f} ms, "
+            f"sweep line {sweep_time * 1000:.1f} ms"
+        )
+        for got, want in zip(shapes, reference):
+            self.assertEqual(got.overlapping_shapes, want.overlapping_shapes)
+
+
+class KerningDraw:
+    """ImageDraw stand-in whose text widths include pairwise kerning."""
+
+    def __init__(self, seed=0):
+        rng = random.Random(seed)
+        self.advances = {chr(c): rng.uniform(4, 12) for c in range(32, 127)}
+        self.kerning = {
+            (a, b): rng.uniform(-2, 1)
+            for a in self.advances
+            for b in self.advances
+            if rng.random() < 0.1
+        }
+        self.calls = 0
+        self.chars = 0
+
+    def textlength(self, text, font=None):
+        self.calls += 1
+        self.chars += len(text)
+        width = sum(self.advances[c] for c in text)
+        for pair in zip(text, text[1:]):
+            width += self.kerning.get(pair, 0.0)
+        return width
+
+
+def wrap_text_line_exact(line, max_width_px, draw, font):
+    """Reference implementation measuring every candidate line."""
+    if not line:
+        return [""]
+    if draw.textlength(line, font=font) <= max_width_px:
+        return [line]
+    wrapped = []
+    current_line = ""
+    for word in line.split(" "):
+        test_line = current_line + " " + word if current_line else word
+        if draw.textlength(test_line, font=font) <= max_width_px:
+            current_line = test_line
+        else:
+            if current_line:
+                wrapped.append(current_line)
+            current_line = word
+    if current_line:
+        wrapped.append(current_line)
+    return wrapped
+
+
+def make_text(word_count, seed=0, vocabulary_size=300):
+    """Random text drawn from a fixed vocabulary, like real prose."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyzAVWTY.,"
+    vocabulary = [
+        "".join(rng.choice(letters) for _ in range(rng.randint(1, 12)))
+        for _ in range(vocabulary_size)
+    ]
+    return " ".join(rng.choice(vocabulary) for _ in range(word_count))
+
+
+class TestWrapTextLine(unittest.TestCase):
+    def setUp(self):
+        # Kerning above is at most 2px per pair, so 4px where a space joins two
+        # words (two pairs); size 4 gives 2px of slack per pair
+        self.font = SimpleNamespace(size=4)
+
+    def test_empty_line(self):
+        self.assertEqual(
+            ShapeData._wrap_text_line("", 100, KerningDraw(), self.font), [""]
+        )
+
+    def test_line_that_fits(self):
+        draw = KerningDraw()
+        self.assertEqual(
+            ShapeData._wrap_text_line("short text", 1000, draw, self.font),
+            ["short text"],
+        )
+
+    def test_matches_exact_measurement(self):
+        for seed in range(20):
+            draw = KerningDraw(seed)
+            text = make_text(80, seed=seed)
+            for max_width in (30, 120, 250, 600):
+                self.assertEqual(
+                    ShapeData._wrap_text_line(text, max_width, draw, self.font),
+                    wrap_text_line_exact(text, max_width, draw, self.font),
+                )
+
+    def test_two_kerning_pairs_per_junction(self):
+        draw = KerningDraw()
+        draw.advances = {"a": 10, "b": 10, " ": 10}
+        draw.kerning = {("b", " "): -2, (" ", "a"): -2}
+        # "ab ab" is estimated at 50px but measures 46px, so it fits in 47px
+        self.assertEqual(draw.textlength("ab ab"), 46)
+        self.assertEqual(
+            ShapeData._wrap_text_line("ab ab ab", 47, draw, self.font),
+            ["ab ab", "ab"],
+        )
+
+    def test_benchmark_measurements(self):
+        """Print text measurement work for wrapping a long paragraph."""
+        text = make_text(2000, seed=3)
+        exact_draw = KerningDraw(3)
+        wrap_text_line_exact(text, 400, exact_draw, self.font)
+        cached_draw = KerningDraw(3)
+        ShapeData._wrap_text_line(text, 400, cached_draw, self.font)
+        print(
+            f"\n2000 words: exact {exact_draw.calls} calls / "
+            f"{exact_draw.chars} chars measured, cached {cached_draw.calls} calls / "
+            f"{cached_draw.chars} chars measured"
+        )
+        self.assertLess(cached_draw.chars, exact_draw.chars)
+
+
+def make_inventory(slide_count, seed=0):
+    """Inventory-shaped dict with awkward text (quotes, newlines, non-ASCII)."""
+    rng = random.Random(seed)
+    texts = [
+        "Plain",
+        'Quote " and \\ backslash',
+        "Line\nbreak\vtab",
+        "Ünïcödé • 漢字",
+    ]
+    return {
+        f"slide-{slide}": {
+            f"shape-{shape}": {
+                "left": round(rng.uniform(0, 10), 2),
+                "top": round(rng.uniform(0, 7), 2),
+                "width": 1.5,
+                "height": 0.75,
+                "paragraphs": [
+                    {"text": rng.choice(texts), "font_size": 12.0, "bold": True}
+                ],
+            }
+            for shape in range(rng.randint(1, 4))
+        }
+        for slide in range(slide_count)
+        if slide % 3  # Some slides have no text shapes
+    }
+
+
+class TestInventoryStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_json_output_matches_json_dump(self):
+        for inventory in (make_inventory(30), {}):
+            path = self.dir / "inventory.json"
+            counts = write_inventory(iter(inventory.items()), path)
+            expected = json.dumps(inventory, indent=2, ensure_ascii=False)
+            self.assertEqual(path.read_text(encoding="utf-8"), expected)
+            shape_count = sum(len(shapes) for shapes in inventory.values())
+            self.assertEqual(counts, (len(inventory), shape_count))
+
+    def test_jsonl_round_trip(self):
+        inventory = make_inventory(30)
+        path = self.dir / "inventory.jsonl"
+        write_inventory(inventory.items(), path)
+        self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 20)
+        self.assertEqual(dict(iter_inventory_file(path)), inventory)
+
+    def test_json_reader_across_chunk_boundaries(self):
+        inventory = make_inventory(30)
+        path = self.dir / "inventory.json"
+        write_inventory(inventory.items(), path)
+        for chunk_size in (1, 7, 64, 1 << 16):
+            items = list(iter_inventory_file(path, chunk_size=chunk_size))
+            self.assertEqual(items, list(inventory.items()))
+
+    def test_json_reader_compact_and_scalar_values(self):
+        path = self.dir / "data.json"
+        path.write_text('{"a":1,"b" : [1, 2.5e3],"c":{"d":null}, "e": 12345}')
+        self.assertEqual(
+            list(iter_inventory_file(path, chunk_size=3)),
+            [("a", 1), ("b", [1, 2500.0]), ("c", {"d": None}), ("e", 12345)],
+        )
+        path.write_text("  { }  ")
+        self.assertEqual(list(iter_inventory_file(path)), [])
+
+    def test_json_reader_passes_object_pairs_hook(self):
+        path = self.dir / "data.json"
+        path.write_text('{"slide-0": {"shape-0": {}, "shape-0": {}}}')
+
+        def reject_duplicates(pairs):
+            keys = [key for key, _ in pairs]
+            if len(keys) != len(set(keys)):
+                raise ValueError("duplicate")
+            return dict(pairs)
+
+        with self.assertRaisesRegex(ValueError, "duplicate"):
+            list(iter_inventory_file(path, object_pairs_hook=reject_duplicates))
+
+    def test_json_reader_rejects_malformed_input(self):
+        path = self.dir / "data.json"
+        malformed = ['["a"]', '{"slide-0": {}', '{"slide-0" {}}', '{"a": 1 "b": 2}']
+        for text in malformed:
+            path.write_text(text)
+            with self.assertRaises(ValueError, msg=text):
+                list(iter_inventory_file(path, chunk_size=4))
+
+
+
+class TestFontResolution(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.home = Path(self.tmpdir.name)
+        patches = [
+            mock.patch("inventory.platform.system", return_value="Linux"),
+            mock.patch.dict(os.environ, {"HOME": str(self.home)}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.clear_caches()
+        self.addCleanup(self.clear_caches)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def clear_caches():
+        for cached in (_font_index, resolve_font_path, _measurement_fingerprint):
+            cached.cache_clear()
+
+    def add_font(self, relative_path):
+        path = self.home / ".fonts" / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+        return str(path)
+
+    def test_resolves_fonts_in_nested_directories(self):
+        nested = self.add_font("truetype/zyx-sans/ZyxSans-Bold.ttf")
+        regular = self.add_font("truetype/zyx-sans/Zyx_Sans.otf")
+        self.add_font("truetype/zyx-sans/README.txt")
+
+        self.assertEqual(resolve_font_path("Zyx Sans Bold"), nested)
+        self.assertEqual(resolve_font_path("zyx-sans"), regular)
+        self.assertIsNone(resolve_font_path("Qwv Serif"))
+        self.assertNotIn("readme", _font_index())
+
+        # Directories are scanned once and results are memoized per name
+        later = self.add_font("opentype/QwvSerif.ttf")
+        self.assertIsNone(resolve_font_path("Qwv Serif"))
+        self.assertEqual(resolve_font_path.cache_info().hits, 1)
+        self.clear_caches()
+        self.assertEqual(resolve_font_path("Qwv Serif"), later)
+
+    def test_load_font_is_memoized(self):
+        path = self.add_font("truetype/Broken.ttf")
+        font = load_font(path, 12)
+        # An unreadable file falls back to PIL's default font, cached as well
+        self.assertIs(load_font(path, 12), font)
+        self.assertIsNot(load_font(path, 14), font)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,929 @@
+#!/usr/bin/env python3
+"""
+Extract the text inventory of a PowerPoint file directly from its XML parts.
+
+Produces the same JSON as inventory.py, but reads ppt/slides/slideN.xml and the
+related layout, master and presentation parts straight from the zip archive with
+lxml instead of going through python-pptx's shape, text frame and font proxies.
+Nothing is written back to the XML: python-pptx's font.color adds empty
+<a:solidFill/> elements as a side effect, this extractor never mutates a part.
+
+Group offsets and placeholder inheritance (slide placeholder -> layout
+placeholder with the same idx -> master placeholder of the base type) are
+resolved here the same way python-pptx resolves them.
+
+Main Functions:
+    extract_text_inventory_xml: Extract all text from a presentation
+    get_inventory_as_dict_xml: Same, as JSON-serializable dictionaries
+    remeasure_shapes: Re-check edited shapes of an open Presentation in memory
+
+Usage:
+    python inventory_xml.py input.pptx output.json [--issues-only]
+"""
+
+import argparse
+import posixpath
+import sys
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lxml import etree
+from pptx.enum.text import MSO_UNDERLINE, PP_ALIGN
+from pptx.util import Centipoints
+
+from inventory import (
+    InventoryDict,
+    ShapeData,
+    StyleResolver,
+    detect_overlaps,
+    save_inventory,
+    sort_shapes_by_position,
+)
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+RT_OFFICE_DOCUMENT = f"{R_NS}/officeDocument"
+RT_SLIDE = f"{R_NS}/slide"
+RT_SLIDE_LAYOUT = f"{R_NS}/slideLayout"
+RT_SLIDE_MASTER = f"{R_NS}/slideMaster"
+
+# Shape elements python-pptx exposes in a shape tree, in document order
+SHAPE_TAGS = {
+    f"{{{P_NS}}}{name}"
+    for name in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart")
+}
+SP_TAG = f"{{{P_NS}}}sp"
+GRPSP_TAG = f"{{{P_NS}}}grpSp"
+R_TAG = f"{{{A_NS}}}r"
+BR_TAG = f"{{{A_NS}}}br"
+FLD_TAG = f"{{{A_NS}}}fld"
+SP_TREE_PATH = f"{{{P_NS}}}cSld/{{{P_NS}}}spTree"
+
+# ST_PlaceholderType values -> PP_PLACEHOLDER member names
+PLACEHOLDER_TYPES = {
+    "body": "BODY",
+    "chart": "CHART",
+    "clipArt": "BITMAP",
+    "ctrTitle": "CENTER_TITLE",
+    "dgm": "ORG_CHART",
+    "dt": "DATE",
+    "ftr": "FOOTER",
+    "hdr": "HEADER",
+    "media": "MEDIA_CLIP",
+    "obj": "OBJECT",
+    "pic": "PICTURE",
+    "sldImg": "SLIDE_IMAGE",
+    "sldNum": "SLIDE_NUMBER",
+    "subTitle": "SUBTITLE",
+    "tbl": "TABLE",
+    "title": "TITLE",
+}
+
+# Master placeholder type a layout placeholder inherits its position from
+BASE_PLACEHOLDER_TYPES = {
+    "ctrTitle": "title",
+    "title": "title",
+    "dt": "dt",
+    "ftr": "ftr",
+    "sldNum": "sldNum",
+}
+
+# ST_SchemeColorVal values -> MSO_THEME_COLOR member names
+THEME_COLORS = {
+    "accent1": "ACCENT_1",
+    "accent2": "ACCENT_2",
+    "accent3": "ACCENT_3",
+    "accent4": "ACCENT_4",
+    "accent5": "ACCENT_5",
+    "accent6": "ACCENT_6",
+    "bg1": "BACKGROUND_1",
+    "bg2": "BACKGROUND_2",
+    "dk1": "DARK_1",
+    "dk2": "DARK_2",
+    "folHlink": "FOLLOWED_HYPERLINK",
+    "hlink": "HYPERLINK",
+    "lt1": "LIGHT_1",
+    "lt2": "LIGHT_2",
+    "tx1": "TEXT_1",
+    "tx2": "TEXT_2",
+}
+
+ALIGNMENTS = {"ctr": PP_ALIGN.CENTER, "r": PP_ALIGN.RIGHT, "just": PP_ALIGN.JUSTIFY}
+
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+def _qn(tag: str) -> str:
+    """Expand a 'p:tag' / 'a:tag' name to Clark notation."""
+    prefix, name = tag.split(":")
+    return f"{{{P_NS if prefix == 'p' else A_NS}}}{name}"
+
+
+def _xsd_bool(value: Optional[str]) -> Optional[bool]:
+    """Parse an xsd:boolean attribute value (None if absent)."""
+    if value is None:
+        return None
+    return value in ("1", "true")
+
+
+class PackageReader:
+    """Read-only access to the parts and relationships of a .pptx archive.
+
+    Parts are parsed once and cached, so layouts and masters shared by many
+    slides are only read once.
+    """
+
+    def __init__(self, zf: zipfile.ZipFile):
+        self._zf = zf
+        self._parts: Dict[str, Any] = {}
+        self._rels: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._placeholders: Dict[str, List[Any]] = {}
+        self._views: Dict[str, "PartView"] = {}
+
+    def part(self, partname: str) -> Any:
+        """Root element of a part."""
+        root = self._parts.get(partname)
+        if root is None:
+            root = etree.fromstring(self._zf.read(partname), _PARSER)
+            self._parts[partname] = root
+        return root
+
+    def view(self, partname: str) -> "PartView":
+        """Cached PartView of a part (the key StyleResolver indexes by)."""
+        view = self._views.get(partname)
+        if view is None:
+            view = self._views[partname] = PartView(partname, self.part(partname))
+        return view
+
+    def rels(self, partname: str) -> List[Tuple[str, str, str]]:
+        """(rId, relationship type, target partname) of a part's relationships."""
+        rels = self._rels.get(partname)
+        if rels is not None:
+            return rels
+
+        directory, filename = posixpath.split(partname)
+        rels_name = posixpath.join(directory, "_rels", f"{filename}.rels")
+        rels = []
+        if rels_name in self._zf.NameToInfo:
+            root = etree.fromstring(self._zf.read(rels_name), _PARSER)
+            for rel in root.iter(f"{{{RELS_NS}}}Relationship"):
+                if rel.get("TargetMode") == "External":
+                    continue
+                target = rel.get("Target", "")
+                if target.startswith("/"):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join(directory, target))
+                rels.append((rel.get("Id"), rel.get("Type"), target))
+        self._rels[partname] = rels
+        return rels
+
+    def related(self, partname: str, rel_type: str) -> Optional[str]:
+        """Target of the first relationship of the given type."""
+        for _, type_, target in self.rels(partname):
+            if type_ == rel_type:
+                return target
+        return None
+
+    def placeholders(self, partname: str) -> List[Any]:
+        """Top-level placeholder shape elements of a layout or master."""
+        placeholders = self._placeholders.get(partname)
+        if placeholders is None:
+            placeholders = placeholder_shapes(self.part(partname))
+            self._placeholders[partname] = placeholders
+        return placeholders
+
+
+class PartView:
+    """A part's name and root element, shaped like the python-pptx objects
+    StyleResolver reads (``.part`` as cache key, ``.element`` as XML)."""
+
+    __slots__ = ("part", "element")
+
+    def __init__(self, partname: str, element: Any):
+        self.part = partname
+        self.element = element
+
+
+class XmlStyleResolver(StyleResolver):
+    """StyleResolver for PartViews; layout sizes are keyed by ST_PlaceholderType."""
+
+    @staticmethod
+    def _index_layout(slide_layout: PartView) -> Dict[Any, Optional[float]]:
+        """Collect the default font size of each placeholder type in a layout."""
+        sizes: Dict[Any, Optional[float]] = {}
+        for layout_placeholder in placeholder_shapes(slide_layout.element):
+            placeholder_type = placeholder_element(layout_placeholder).get(
+                "type", "obj"
+            )
+            if placeholder_type in sizes:
+                continue  # Only the first placeholder of each type counts
+            sizes[placeholder_type] = None
+            # Find first defRPr element with sz (size) attribute
+            for elem in layout_placeholder.iter():
+                if (
+                    isinstance(elem.tag, str)
+                    and "defRPr" in elem.tag
+                    and (sz := elem.get("sz"))
+                ):
+                    sizes[placeholder_type] = float(sz) / 100.0  # Convert to points
+                    break
+        return sizes
+
+
+def iter_shape_elements(container: Any) -> Iterator[Any]:
+    """Yield the shape elements of a p:spTree or p:grpSp in document order."""
+    if container is None:
+        return
+    for child in container:
+        if child.tag in SHAPE_TAGS:
+            yield child
+
+
+def placeholder_shapes(root: Any) -> List[Any]:
+    """Top-level placeholder shape elements of a slide, layout or master root."""
+    return [
+        elem
+        for elem in iter_shape_elements(root.find(SP_TREE_PATH))
+        if placeholder_element(elem) is not None
+    ]
+
+
+def placeholder_element(shape_elem: Any) -> Optional[Any]:
+    """The p:ph element of a shape, or None if it is not a placeholder."""
+    if not len(shape_elem):
+        return None
+    # p:nvSpPr, p:nvPicPr, p:nvGrpSpPr, ... is always the first child
+    return shape_elem[0].find(f"{_qn('p:nvPr')}/{_qn('p:ph')}")
+
+
+def xfrm_values(shape_elem: Any) -> List[Optional[int]]:
+    """[x, y, cx, cy] of a shape's transform in EMUs; None where not set."""
+    if shape_elem.tag == GRPSP_TAG:
+        xfrm = shape_elem.find(f"{_qn('p:grpSpPr')}/{_qn('a:xfrm')}")
+    elif shape_elem.tag == f"{{{P_NS}}}graphicFrame":
+        xfrm = shape_elem.find(_qn("p:xfrm"))
+    else:
+        xfrm = shape_elem.find(f"{_qn('p:spPr')}/{_qn('a:xfrm')}")
+
+    values: List[Optional[int]] = [None, None, None, None]
+    if xfrm is not None:
+        off = xfrm.find(_qn("a:off"))
+        ext = xfrm.find(_qn("a:ext"))
+        if off is not None:
+            values[0], values[1] = int(off.get("x")), int(off.get("y"))
+        if ext is not None:
+            values[2], values[3] = int(ext.get("cx")), int(ext.get("cy"))
+    return values
+
+
+class XmlFont:
+    """Read-only view of a run's a:rPr with the python-pptx Font API."""
+
+    __slots__ = ("_rPr",)
+
+    def __init__(self, rPr: Optional[Any]):
+        self._rPr = rPr
+
+    def _get(self, name: str) -> Optional[str]:
+        return self._rPr.get(name) if self._rPr is not None else None
+
+    @property
+    def name(self) -> Optional[str]:
+        if self._rPr is None:
+            return None
+        latin = self._rPr.find(_qn("a:latin"))
+        return latin.get("typeface") if latin is not None else None
+
+    @property
+    def size(self) -> Optional[Centipoints]:
+        sz = self._get("sz")
+        return Centipoints(int(sz)) if sz is not None else None
+
+    @property
+    def bold(self) -> Optional[bool]:
+        return _xsd_bool(self._get("b"))
+
+    @property
+    def italic(self) -> Optional[bool]:
+        return _xsd_bool(self._get("i"))
+
+    @property
+    def underline(self) -> Any:
+        u = self._get("u")
+        if u is None:
+            return None
+        if u == "none":
+            return False
+        if u == "sng":
+            return True
+        return MSO_UNDERLINE.from_xml(u)
+
+    @property
+    def color(self) -> "XmlColor":
+        fill = None
+        if self._rPr is not None:
+            fill = self._rPr.find(_qn("a:solidFill"))
+        return XmlColor(fill[0] if fill is not None and len(fill) else None)
+
+
+class XmlColor:
+    """Read-only view of a solid fill color with the python-pptx ColorFormat API.
+
+    Like ColorFormat, .rgb raises AttributeError unless the color is an
+    a:srgbClr, and .theme_color is only set for an a:schemeClr.
+    """
+
+    __slots__ = ("_color",)
+
+    def __init__(self, color: Optional[Any]):
+        self._color = color
+
+    @property
+    def rgb(self) -> str:
+        if self._color is None or self._color.tag != _qn("a:srgbClr"):
+            raise AttributeError("no .rgb property on this color type")
+        return self._color.get("val", "").upper()
+
+    @property
+    def theme_color(self) -> Optional[Any]:
+        if self._color is None or self._color.tag != _qn("a:schemeClr"):
+            raise AttributeError("no .theme_color property on this color type")
+        name = THEME_COLORS.get(self._color.get("val"))
+        return ThemeColor(name) if name else None
+
+
+class ThemeColor:
+    """Theme color name, standing in for an MSO_THEME_COLOR member."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class XmlRun:
+    """Read-only view of an a:r element."""
+
+    __slots__ = ("font",)
+
+    def __init__(self, r: Any):
+        self.font = XmlFont(r.find(_qn("a:rPr")))
+
+
+class XmlParagraph:
+    """Read-only view of an a:p element with the python-pptx _Paragraph API
+    used by ParagraphData."""
+
+    __slots__ = ("_p", "_element", "pPr", "text")
+
+    def __init__(self, p: Any):
+        self._p = self  # ParagraphData reads paragraph._p.pPr
+        self._element = p
+        self.pPr = p.find(_qn("a:pPr"))
+        # Same as _Paragraph.text: run and field text, line breaks as "\v"
+        parts = []
+        for child in p:
+            if child.tag == BR_TAG:
+                parts.append("\v")
+            elif child.tag in (R_TAG, FLD_TAG):
+                t = child.find(_qn("a:t"))
+                if t is not None and t.text:
+                    parts.append(t.text)
+        self.text = "".join(parts)
+
+    @property
+    def runs(self) -> List[XmlRun]:
+        return [XmlRun(r) for r in self._element.iterchildren(R_TAG)]
+
+    @property
+    def level(self) -> int:
+        if self.pPr is None:
+            return 0
+        return int(self.pPr.get("lvl", 0))
+
+    @property
+    def alignment(self) -> Optional[Any]:
+        if self.pPr is None:
+            return None
+        return ALIGNMENTS.get(self.pPr.get("algn"))
+
+    def _spacing(self, tag: str) -> Optional[Centipoints]:
+        if self.pPr is None:
+            return None
+        spc_pts = self.pPr.find(f"{_qn(tag)}/{_qn('a:spcPts')}")
+        return Centipoints(int(spc_pts.get("val"))) if spc_pts is not None else None
+
+    @property
+    def space_before(self) -> Optional[Centipoints]:
+        return self._spacing("a:spcBef")
+
+    @property
+    def space_after(self) -> Optional[Centipoints]:
+        return self._spacing("a:spcAft")
+
+    @property
+    def line_spacing(self) -> Any:
+        """Centipoints for exact spacing, a float multiplier for percentages."""
+        if self.pPr is None:
+            return None
+        ln_spc = self.pPr.find(_qn("a:lnSpc"))
+        if ln_spc is None:
+            return None
+        spc_pts = ln_spc.find(_qn("a:spcPts"))
+        if spc_pts is not None:
+            return Centipoints(int(spc_pts.get("val")))
+        spc_pct = ln_spc.find(_qn("a:spcPct"))
+        if spc_pct is not None:
+            val = spc_pct.get("val", "100000")
+            if val.endswith("%"):
+                return float(val[:-1]) / 100.0
+            return int(val) / 100000.0
+        return None
+
+
+class XmlTextFrame:
+    """Read-only view of a p:txBody element."""
+
+    __slots__ = (
+        "paragraphs",
+        "margin_left",
+        "margin_top",
+        "margin_right",
+        "margin_bottom",
+    )
+
+    def __init__(self, tx_body: Any):
+        self.paragraphs = [XmlParagraph(p) for p in tx_body.iterchildren(_qn("a:p"))]
+        body_pr = tx_body.find(_qn("a:bodyPr"))
+
+        def inset(name: str, default: int) -> int:
+            value = body_pr.get(name) if body_pr is not None else None
+            return int(value) if value is not None else default
+
+        self.margin_left = inset("lIns", 91440)
+        self.margin_top = inset("tIns", 45720)
+        self.margin_right = inset("rIns", 91440)
+        self.margin_bottom = inset("bIns", 45720)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(p.text for p in self.paragraphs)
+
+
+class XmlShape:
+    """Read-only view of a p:sp element with a text body."""
+
+    __slots__ = ("element", "text_frame")
+
+    def __init__(self, sp: Any, tx_body: Any):
+        self.element = sp
+        self.text_frame = XmlTextFrame(tx_body)
+
+
+class XmlSlide:
+    """A slide part with its layout, master and the presentation's slide size."""
+
+    __slots__ = ("partname", "layout", "master", "width_emu", "height_emu")
+
+    def __init__(
+        self,
+        partname: str,
+        layout: Optional[PartView],
+        master: Optional[PartView],
+        slide_size: Tuple[Optional[int], Optional[int]],
+    ):
+        self.partname = partname
+        self.layout = layout
+        self.master = master
+        self.width_emu, self.height_emu = slide_size
+
+    @classmethod
+    def from_package(
+        cls,
+        reader: PackageReader,
+        partname: str,
+        slide_size: Tuple[Optional[int], Optional[int]],
+    ) -> "XmlSlide":
+        """Look up the slide's layout and master through the part relationships."""
+        layout_name = reader.related(partname, RT_SLIDE_LAYOUT)
+        master_name = (
+            reader.related(layout_name, RT_SLIDE_MASTER) if layout_name else None
+        )
+        return cls(
+            partname,
+            reader.view(layout_name) if layout_name else None,
+            reader.view(master_name) if master_name else None,
+            slide_size,
+        )
+
+    @classmethod
+    def from_pptx_slide(cls, slide: Any) -> "XmlSlide":
+        """Views of an open python-pptx slide's layout and master XML."""
+        layout = slide.slide_layout
+        master = layout.slide_master
+        presentation = slide.part.package.presentation_part.presentation
+        return cls(
+            slide.part.partname.lstrip("/"),
+            PartView(layout.part.partname.lstrip("/"), layout.element),
+            PartView(master.part.partname.lstrip("/"), master.element),
+            (presentation.slide_width, presentation.slide_height),
+        )
+
+
+class XmlShapeData(ShapeData):
+    """ShapeData built from a slide's XML instead of a python-pptx shape.
+
+    ``shape`` is an XmlShape view; overflow, bullet and serialization logic is
+    inherited unchanged from ShapeData.
+    """
+
+    __slots__ = ("_slide",)
+
+    def __init__(
+        self,
+        shape: XmlShape,
+        absolute_left: int,
+        absolute_top: int,
+        width_emu: int,
+        height_emu: int,
+        slide: XmlSlide,
+        style_resolver: XmlStyleResolver,
+    ):
+        """Initialize from an XmlShape.
+
+        Args:
+            shape: View of the p:sp element (should be pre-validated)
+            absolute_left: Absolute left position in EMUs
+            absolute_top: Absolute top position in EMUs
+            width_emu: Width in EMUs (inherited for placeholders)
+            height_emu: Height in EMUs (inherited for placeholders)
+            slide: Slide the shape is on
+            style_resolver: XmlStyleResolver shared by all shapes of the presentation
+        """
+        self.shape = shape
+        self.shape_id: str = ""  # Will be set after sorting
+        self.style_resolver = style_resolver
+        self._paragraphs = None
+        self._slide = slide
+
+        self.slide_width_emu = slide.width_emu
+        self.slide_height_emu = slide.height_emu
+
+        self.placeholder_type: Optional[str] = None
+        self.default_font_size: Optional[float] = None
+        ph = placeholder_element(shape.element)
+        if ph is not None:
+            ph_type = ph.get("type", "obj")
+            self.placeholder_type = PLACEHOLDER_TYPES.get(ph_type)
+            if self.placeholder_type and slide.layout is not None:
+                self.default_font_size = style_resolver.layout_font_size(
+                    slide.layout, ph_type
+                )
+
+        self.left: float = round(self.emu_to_inches(absolute_left), 2)
+        self.top: float = round(self.emu_to_inches(absolute_top), 2)
+        self.width: float = round(self.emu_to_inches(width_emu), 2)
+        self.height: float = round(self.emu_to_inches(height_emu), 2)
+
+        self.left_emu = absolute_left
+        self.top_emu = absolute_top
+        self.width_emu = width_emu
+        self.height_emu = height_emu
+
+        self.frame_overflow_bottom: Optional[float] = None
+        self.slide_overflow_right: Optional[float] = None
+        self.slide_overflow_bottom: Optional[float] = None
+        self.overlapping_shapes: Dict[str, float] = {}
+        self.warnings: List[str] = []
+        self._estimate_frame_overflow()
+        self._calculate_slide_overflow()
+        self._detect_bullet_issues()
+
+    def _get_default_font_size(self, level: int = 0) -> int:
+        """Get default font size from the master's text styles or use 14pt."""
+        try:
+            if self._slide.master is not None:
+                font_size = self.style_resolver.master_font_size(
+                    self._slide.master, self.placeholder_type, level
+                )
+                if font_size is not None:
+                    return font_size
+        except Exception:
+            pass
+        return 14
+
+
+def _placeholder_geometry(
+    reader: PackageReader, slide: XmlSlide, sp: Any, ph: Any
+) -> List[Optional[int]]:
+    """[x, y, cx, cy] of a slide placeholder, inheriting unset values.
+
+    Follows python-pptx: the layout placeholder with the same idx, then the
+    master placeholder of the layout placeholder's base type.
+    """
+    values = xfrm_values(sp)
+    if None not in values or slide.layout is None:
+        return values
+
+    idx = ph.get("idx", "0")
+    layout_ph = next(
+        (
+            elem
+            for elem in reader.placeholders(slide.layout.part)
+            if placeholder_element(elem).get("idx", "0") == idx
+        ),
+        None,
+    )
+    if layout_ph is None:
+        return values
+
+    inherited = xfrm_values(layout_ph)
+    if None in inherited and slide.master is not None:
+        layout_type = placeholder_element(layout_ph).get("type", "obj")
+        base_type = BASE_PLACEHOLDER_TYPES.get(layout_type, "body")
+        master_ph = next(
+            (
+                elem
+                for elem in reader.placeholders(slide.master.part)
+                if placeholder_element(elem).get("type", "obj") == base_type
+            ),
+            None,
+        )
+        if master_ph is not None:
+            master_values = xfrm_values(master_ph)
+            inherited = [
+                own if own is not None else base
+                for own, base in zip(inherited, master_values)
+            ]
+
+    return [own if own is not None else base for own, base in zip(values, inherited)]
+
+
+def _is_valid_text_shape(shape: XmlShape) -> bool:
+    """Same rules as inventory.is_valid_shape."""
+    text = shape.text_frame.text.strip()
+    if not text:
+        return False
+
+    ph = placeholder_element(shape.element)
+    if ph is not None:
+        placeholder_type = PLACEHOLDER_TYPES.get(ph.get("type", "obj"))
+        if placeholder_type == "SLIDE_NUMBER":
+            return False
+        if placeholder_type == "FOOTER" and text.isdigit():
+            return False
+
+    return True
+
+
+def _collect_text_shapes(
+    reader: PackageReader,
+    slide: XmlSlide,
+    container: Any,
+    parent_left: int = 0,
+    parent_top: int = 0,
+) -> List[Tuple[XmlShape, int, int, int, int]]:
+    """Collect (shape, abs_left, abs_top, width, height) of valid text shapes.
+
+    Group children are offset by the group's position, as in
+    inventory.collect_shapes_with_absolute_positions.
+    """
+    result = []
+    for elem in iter_shape_elements(container):
+        if elem.tag == GRPSP_TAG:
+            group_left, group_top = xfrm_values(elem)[:2]
+            result.extend(
+                _collect_text_shapes(
+                    reader,
+                    slide,
+                    elem,
+                    parent_left + (group_left or 0),
+                    parent_top + (group_top or 0),
+                )
+            )
+            continue
+
+        if elem.tag != SP_TAG:
+            continue  # Only autoshapes and text boxes have text frames
+        tx_body = elem.find(_qn("p:txBody"))
+        if tx_body is None:
+            continue
+
+        shape = XmlShape(elem, tx_body)
+        if not _is_valid_text_shape(shape):
+            continue
+
+        ph = placeholder_element(elem)
+        if ph is not None:
+            left, top, width, height = _placeholder_geometry(reader, slide, elem, ph)
+        else:
+            left, top, width, height = xfrm_values(elem)
+        result.append(
+            (
+                shape,
+                parent_left + (left or 0),
+                parent_top + (top or 0),
+                width or 0,
+                height or 0,
+            )
+        )
+    return result
+
+
+def extract_slide_inventory_xml(
+    reader: PackageReader,
+    slide: XmlSlide,
+    issues_only: bool = False,
+    style_resolver: Optional[XmlStyleResolver] = None,
+) -> Dict[str, XmlShapeData]:
+    """Extract text shapes of a single slide part.
+
+    Returns:
+        Dict of shape-N -> XmlShapeData, sorted by visual position (empty if the
+        slide has no text shapes)
+    """
+    style_resolver = style_resolver or XmlStyleResolver()
+    sp_tree = reader.part(slide.partname).find(SP_TREE_PATH)
+    collected = _collect_text_shapes(reader, slide, sp_tree)
+    if not collected:
+        return {}
+
+    shape_data_list = [
+        XmlShapeData(shape, left, top, width, height, slide, style_resolver)
+        for shape, left, top, width, height in collected
+    ]
+
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
+
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
+
+
+def remeasure_shapes(
+    prs: Any,
+    inventory: Dict[str, Dict[str, ShapeData]],
+) -> Dict[str, Dict[str, XmlShapeData]]:
+    """Re-measure shapes of an open Presentation after their text was edited.
+
+    Reads the live python-pptx XML through the same read-only views as the
+    direct-XML extractor, so unlike a second extract_text_inventory pass it
+    never adds elements to the presentation and needs no save-and-reload.
+    Only the given shapes are measured; their position, size and shape IDs
+    are taken from the inventory entries (editing text does not move shapes).
+    Overlaps between shapes are not recomputed.
+
+    Args:
+        prs: Presentation the inventory was extracted from
+        inventory: {slide-N: {shape-N: ShapeData}} subset of shapes to measure
+
+    Returns:
+        {slide-N: {shape-N: XmlShapeData}} with current overflow and warnings
+    """
+    style_resolver = XmlStyleResolver()
+    slides = prs.slides
+    result: Dict[str, Dict[str, XmlShapeData]] = {}
+    for slide_key, shapes in inventory.items():
+        slide = XmlSlide.from_pptx_slide(slides[int(slide_key.split("-")[1])])
+        measured = {}
+        for shape_key, shape_data in shapes.items():
+            sp = shape_data.shape.element
+            tx_body = sp.find(_qn("p:txBody"))
+            if tx_body is None:
+                continue
+            xml_shape_data = XmlShapeData(
+                XmlShape(sp, tx_body),
+                shape_data.left_emu,
+                shape_data.top_emu,
+                shape_data.width_emu,
+                shape_data.height_emu,
+                slide,
+                style_resolver,
+            )
+            xml_shape_data.shape_id = shape_key
+            measured[shape_key] = xml_shape_data
+        if measured:
+            result[slide_key] = measured
+    return result
+
+
+def read_slide_list(
+    reader: PackageReader,
+) -> Tuple[List[str], Tuple[Optional[int], Optional[int]]]:
+    """Slide partnames in presentation order and the (width, height) slide size."""
+    presentation_name = reader.related("", RT_OFFICE_DOCUMENT)
+    if presentation_name is None:
+        raise ValueError("No presentation part found in package")
+    presentation = reader.part(presentation_name)
+
+    sld_sz = presentation.find(_qn("p:sldSz"))
+    slide_size: Tuple[Optional[int], Optional[int]] = (None, None)
+    if sld_sz is not None:
+        slide_size = (int(sld_sz.get("cx")), int(sld_sz.get("cy")))
+
+    targets = {
+        rid: target
+        for rid, type_, target in reader.rels(presentation_name)
+        if type_ == RT_SLIDE
+    }
+    slide_parts = []
+    sld_id_lst = presentation.find(_qn("p:sldIdLst"))
+    if sld_id_lst is not None:
+        for sld_id in sld_id_lst.iterchildren(_qn("p:sldId")):
+            target = targets.get(sld_id.get(f"{{{R_NS}}}id"))
+            if target is not None:
+                slide_parts.append(target)
+    return slide_parts, slide_size
+
+
+def extract_text_inventory_xml(
+    pptx_path: Path, issues_only: bool = False
+) -> Dict[str, Dict[str, XmlShapeData]]:
+    """Extract text content from all slides by reading the XML parts directly.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        issues_only: If True, only include shapes that have overflow or overlap issues
+
+    Returns a nested dictionary {slide-N: {shape-N: XmlShapeData}} with the same
+    shapes, order and values as inventory.extract_text_inventory.
+    """
+    inventory: Dict[str, Dict[str, XmlShapeData]] = {}
+    with zipfile.ZipFile(pptx_path) as zf:
+        reader = PackageReader(zf)
+        style_resolver = XmlStyleResolver()
+        slide_parts, slide_size = read_slide_list(reader)
+        for slide_idx, partname in enumerate(slide_parts):
+            slide = XmlSlide.from_package(reader, partname, slide_size)
+            slide_inventory = extract_slide_inventory_xml(
+                reader, slide, issues_only, style_resolver
+            )
+            if slide_inventory:
+                inventory[f"slide-{slide_idx}"] = slide_inventory
+    return inventory
+
+
+def get_inventory_as_dict_xml(
+    pptx_path: Path, issues_only: bool = False
+) -> InventoryDict:
+    """Extract the text inventory from XML as JSON-serializable dictionaries."""
+    inventory = extract_text_inventory_xml(pptx_path, issues_only)
+    return {
+        slide_key: {
+            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
+        }
+        for slide_key, shapes in inventory.items()
+    }
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(
+        description="Extract text inventory from PowerPoint XML parts directly.",
+    )
+    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
+    parser.add_argument("output", help="Output JSON file for inventory")
+    parser.add_argument(
+        "--issues-only",
+        action="store_true",
+        help="Include only text shapes that have overflow or overlap issues",
+    )
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"Error: Input file not found: {args.input}")
+        sys.exit(1)
+
+    if not input_path.suffix.lower() == ".pptx":
+        print("Error: Input must be a PowerPoint file (.pptx)")
+        sys.exit(1)
+
+    try:
+        inventory = get_inventory_as_dict_xml(input_path, args.issues_only)
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        save_inventory(inventory, output_path)
+    except (ValueError, KeyError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        print(f"Error processing presentation: {e}")
+        sys.exit(1)
+
+    total_shapes = sum(len(shapes) for shapes in inventory.values())
+    print(f"Output saved to: {args.output}")
+    print(f"Found text in {len(inventory)} slides with {total_shapes} text elements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from lxml import etree
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.text import MSO_UNDERLINE, PP_ALIGN
+from pptx.util import Inches, Pt
+
+from inventory import (
+    InventoryCache,
+    ParagraphData,
+    ShapeData,
+    StyleResolver,
+    extract_slide_inventory,
+    extract_text_inventory,
+    get_inventory_as_dict,
+)
+from inventory_xml import get_inventory_as_dict_xml, remeasure_shapes
+
+
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+
+def master_size_by_walk(slide_master, placeholder_type, level=0):
+    """Master text style size as found by walking the master's tree."""
+    style_name = "bodyStyle"
+    if placeholder_type and "TITLE" in placeholder_type:
+        style_name = "titleStyle"
+    for child in slide_master.element.iter():
+        if isinstance(child.tag, str) and child.tag.endswith(f"}}{style_name}"):
+            sizes = child.xpath(
+                f"./a:lvl{level + 1}pPr/a:defRPr/@sz", namespaces={"a": A_NS}
+            )
+            if sizes:
+                return int(sizes[0]) // 100
+            for elem in child.iter():
+                if "sz" in elem.attrib:
+                    return int(elem.attrib["sz"]) // 100
+            return None
+    return None
+
+
+def layout_size_by_walk(slide_layout, placeholder_type):
+    """Layout placeholder size as found by walking the layout's placeholders."""
+    for layout_placeholder in slide_layout.placeholders:
+        if layout_placeholder.placeholder_format.type == placeholder_type:
+            for elem in layout_placeholder.element.iter():
+                if "defRPr" in elem.tag and (sz := elem.get("sz")):
+                    return float(sz) / 100.0
+            break
+    return None
+
+
+def build_deck(path, extra_slides=0):
+    """Save a deck exercising placeholders, groups and paragraph formatting."""
+    prs = Presentation()
+
+    # Title slide: placeholders inherit their position from the layout
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "Quarterly review"
+    slide.placeholders[1].text = "Prepared for the board"
+
+    # Bullets with levels, spacing and run formatting
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Highlights"
+    body = slide.placeholders[1].text_frame
+    body.text = "Revenue grew"
+    for level, text in enumerate(["Mostly in EMEA", "Driven by renewals"], start=1):
+        p = body.add_paragraph()
+        p.text = text
+        p.level = level
+        p.space_before = Pt(6)
+        p.line_spacing = 1.5
+    run = body.paragraphs[0].runs[0]
+    run.font.bold = True
+    run.font.size = Pt(28)
+    run.font.color.rgb = RGBColor(0x12, 0x34, 0xAB)
+
+    # Text boxes: overlapping, overflowing, themed colors and a line break
+    box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(2), Inches(0.4))
+    box.text_frame.text = "• Manual bullet " + "with a lot of words " * 10
+    p = box.text_frame.paragraphs[0]
+    p.alignment = PP_ALIGN.CENTER
+    p.space_after = Pt(4)
+    p.line_spacing = Pt(20)
+    font = p.runs[0].font
+    font.name = "Georgia"
+    font.italic = True
+    font.underline = MSO_UNDERLINE.DOUBLE_LINE
+    font.color.theme_color = MSO_THEME_COLOR.ACCENT_2
+    box = slide.shapes.add_textbox(Inches(2), Inches(5.1), Inches(3), Inches(1))
+    box.text_frame.text = "Second line follows\vafter a break"
+    box.text_frame.margin_left = Inches(0.3)
+    box.text_frame.paragraphs[0].runs[0].font.underline = True
+
+    # Group shapes offset their children
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Grouped"
+    group = slide.shapes.add_group_shape()
+    inner = group.shapes.add_textbox(Inches(1), Inches(2), Inches(2), Inches(1))
+    inner.text_frame.text = "Inside group"
+    nested = group.shapes.add_group_shape()
+    deep = nested.shapes.add_textbox(Inches(4), Inches(2), Inches(2), Inches(1))
+    deep.text_frame.text = "Inside nested group"
+    group.left = Inches(0.5)
+
+    # A shape hanging off the slide and an empty slide
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(Inches(9), Inches(7), Inches(2), Inches(1))
+    box.text_frame.text = "Off the edge"
+    prs.slides.add_slide(prs.slide_layouts[6])
+
+    for idx in range(extra_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {idx}"
+        slide.placeholders[1].text = "\n".join(f"Point {n}" for n in range(6))
+
+    prs.save(path)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestInventoryXml(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "deck.pptx"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_matches_python_pptx_inventory(self):
+        build_deck(self.path)
+        expected = get_inventory_as_dict(self.path, use_cache=False)
+        self.assertEqual(get_inventory_as_dict_xml(self.path), expected)
+        # The fixture covers the interesting cases
+        self.assertIn("slide-2", expected)
+        self.assertNotIn("slide-4", expected)
+
+    def test_matches_python_pptx_inventory_issues_only(self):
+        build_deck(self.path)
+        expected = get_inventory_as_dict(self.path, issues_only=True, use_cache=False)
+        self.assertTrue(expected)
+        actual = get_inventory_as_dict_xml(self.path, issues_only=True)
+        self.assertEqual(actual, expected)
+
+    def test_remeasure_matches_reextraction(self):
+        build_deck(self.path)
+        prs = Presentation(self.path)
+        inventory = extract_text_inventory(self.path, prs, use_cache=False)
+        edited = {"slide-1": dict(inventory["slide-1"])}
+        for shape_data in edited["slide-1"].values():
+            shape_data.shape.text_frame.text = "• Much longer text " * 30
+        before = {
+            key: etree.tostring(shape_data.shape.element)
+            for key, shape_data in edited["slide-1"].items()
+        }
+
+        measured = remeasure_shapes(prs, edited)
+
+        # Re-measuring must not modify the presentation
+        for key, shape_data in edited["slide-1"].items():
+            self.assertEqual(etree.tostring(shape_data.shape.element), before[key])
+
+        saved = Path(self.tmpdir.name) / "edited.pptx"
+        prs.save(saved)
+        reextracted = get_inventory_as_dict(saved, use_cache=False)["slide-1"]
+        for key, shape_data in measured["slide-1"].items():
+            expected = reextracted[key]
+            actual = shape_data.to_dict()
+            self.assertEqual(actual.get("overflow"), expected.get("overflow"))
+            self.assertEqual(actual.get("warnings"), expected.get("warnings"))
+            self.assertEqual(actual["paragraphs"], expected["paragraphs"])
+        self.assertIn("frame", measured["slide-1"]["shape-2"].to_dict()["overflow"])
+
+    def test_style_resolver_matches_tree_walk(self):
+        build_deck(self.path)
+        prs = Presentation(self.path)
+        resolver = StyleResolver()
+        for slide in prs.slides:
+            layout = slide.slide_layout
+            for shape in slide.placeholders:
+                ph_type = shape.placeholder_format.type
+                type_name = str(ph_type).split(".")[-1].split(" ")[0]
+                self.assertEqual(
+                    resolver.layout_font_size(layout, ph_type),
+                    layout_size_by_walk(layout, ph_type),
+                )
+                for level in range(9):
+                    with self.subTest(placeholder=type_name, level=level):
+                        self.assertEqual(
+                            resolver.master_font_size(
+                                layout.slide_master, type_name, level
+                            ),
+                            master_size_by_walk(layout.slide_master, type_name, level),
+                        )
+
+        # Paragraphs are measured with the size of their outline level
+        body_id = prs.slides[1].placeholders[1].shape_id
+        shapes = extract_slide_inventory(prs.slides[1]).values()
+        body = next(sd for sd in shapes if sd.shape.shape_id == body_id)
+        levels = [para.outline_level for para in body.paragraphs]
+        self.assertEqual(levels, [0, 1, 2])
+        sizes = [body._get_default_font_size(level) for level in levels]
+        self.assertEqual(sizes, [32, 28, 24])
+
+    def test_slotted_data_round_trips(self):
+        build_deck(self.path, extra_slides=2)
+        prs = Presentation(self.path)
+        inventory = extract_text_inventory(self.path, prs, use_cache=False)
+        self.assertEqual(
+            {
+                slide_key: {key: sd.to_dict() for key, sd in shapes.items()}
+                for slide_key, shapes in inventory.items()
+            },
+            get_inventory_as_dict(self.path, use_cache=False),
+        )
+        for slide_key, shapes in inventory.items():
+            slide = prs.slides[int(slide_key.split("-")[1])]
+            for key, shape_data in shapes.items():
+                with self.subTest(slide=slide_key, shape=key):
+                    data = shape_data.to_dict()
+                    paragraphs = shape_data.paragraphs
+                    # Paragraphs are extracted once and reused
+                    self.assertIs(shape_data.paragraphs, paragraphs)
+                    rebuilt = ShapeData.from_dict(
+                        shape_data.shape,
+                        data,
+                        (
+                            shape_data.left_emu,
+                            shape_data.top_emu,
+                            shape_data.width_emu,
+                            shape_data.height_emu,
+                        ),
+                        slide,
+                        paragraph_info=[
+                            (para.index, para.raw_text, para.outline_level)
+                            for para in paragraphs
+                        ],
+                    )
+                    self.assertEqual(rebuilt.to_dict(), data)
+                    for para in paragraphs:
+                        self.assertEqual(
+                            ParagraphData.from_dict(
+                                para.to_dict(),
+                                para.index,
+                                para.raw_text,
+                                para.outline_level,
+                            ).to_dict(),
+                            para.to_dict(),
+                        )
+                    # Slots leave no per-instance __dict__
+                    self.assertFalse(hasattr(shape_data, "__dict__"))
+                    self.assertFalse(hasattr(paragraphs[0], "__dict__"))
+
+    def test_inventory_cache(self):
+        build_deck(self.path, extra_slides=20)
+        expected = get_inventory_as_dict(self.path, use_cache=False)
+        cache = InventoryCache(Path(self.tmpdir.name) / "cache")
+
+        def cached_inventory(prs, issues_only=False):
+            return {
+                idx: {
+                    key: sd.to_dict()
+                    for key, sd in extract_slide_inventory(
+                        slide, issues_only, cache=cache
+                    ).items()
+                }
+                for idx, slide in enumerate(prs.slides)
+            }
+
+        cold = cached_inventory(Presentation(self.path))
+        entries = list(cache.directory.glob("*/*.json"))
+        self.assertEqual(len(entries), len(Presentation(self.path).slides))
+
+        # Hits rebuild the same results around the live shapes, group children too
+        prs = Presentation(self.path)
+        self.assertEqual(cached_inventory(prs), cold)
+        self.assertEqual(
+            {f"slide-{idx}": shapes for idx, shapes in cold.items() if shapes},
+            expected,
+        )
+        grouped = extract_slide_inventory(prs.slides[2], cache=cache)
+        self.assertEqual(grouped["shape-2"].shape.text_frame.text, "Inside nested group")
+        issues = get_inventory_as_dict(self.path, issues_only=True, use_cache=False)
+        self.assertEqual(
+            {
+                f"slide-{idx}": shapes
+                for idx, shapes in cached_inventory(prs, True).items()
+                if shapes
+            },
+            issues,
+        )
+
+        # Editing a slide changes only its key
+        prs.slides[1].shapes.title.text_frame.text = "Lowlights " * 20
+        self.assertEqual(
+            cached_inventory(prs)[1]["shape-0"]["paragraphs"][0]["text"],
+            ("Lowlights " * 20).strip(),
+        )
+        self.assertEqual(len(list(cache.directory.glob("*/*.json"))), len(entries) + 1)
+
+        # Corrupt entries are recomputed
+        for entry in entries:
+            entry.write_text("{")
+        self.assertEqual(cached_inventory(Presentation(self.path)), cold)
+
+    def test_cached_paragraphs_measure_like_the_shape(self):
+        build_deck(self.path)
+        prs = Presentation(self.path)
+        prs.slides[3].shapes[0].text_frame.text = "  Off the edge  "
+        prs.save(self.path)
+        cache = InventoryCache(Path(self.tmpdir.name) / "cache")
+        for slide in Presentation(self.path).slides:
+            extract_slide_inventory(slide, cache=cache)
+
+        fresh_slides = Presentation(self.path).slides
+        measured = []
+        for fresh_slide, slide in zip(fresh_slides, Presentation(self.path).slides):
+            fresh = extract_slide_inventory(fresh_slide)
+            cached = extract_slide_inventory(slide, cache=cache)
+            for key, shape_data in cached.items():
+                expected = fresh[key].paragraphs
+                # Position (for space_before) and unstripped text are kept
+                self.assertEqual(
+                    [(para.index, para.raw_text) for para in shape_data.paragraphs],
+                    [(para.index, para.raw_text) for para in expected],
+                )
+                measured.extend(shape_data.paragraphs)
+                overflow = shape_data.frame_overflow_bottom
+                shape_data._estimate_frame_overflow()
+                self.assertEqual(shape_data.frame_overflow_bottom, overflow)
+        # The deck has paragraphs after the first and text with outer spaces
+        self.assertTrue(any(para.index and para.space_before for para in measured))
+        self.assertTrue(any(para.raw_text != para.text for para in measured))
+
+    def test_inventory_cache_key_and_pruning(self):
+        build_deck(self.path, extra_slides=20)
+        prs = Presentation(self.path)
+        cache = InventoryCache(Path(self.tmpdir.name) / "cache")
+
+        # Fonts and Pillow version are part of the key
+        key = cache.slide_key(prs.slides[1])
+        with mock.patch("inventory._measurement_fingerprint", return_value=b"other"):
+            self.assertNotEqual(cache.slide_key(prs.slides[1]), key)
+        self.assertEqual(cache.slide_key(prs.slides[1]), key)
+
+        keys = [cache.slide_key(slide) for slide in prs.slides]
+        for slide in prs.slides:
+            extract_slide_inventory(slide, cache=cache)
+        entries = [cache._entry_path(key) for key in dict.fromkeys(keys)]
+        sizes = [entry.stat().st_size for entry in entries]
+        for age, entry in enumerate(reversed(entries)):
+            os.utime(entry, (1000 - age, 1000 - age))
+
+        # A hit marks its entry as recently used
+        oldest = entries[0]
+        self.assertIsNotNone(cache.load(keys[0]))
+
+        # Pruning keeps the most recently used entries that fit the limit
+        limit = sum(sizes) // 2
+        small = InventoryCache(cache.directory, max_bytes=limit)
+        prs.slides[1].shapes.title.text_frame.text = "Edited"
+        edited = small._entry_path(small.slide_key(prs.slides[1]))
+        extract_slide_inventory(prs.slides[1], cache=small)
+        remaining = list(cache.directory.glob("*/*.json"))
+        self.assertLessEqual(sum(entry.stat().st_size for entry in remaining), limit)
+        self.assertIn(oldest, remaining)
+        self.assertIn(edited, remaining)
+        self.assertNotIn(entries[1], remaining)
+
+    def test_benchmark(self):
+        """Print timings for a 200-slide deck."""
+        build_deck(self.path, extra_slides=200)
+
+        start = time.perf_counter()
+        expected = get_inventory_as_dict(self.path, use_cache=False)
+        pptx_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = get_inventory_as_dict_xml(self.path)
+        xml_time = time.perf_counter() - start
+
+        print(
+            f"\n205 slides: python-pptx {pptx_time * 1000:.0f} ms, "
+            f"direct XML {xml_time * 1000:.0f} ms"
+        )
+        self.assertEqual(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
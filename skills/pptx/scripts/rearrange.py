@@ -10,13 +10,37 @@ Slides can be repeated (e.g., 34 appears twice).
 """
 
 import argparse
+import re
 import shutil
 import sys
+from collections import Counter
 from copy import deepcopy
 from pathlib import Path
 
-import six
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import PartFactory, _Relationship
+from pptx.opc.packuri import PackURI
+from pptx.parts.slide import SlidePart
+
+# Relationships to parts that belong to a single slide, cloned with the slide
+OWNED_PART_RELTYPES = {
+    RT.CHART,
+    RT.CHART_COLOR_STYLE,
+    RT.CHART_USER_SHAPES,
+    "http://schemas.microsoft.com/office/2011/relationships/chartStyle",
+    RT.CONTROL,
+    RT.DIAGRAM_COLORS,
+    RT.DIAGRAM_DATA,
+    RT.DIAGRAM_LAYOUT,
+    RT.DIAGRAM_QUICK_STYLE,
+    "http://schemas.microsoft.com/office/2007/relationships/diagramDrawing",
+    RT.OLE_OBJECT,
+    RT.PACKAGE,
+    RT.TAGS,
+}
+# Relationships that are not carried over to a duplicated slide
+SKIPPED_RELTYPES = {RT.NOTES_SLIDE, RT.COMMENTS}
 
 
 def main():
@@ -72,84 +96,98 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         sys.exit(1)
 
 
-def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
-    source = pres.slides[index]
-
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
-
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
+def duplicate_slide(pres, index, partnames=None):
+    """Duplicate a slide in the presentation by cloning its part.
 
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
+    The copy gets the source slide's XML and the same relationship IDs, so no
+    references inside the XML need rewriting. Layouts, images and media are
+    shared with the source slide rather than added again. Parts a slide owns
+    (charts and their workbooks, SmartArt, embedded objects, controls, tags)
+    are cloned along with everything they in turn own. Notes and comments are
+    not copied.
 
-    return new_slide
+    Args:
+        pres: Presentation to add the duplicate to (appended as the last slide)
+        index: Index of the slide to duplicate
+        partnames: Optional set of partnames in use, updated with the new parts;
+            pass the same set when duplicating many slides to avoid walking the
+            package for every copy
+
+    Returns:
+        The new slide
+    """
+    source = pres.slides[index].part
+    if partnames is None:
+        partnames = {part.partname for part in pres.part.package.iter_parts()}
+
+    new_part = SlidePart(
+        _next_partname(source.partname, partnames),
+        source.content_type,
+        source.package,
+        deepcopy(source._element),
+    )
+    _copy_rels(source, new_part, partnames)
 
+    rId = pres.part.relate_to(new_part, RT.SLIDE)
+    pres.slides._sldIdLst.add_sldId(rId)
+    return new_part.slide
 
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
 
+def _copy_rels(source, target, partnames):
+    """Give target the relationships of source, keeping their IDs.
 
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
+    Targets of OWNED_PART_RELTYPES are cloned (recursively); other internal
+    targets are shared. Relationships in SKIPPED_RELTYPES are left out.
+    """
+    base_uri = target.partname.baseURI
+    rels = {}
+    for rId, rel in source.rels.items():
+        if rel.reltype in SKIPPED_RELTYPES:
+            continue
+        if rel.is_external:
+            rel_target = rel.target_ref
+        elif rel.reltype in OWNED_PART_RELTYPES:
+            rel_target = _clone_part(rel.target_part, partnames)
+        else:
+            rel_target = rel.target_part
+        rels[rId] = _Relationship(
+            base_uri, rId, rel.reltype, rel._target_mode, rel_target
+        )
+    target.rels._rels.update(rels)
 
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
 
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+def _clone_part(part, partnames):
+    """Copy a part (and the parts it owns) under a new partname."""
+    clone = PartFactory(
+        _next_partname(part.partname, partnames),
+        part.content_type,
+        part.package,
+        part.blob,
+    )
+    _copy_rels(part, clone, partnames)
+    return clone
+
+
+def _next_partname(partname, partnames):
+    """First free partname numbered like partname (chart3.xml -> chartN.xml)."""
+    template = re.sub(r"\d*(\.\w+)$", r"%d\1", str(partname))
+    number = 1
+    while PackURI(template % number) in partnames:
+        number += 1
+    new_partname = PackURI(template % number)
+    partnames.add(new_partname)
+    return new_partname
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
     """
     Create a new presentation with slides from template in specified order.
 
+    The final slide list is planned in one pass over the sequence: the first
+    use of a template slide keeps the original, later uses get duplicates, and
+    the slide ID list is rebuilt once in sequence order. Unused slides are then
+    dropped, so the work grows linearly with the sequence and template length.
+
     Args:
         template_path: Path to template PPTX file
         output_path: Path for output PPTX file
@@ -169,57 +207,43 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         if idx < 0 or idx >= total_slides:
             raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
+    sld_id_lst = prs.slides._sldIdLst
+    original_ids = list(sld_id_lst)
+    remaining_uses = Counter(slide_sequence)
+    partnames = {part.partname for part in prs.part.package.iter_parts()}
 
-    # Step 1: DUPLICATE repeated slides
+    # Step 1: PLAN the final order, duplicating repeated slides as they recur.
+    # Duplicates are appended after the originals, so template indices stay valid.
     print(f"Processing {len(slide_sequence)} slides from template...")
+    final_ids = []
+    used = set()
     for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
-            print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
+        remaining_uses[template_idx] -= 1
+        if template_idx not in used:
+            used.add(template_idx)
+            final_ids.append(original_ids[template_idx])
+            if remaining_uses[template_idx]:
+                count = remaining_uses[template_idx]
+                print(
+                    f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
+                )
+            else:
+                print(f"  [{i}] Using original slide {template_idx}")
         else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
-            print(f"  [{i}] Using original slide {template_idx}")
-
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+            duplicate_slide(prs, template_idx, partnames)
+            final_ids.append(sld_id_lst[-1])
+            print(f"  [{i}] Using duplicate of slide {template_idx}")
+
+    # Step 2: REBUILD the slide list in final order with a single assignment
+    print(f"\nDeleting {total_slides - len(used)} unused slides...")
+    print(f"Ordering {len(final_ids)} slides to final sequence...")
+    sld_id_lst[:] = final_ids
+
+    # Step 3: DROP relationships of unused slides (no longer referenced by any
+    # sldId, so their parts are not written when saving)
+    for idx, sld_id in enumerate(original_ids):
+        if idx not in used:
+            prs.part.rels.pop(sld_id.rId)
 
     # Save the presentation
     prs.save(output_path)
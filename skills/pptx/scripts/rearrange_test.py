@@ -0,0 +1,168 @@
+import random
+import re
+import tempfile
+import time
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+from lxml import etree
+from PIL import Image
+
+from rearrange import duplicate_slide, rearrange_presentation
+
+
+def build_template(path, slide_count):
+    """Save a template whose slides are titled with their index."""
+    prs = Presentation()
+    image = Path(path).with_suffix(".png")
+    Image.new("RGB", (8, 8), "blue").save(image)
+    for idx in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {idx}"
+        if idx % 10 == 0:
+            slide.shapes.add_picture(str(image), Inches(1), Inches(2))
+    prs.save(path)
+
+
+def slide_titles(path):
+    return [slide.shapes.title.text for slide in Presentation(path).slides]
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRearrangePresentation(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def rearrange(self, template, sequence):
+        output = self.dir / "output.pptx"
+        with redirect_stdout(StringIO()):
+            rearrange_presentation(template, output, sequence)
+        return output
+
+    def test_reorders_duplicates_and_drops(self):
+        template = self.dir / "template.pptx"
+        build_template(template, 12)
+        sequence = [5, 0, 10, 10, 3, 5, 10, 11]
+        output = self.rearrange(template, sequence)
+        self.assertEqual(slide_titles(output), [f"Slide {idx}" for idx in sequence])
+
+        # Unused slides are not saved; slide parts are numbered in final order
+        with zipfile.ZipFile(output) as zf:
+            slide_parts = [
+                name
+                for name in zf.namelist()
+                if name.startswith("ppt/slides/slide") and name.endswith(".xml")
+            ]
+        self.assertEqual(len(slide_parts), len(sequence))
+
+        # Duplicated pictures keep their image
+        prs = Presentation(output)
+        for slide_idx in (2, 3, 6):
+            pictures = [s for s in prs.slides[slide_idx].shapes if s.shape_type == 13]
+            self.assertEqual(len(pictures), 1)
+            self.assertTrue(pictures[0].image.blob)
+
+    def test_duplicates_share_media_and_clone_charts(self):
+        template = self.dir / "template.pptx"
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = "Chart"
+        image = self.dir / "image.png"
+        Image.new("RGB", (8, 8), "blue").save(image)
+        slide.shapes.add_picture(str(image), Inches(1), Inches(1))
+        chart_data = CategoryChartData()
+        chart_data.categories = ["East", "West"]
+        chart_data.add_series("Sales", (1.0, 2.0))
+        slide.shapes.add_chart(
+            XL_CHART_TYPE.COLUMN_CLUSTERED,
+            Inches(3),
+            Inches(2),
+            Inches(4),
+            Inches(3),
+            chart_data,
+        )
+        link = slide.shapes.title.text_frame.paragraphs[0].runs[0].hyperlink
+        link.address = "https://example.com/"
+        slide.notes_slide.notes_text_frame.text = "Speaker notes"
+        prs.save(template)
+
+        output = self.rearrange(template, [0, 0, 0])
+        prs = Presentation(output)
+        charts = [
+            next(shape for shape in slide.shapes if shape.has_chart).chart
+            for slide in prs.slides
+        ]
+        self.assertEqual(len({chart.part.partname for chart in charts}), 3)
+        self.assertEqual(
+            len({chart.part.chart_workbook.xlsx_part.partname for chart in charts}), 3
+        )
+
+        # Editing one copy's chart leaves the others alone
+        chart_data = CategoryChartData()
+        chart_data.categories = ["North"]
+        chart_data.add_series("Sales", (5.0,))
+        charts[2].replace_data(chart_data)
+        self.assertEqual(list(charts[0].plots[0].categories), ["East", "West"])
+        self.assertEqual(list(charts[2].plots[0].categories), ["North"])
+
+        with zipfile.ZipFile(output) as zf:
+            names = zf.namelist()
+        self.assertEqual(len([n for n in names if n.startswith("ppt/media/")]), 1)
+        notes = [n for n in names if re.fullmatch(r"ppt/notesSlides/\w+\.xml", n)]
+        self.assertEqual(len(notes), 1)
+        for slide in prs.slides:
+            run = slide.shapes.title.text_frame.paragraphs[0].runs[0]
+            self.assertEqual(run.hyperlink.address, "https://example.com/")
+
+    def test_duplicate_keeps_slide_xml(self):
+        template = self.dir / "template.pptx"
+        build_template(template, 3)
+        prs = Presentation(template)
+        source = prs.slides[1]
+        source.background.fill.solid()
+        copy = duplicate_slide(prs, 1)
+        self.assertEqual(len(prs.slides), 4)
+        self.assertIs(prs.slides[3].part, copy.part)
+        self.assertEqual(etree.tostring(copy.element), etree.tostring(source.element))
+        self.assertIs(copy.slide_layout, source.slide_layout)
+
+    def test_rejects_out_of_range(self):
+        template = self.dir / "template.pptx"
+        build_template(template, 3)
+        with self.assertRaisesRegex(ValueError, "out of range"):
+            self.rearrange(template, [0, 3])
+
+    def test_benchmark_large_template(self):
+        """Print timings for selecting from a 500-slide template library."""
+        template = self.dir / "template.pptx"
+        build_template(template, 500)
+        rng = random.Random(0)
+        sequences = {
+            "reverse 500": list(range(499, -1, -1)),
+            "shuffled 400 of 500": rng.sample(range(500), 400),
+            "50 picks, 10 repeats": [rng.randrange(500) for _ in range(40)]
+            + [7] * 10,
+        }
+        for label, sequence in sequences.items():
+            start = time.perf_counter()
+            output = self.rearrange(template, sequence)
+            elapsed = time.perf_counter() - start
+            print(f"\n{label}: {elapsed * 1000:.0f} ms")
+            self.assertEqual(
+                slide_titles(output), [f"Slide {idx}" for idx in sequence]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
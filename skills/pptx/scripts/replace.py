@@ -4,17 +4,25 @@
 Usage:
     python replace.py <input.pptx> <replacements.json> <output.pptx>
 
-The replacements JSON should have the structure output by inventory.py.
-ALL text shapes identified by inventory.py will have their text cleared
-unless "paragraphs" is specified in the replacements for that shape.
+The replacements JSON should have the structure output by inventory.py
+(a .json document or .jsonl with one slide per line). It is read, and the
+presentation's text inventory extracted, one slide at a time. ALL text shapes
+identified by inventory.py will have their text cleared unless "paragraphs" is
+specified in the replacements for that shape.
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-from inventory import InventoryData, extract_text_inventory
+from inventory import (
+    InventoryCache,
+    InventoryData,
+    StyleResolver,
+    extract_slide_inventory,
+    iter_inventory_file,
+)
+from inventory_xml import remeasure_shapes
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
@@ -165,38 +173,49 @@ def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[
     Returns list of error messages.
     """
     errors = []
-
     for slide_key, shapes_data in replacements.items():
-        if not slide_key.startswith("slide-"):
-            continue
-
-        # Check if slide exists
-        if slide_key not in inventory:
-            errors.append(f"Slide '{slide_key}' not found in inventory")
-            continue
-
-        # Check each shape
-        for shape_key in shapes_data.keys():
-            if shape_key not in inventory[slide_key]:
-                # Find shapes without replacements defined and show their content
-                unused_with_content = []
-                for k in inventory[slide_key].keys():
-                    if k not in shapes_data:
-                        shape_data = inventory[slide_key][k]
-                        # Get text from paragraphs as preview
-                        paragraphs = shape_data.paragraphs
-                        if paragraphs and paragraphs[0].text:
-                            first_text = paragraphs[0].text[:50]
-                            if len(paragraphs[0].text) > 50:
-                                first_text += "..."
-                            unused_with_content.append(f"{k} ('{first_text}')")
-                        else:
-                            unused_with_content.append(k)
-
-                errors.append(
-                    f"Shape '{shape_key}' not found on '{slide_key}'. "
-                    f"Shapes without replacements: {', '.join(sorted(unused_with_content)) if unused_with_content else 'none'}"
-                )
+        errors.extend(validate_slide_replacements(inventory, slide_key, shapes_data))
+    return errors
+
+
+def validate_slide_replacements(
+    inventory: InventoryData, slide_key: str, shapes_data: Dict
+) -> List[str]:
+    """Validate that all shapes in one slide's replacements exist in inventory.
+
+    Returns list of error messages.
+    """
+    errors = []
+    if not slide_key.startswith("slide-"):
+        return errors
+
+    # Check if slide exists
+    if slide_key not in inventory:
+        errors.append(f"Slide '{slide_key}' not found in inventory")
+        return errors
+
+    # Check each shape
+    for shape_key in shapes_data.keys():
+        if shape_key not in inventory[slide_key]:
+            # Find shapes without replacements defined and show their content
+            unused_with_content = []
+            for k in inventory[slide_key].keys():
+                if k not in shapes_data:
+                    shape_data = inventory[slide_key][k]
+                    # Get text from paragraphs as preview
+                    paragraphs = shape_data.paragraphs
+                    if paragraphs and paragraphs[0].text:
+                        first_text = paragraphs[0].text[:50]
+                        if len(paragraphs[0].text) > 50:
+                            first_text += "..."
+                        unused_with_content.append(f"{k} ('{first_text}')")
+                    else:
+                        unused_with_content.append(k)
+
+            errors.append(
+                f"Shape '{shape_key}' not found on '{slide_key}'. "
+                f"Shapes without replacements: {', '.join(sorted(unused_with_content)) if unused_with_content else 'none'}"
+            )
 
     return errors
 
@@ -217,47 +236,44 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     # Load presentation
     prs = Presentation(pptx_file)
 
-    # Get inventory of all text shapes (returns ShapeData objects)
-    # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
-
-    # Detect text overflow in original presentation
-    original_overflow = detect_frame_overflow(inventory)
-
-    # Load replacement data with duplicate key detection
-    with open(json_file, "r") as f:
-        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
-
-    # Validate replacements
-    errors = validate_replacements(inventory, replacements)
-    if errors:
-        print("ERROR: Invalid shapes in replacement JSON:")
-        for error in errors:
-            print(f"  - {error}")
-        print("\nPlease check the inventory and update your replacement JSON.")
-        print(
-            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
+    # The inventory of text shapes is extracted one slide at a time, right before
+    # the slide is validated and changed, and dropped afterwards
+    style_resolver = StyleResolver()
+    cache = InventoryCache.default()
+
+    def slide_inventory(slide_key: str) -> InventoryData:
+        """Inventory one slide as {slide-N: {shape-N: ShapeData}}.
+
+        Empty if the slide does not exist or has no text shapes.
+        """
+        slide_index = slide_key.split("-")[-1]
+        if not slide_index.isdigit() or slide_key != f"slide-{int(slide_index)}":
+            return {}
+        if int(slide_index) >= len(prs.slides):
+            return {}
+        shapes = extract_slide_inventory(
+            prs.slides[int(slide_index)], False, style_resolver, cache
         )
-        raise ValueError(f"Found {len(errors)} validation error(s)")
+        return {slide_key: shapes} if shapes else {}
+
+    # Text overflow in the original presentation, recorded as slides are read
+    original_overflow: Dict[str, Dict[str, float]] = {}
 
     # Track statistics
     shapes_processed = 0
     shapes_cleared = 0
     shapes_replaced = 0
+    # Shapes that received replacement paragraphs: {slide-N: {shape-N: ShapeData}}
+    replaced_shapes: InventoryData = {}
 
-    # Process each slide from inventory
-    for slide_key, shapes_dict in inventory.items():
-        if not slide_key.startswith("slide-"):
-            continue
-
-        slide_index = int(slide_key.split("-")[1])
-
-        if slide_index >= len(prs.slides):
-            print(f"Warning: Slide {slide_index} not found")
-            continue
+    def replace_slide_text(
+        inventory: InventoryData, slide_key: str, slide_replacements: Dict
+    ) -> None:
+        """Clear every inventoried shape of a slide and add its replacements."""
+        nonlocal shapes_processed, shapes_cleared, shapes_replaced
 
         # Process each shape from inventory
-        for shape_key, shape_data in shapes_dict.items():
+        for shape_key, shape_data in inventory[slide_key].items():
             shapes_processed += 1
 
             # Get the shape directly from ShapeData
@@ -273,11 +289,12 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
             shapes_cleared += 1
 
             # Check for replacement paragraphs
-            replacement_shape_data = replacements.get(slide_key, {}).get(shape_key, {})
+            replacement_shape_data = slide_replacements.get(shape_key, {})
             if "paragraphs" not in replacement_shape_data:
                 continue
 
             shapes_replaced += 1
+            replaced_shapes.setdefault(slide_key, {})[shape_key] = shape_data
 
             # Add replacement paragraphs
             for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
@@ -288,20 +305,51 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
 
                 apply_paragraph_properties(p, para_data)
 
-    # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
+    # Read the replacement data one slide at a time (with duplicate key detection),
+    # validating and applying each slide before the next one is read. Nothing is
+    # saved if any slide fails validation, so applying early is safe.
+    errors = []
+    seen_slides = set()
+    for slide_key, slide_replacements in iter_inventory_file(
+        Path(json_file), object_pairs_hook=check_duplicate_keys
+    ):
+        if slide_key in seen_slides:
+            raise ValueError(f"Duplicate key found in JSON: '{slide_key}'")
+        seen_slides.add(slide_key)
+
+        inventory = slide_inventory(slide_key)
+        errors.extend(
+            validate_slide_replacements(inventory, slide_key, slide_replacements)
+        )
+        if not errors and inventory:
+            original_overflow.update(detect_frame_overflow(inventory))
+            replace_slide_text(inventory, slide_key, slide_replacements)
+
+    if errors:
+        print("ERROR: Invalid shapes in replacement JSON:")
+        for error in errors:
+            print(f"  - {error}")
+        print("\nPlease check the inventory and update your replacement JSON.")
+        print(
+            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
+        )
+        raise ValueError(f"Found {len(errors)} validation error(s)")
 
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
+    # Clear the text shapes of slides without replacements
+    for slide_index in range(len(prs.slides)):
+        slide_key = f"slide-{slide_index}"
+        if slide_key not in seen_slides:
+            inventory = slide_inventory(slide_key)
+            if inventory:
+                replace_slide_text(inventory, slide_key, {})
 
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
+    # Check for issues after replacements
+    # Only shapes with replacement paragraphs can have new overflow or warnings
+    # (cleared shapes have no text). They are re-measured from the XML in memory:
+    # extract_text_inventory accesses font.color which adds empty <a:solidFill/>
+    # elements, so it must not run on the presentation that is about to be saved.
+    updated_inventory = remeasure_shapes(prs, replaced_shapes)
+    updated_overflow = detect_frame_overflow(updated_inventory)
 
     # Check if any text overflow got worse
     overflow_errors = []
@@ -19,7 +19,7 @@ Grid limits by column count:
 - 6 cols: max 42 slides per grid (6×7)
 
 Usage:
-    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders]
+    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders] [--jobs N]
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -38,17 +38,31 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+Rendered slides are cached (see RenderCache), so after editing a deck only the
+changed slides go through LibreOffice again. Use --no-cache to render everything.
+Pages are rasterized by several pdftoppm processes at once and thumbnails are
+decoded and resized in a thread pool (--jobs, default: CPU count).
 """
 
 import argparse
+import contextlib
+import hashlib
+import io
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory import extract_text_inventory, prune_cache_directory
+from lxml import etree
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from rearrange import rearrange_presentation
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
@@ -56,6 +70,7 @@ CONVERSION_DPI = 100  # DPI for PDF to image conversion
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
+MIN_PAGES_PER_RASTERIZER = 4  # Fewer pages are not worth another pdftoppm process
 
 # Grid layout constants
 GRID_PADDING = 20  # Padding between thumbnails
@@ -63,6 +78,18 @@ BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
 
+# Directory for cached slide renders; "off" (or "0") disables the cache
+RENDER_CACHE_ENV = "PPTX_THUMBNAIL_CACHE"
+# Bump when the rendering pipeline changes so stale images are not reused
+RENDER_CACHE_VERSION = 1
+# Size limit of the cache directory; least recently used images beyond it
+# are deleted
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# presentation.xml elements every slide renders with
+RENDER_PRESENTATION_TAGS = ("sldSz", "defaultTextStyle")
+# Relationship types whose targets do not affect how a slide renders
+SKIPPED_RENDER_RELTYPES = ("/notesSlide", "/slide", "/notesMaster", "/handoutMaster")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -86,6 +113,18 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Render every slide instead of reusing cached renders (or set {RENDER_CACHE_ENV}=off)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Parallel pdftoppm processes and image decoding threads (default: CPU count)",
+    )
 
     args = parser.parse_args()
 
@@ -118,8 +157,11 @@ def main():
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
-            # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            # Convert slides to images, rendering only slides missing from the cache
+            cache = None if args.no_cache else RenderCache.default()
+            slide_images = convert_to_images(
+                input_path, Path(temp_dir), CONVERSION_DPI, cache, args.jobs
+            )
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -134,6 +176,7 @@ def main():
                 output_path,
                 placeholder_regions,
                 slide_dimensions,
+                args.jobs,
             )
 
             # Print saved files
@@ -194,24 +237,163 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
-    # Detect hidden slides
-    print("Analyzing presentation...")
-    prs = Presentation(str(pptx_path))
-    total_slides = len(prs.slides)
+class RenderCache:
+    """On-disk cache of rendered slide images, keyed by what the slide looks like.
 
-    # Find hidden slides (1-based indexing for display)
-    hidden_slides = {
-        idx + 1
-        for idx, slide in enumerate(prs.slides)
-        if slide.element.get("show") == "0"
-    }
+    A slide's key hashes its slide XML together with every part it renders from:
+    images, charts and embedded objects, its layout, master and theme (and their
+    media), plus presentation.xml's slide size and default text style, and the
+    DPI. Slides that contain a slide number field also hash their position and
+    the first slide number, since both change the rendered number.
 
-    print(f"Total slides: {total_slides}")
-    if hidden_slides:
-        print(f"Hidden slides: {sorted(hidden_slides)}")
+    The directory is kept under max_bytes by deleting the least recently used
+    images, on the first store of each RenderCache and after every further
+    max_bytes / 10 stored. Images loaded or stored by this RenderCache are
+    never deleted, since the grids being built still read them.
+    """
+
+    def __init__(self, directory, max_bytes=RENDER_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # part -> hash of its content; layouts, masters and media are shared
+        self._part_hashes = {}
+        # Bytes stored since the last prune; None before the first store
+        self._unpruned_bytes = None
+        # Images handed out by load() and store()
+        self._in_use = set()
+
+    @classmethod
+    def default(cls):
+        """Cache in $PPTX_THUMBNAIL_CACHE or ~/.cache/pptx-thumbnails, or None if
+        the variable is set to off/0/false/no."""
+        setting = os.environ.get(RENDER_CACHE_ENV)
+        if setting is not None and setting.lower() in ("off", "0", "false", "no"):
+            return None
+        if setting:
+            return cls(Path(setting))
+        return cls(Path.home() / ".cache" / "pptx-thumbnails")
+
+    def _part_hash(self, part):
+        digest = self._part_hashes.get(part)
+        if digest is None:
+            digest = hashlib.sha256(part.blob).digest()
+            self._part_hashes[part] = digest
+        return digest
+
+    def _presentation_hash(self, prs):
+        """Hash of the presentation.xml settings that affect every slide.
+
+        The slide list is left out so that reordering slides keeps their keys.
+        """
+        digest = self._part_hashes.get(prs.part)
+        if digest is None:
+            digest = hashlib.sha256()
+            for tag in RENDER_PRESENTATION_TAGS:
+                elem = prs.element.find(f"{{{prs.element.nsmap['p']}}}{tag}")
+                if elem is not None:
+                    digest.update(etree.tostring(elem, method="c14n"))
+                digest.update(b";")
+            digest = self._part_hashes[prs.part] = digest.digest()
+        return digest
+
+    def slide_key(self, prs, slide_idx, dpi):
+        """Cache key of a slide as rendered at dpi.
+
+        Parts are hashed by content and linked by relationship id rather than
+        part name, so renaming slide parts (as saving a reordered deck does)
+        keeps the key.
+        """
+        slide = prs.slides[slide_idx]
+        settings = f"v{RENDER_CACHE_VERSION}:{dpi}:{prs.slide_width}x{prs.slide_height}"
+        digest = hashlib.sha256(settings.encode())
+        digest.update(self._presentation_hash(prs))
+        if has_slide_number_field(slide):
+            first_number = prs.element.get("firstSlideNum", "1")
+            digest.update(f":position:{slide_idx}+{first_number}".encode())
+
+        # Walk the slide and every part it renders from, in a stable order
+        parts = [slide.part]
+        order = {slide.part: 0}
+        for part in parts:
+            digest.update(self._part_hash(part))
+            for rId in sorted(part.rels):
+                rel = part.rels[rId]
+                if rel.is_external or rel.reltype.endswith(SKIPPED_RENDER_RELTYPES):
+                    continue
+                target = rel.target_part
+                if target not in order:
+                    order[target] = len(parts)
+                    parts.append(target)
+                digest.update(f"{rId}>{order[target]};".encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Image path for a key (which may not exist yet)."""
+        return self.directory / key[:2] / f"{key}.jpg"
+
+    def load(self, key):
+        """Cached image path for a key, or None if the slide is not cached."""
+        path = self.path(key)
+        try:
+            os.utime(path)  # Mark as recently used for pruning
+        except OSError:
+            return None
+        self._in_use.add(path)
+        return path
+
+    def store(self, key, image_path):
+        """Copy a rendered image into the cache and return its cached path.
+
+        Falls back to the rendered image if the cache cannot be written.
+        """
+        path = self.path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(image_path, tmp_path)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except OSError:
+            return Path(image_path)
+        self._in_use.add(path)
+
+        if self._unpruned_bytes is not None:
+            self._unpruned_bytes += size
+            if self._unpruned_bytes < self.max_bytes // 10:
+                return path
+        prune_cache_directory(self.directory, self.max_bytes, "*/*.jpg", self._in_use)
+        self._unpruned_bytes = 0
+        return path
+
+
+def has_slide_number_field(slide):
+    """Whether a slide shows its own number (which depends on its position)."""
+    if slide.element.xpath(".//a:fld[@type='slidenum']"):
+        return True
+    # Slide number placeholders take their field from the layout
+    return any(
+        shape.placeholder_format.type == PP_PLACEHOLDER.SLIDE_NUMBER
+        for shape in slide.placeholders
+    )
+
+
+def has_date_field(slide):
+    """Whether a slide shows the current date or time (which changes as it renders)."""
+    if slide.element.xpath(".//a:fld[starts-with(@type, 'datetime')]"):
+        return True
+    # Date placeholders take their field from the layout
+    return any(
+        shape.placeholder_format.type == PP_PLACEHOLDER.DATE
+        for shape in slide.placeholders
+    )
+
+
+def render_pages(pptx_path, temp_dir, dpi, prefix="slide", page_count=None, jobs=None):
+    """Render a presentation's visible slides to JPEGs via PDF, in slide order.
 
+    page_count is the expected number of pages; when given, the PDF is split
+    into page ranges rasterized concurrently (see rasterize_pdf).
+    """
     pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
 
     # Convert to PDF
@@ -234,15 +416,130 @@ def convert_to_images(pptx_path, temp_dir, dpi):
 
     # Convert PDF to images
     print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    rasterize_pdf(pdf_path, temp_dir / prefix, dpi, page_count, jobs)
+
+    # pdftoppm pads page numbers to the document's page count, whatever the range
+    return sorted(temp_dir.glob(f"{prefix}-*.jpg"))
+
+
+def rasterize_pdf(pdf_path, output_prefix, dpi, page_count=None, jobs=None):
+    """Rasterize PDF pages to {output_prefix}-N.jpg with concurrent pdftoppm runs.
+
+    Each process renders a contiguous page range (-f/-l), at least
+    MIN_PAGES_PER_RASTERIZER pages long. Without a page_count the whole
+    document goes through a single pdftoppm.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if page_count:
+        jobs = max(1, min(jobs, page_count // MIN_PAGES_PER_RASTERIZER))
+    else:
+        jobs = 1
+    command = ["pdftoppm", "-jpeg", "-r", str(dpi)]
+
+    if jobs == 1:
+        ranges = [[]]
+    else:
+        bounds = [page_count * worker // jobs for worker in range(jobs + 1)]
+        ranges = [
+            ["-f", str(first + 1), "-l", str(last)]
+            for first, last in zip(bounds, bounds[1:])
+        ]
+    processes = [
+        subprocess.Popen(
+            command + page_range + [str(pdf_path), str(output_prefix)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        for page_range in ranges
+    ]
+    for process in processes:
+        # communicate() drains stderr so no process blocks on a full pipe
+        process.communicate()
+    if any(process.returncode for process in processes):
         raise RuntimeError("Image conversion failed")
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+
+def render_slides_cached(
+    pptx_path, prs, visible_indices, temp_dir, dpi, cache, jobs=None
+):
+    """Render visible slides through the cache, returning {slide index: image path}.
+
+    Slides missing from the cache are copied into a deck of their own with
+    rearrange_presentation, so LibreOffice only converts what changed. That
+    deck would renumber its slides, so if a changed slide shows its number
+    the whole deck is converted instead. Slides showing the date or time are
+    rendered every time and never cached.
+    """
+    keys = {idx: cache.slide_key(prs, idx, dpi) for idx in visible_indices}
+    images = {
+        idx: None if has_date_field(prs.slides[idx]) else cache.load(key)
+        for idx, key in keys.items()
+    }
+    dirty = [idx for idx in visible_indices if images[idx] is None]
+    cached_count = len(visible_indices) - len(dirty)
+    print(f"Slides to render: {len(dirty)} (cached: {cached_count})")
+    if not dirty:
+        return images
+
+    if len(dirty) == len(visible_indices) or any(
+        has_slide_number_field(prs.slides[idx]) for idx in dirty
+    ):
+        render_path = pptx_path
+        rendered = list(visible_indices)
+    else:
+        render_path = temp_dir / f"{pptx_path.stem}-changed.pptx"
+        with contextlib.redirect_stdout(io.StringIO()):
+            rearrange_presentation(pptx_path, render_path, dirty)
+        rendered = dirty
+
+    pages = render_pages(render_path, temp_dir, dpi, "changed", len(rendered), jobs)
+    if len(pages) != len(rendered):
+        raise RuntimeError(
+            f"Expected {len(rendered)} rendered slides, "
+            f"LibreOffice produced {len(pages)}"
+        )
+    pages = dict(zip(rendered, pages))
+    for idx in dirty:
+        if has_date_field(prs.slides[idx]):
+            images[idx] = pages[idx]
+        else:
+            images[idx] = cache.store(keys[idx], pages[idx])
+    return images
+
+
+def convert_to_images(pptx_path, temp_dir, dpi, cache=None, jobs=None):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    With a RenderCache, only slides without a cached render are converted.
+    """
+    # Detect hidden slides
+    print("Analyzing presentation...")
+    prs = Presentation(str(pptx_path))
+    total_slides = len(prs.slides)
+
+    # Find hidden slides (1-based indexing for display)
+    hidden_slides = {
+        idx + 1
+        for idx, slide in enumerate(prs.slides)
+        if slide.element.get("show") == "0"
+    }
+
+    print(f"Total slides: {total_slides}")
+    if hidden_slides:
+        print(f"Hidden slides: {sorted(hidden_slides)}")
+
+    visible_indices = [
+        idx for idx in range(total_slides) if idx + 1 not in hidden_slides
+    ]
+    if cache is not None:
+        rendered = render_slides_cached(
+            pptx_path, prs, visible_indices, temp_dir, dpi, cache, jobs
+        )
+        visible_images = [rendered[idx] for idx in visible_indices]
+    else:
+        visible_images = render_pages(
+            pptx_path, temp_dir, dpi, page_count=len(visible_indices), jobs=jobs
+        )
 
     # Create full list with placeholders for hidden slides
     all_images = []
@@ -278,6 +575,7 @@ def create_grids(
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
+    jobs=None,
 ):
     """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
     # Maximum images per grid is cols × (cols + 1) for better proportions
@@ -297,7 +595,13 @@ def create_grids(
 
         # Create grid for this chunk
         grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
+            chunk_images,
+            cols,
+            width,
+            start_idx,
+            placeholder_regions,
+            slide_dimensions,
+            jobs,
         )
 
         # Generate output filename
@@ -325,8 +629,13 @@ def create_grid(
     start_slide_num=0,
     placeholder_regions=None,
     slide_dimensions=None,
+    jobs=None,
 ):
-    """Create thumbnail grid from slide images with optional placeholder outlining."""
+    """Create thumbnail grid from slide images with optional placeholder outlining.
+
+    Slide images are decoded and resized by a pool of jobs threads (PIL
+    releases the GIL while decoding and resampling); pasting stays in order.
+    """
     font_size = int(width * FONT_SIZE_RATIO)
     label_padding = int(font_size * LABEL_PADDING_RATIO)
 
@@ -352,81 +661,39 @@ def create_grid(
         # Fall back to basic default font if size parameter not supported
         font = ImageFont.load_default()
 
-    # Place thumbnails
-    for i, img_path in enumerate(image_paths):
-        row, col = i // cols, i % cols
-        x = col * width + (col + 1) * GRID_PADDING
-        y_base = (
-            row * (height + font_size + label_padding * 2) + (row + 1) * GRID_PADDING
+    # Decode and resize every slide image concurrently
+    def load(i):
+        regions = (placeholder_regions or {}).get(start_slide_num + i)
+        return load_thumbnail(
+            image_paths[i], (width, height), regions, slide_dimensions
         )
 
-        # Add label with actual slide number
-        label = f"{start_slide_num + i}"
-        bbox = draw.textbbox((0, 0), label, font=font)
-        text_w = bbox[2] - bbox[0]
-        draw.text(
-            (x + (width - text_w) // 2, y_base + label_padding),
-            label,
-            fill="black",
-            font=font,
-        )
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        thumbnails = executor.map(load, range(len(image_paths)))
 
-        # Add thumbnail below label with proportional spacing
-        y_thumbnail = y_base + label_padding + font_size + label_padding
-
-        with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
-            orig_w, orig_h = img.size
-
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
-
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
+        # Place thumbnails
+        for i, img in enumerate(thumbnails):
+            row, col = i // cols, i % cols
+            x = col * width + (col + 1) * GRID_PADDING
+            y_base = (
+                row * (height + font_size + label_padding * 2)
+                + (row + 1) * GRID_PADDING
+            )
+
+            # Add label with actual slide number
+            label = f"{start_slide_num + i}"
+            bbox = draw.textbbox((0, 0), label, font=font)
+            text_w = bbox[2] - bbox[0]
+            draw.text(
+                (x + (width - text_w) // 2, y_base + label_padding),
+                label,
+                fill="black",
+                font=font,
+            )
+
+            # Add thumbnail below label with proportional spacing
+            y_thumbnail = y_base + label_padding + font_size + label_padding
 
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
             w, h = img.size
             tx = x + (width - w) // 2
             ty = y_thumbnail + (height - h) // 2
@@ -446,5 +713,61 @@ def create_grid(
     return grid
 
 
+def load_thumbnail(img_path, size, regions=None, slide_dimensions=None):
+    """Load a slide image as a thumbnail fitting size, outlining text regions.
+
+    Without regions, Image.thumbnail puts the JPEG decoder in draft mode, so
+    the slide is decoded at a reduced scale instead of full size.
+    """
+    width, height = size
+    with Image.open(img_path) as img:
+        # Get original dimensions before thumbnail
+        orig_w, orig_h = img.size
+
+        # Apply placeholder outlines if enabled
+        if regions:
+            # The outlines are opaque, so draw them straight onto the decoded
+            # slide instead of compositing a full-size RGBA overlay
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            # Calculate scale factors using actual slide dimensions
+            if slide_dimensions:
+                slide_width_inches, slide_height_inches = slide_dimensions
+            else:
+                # Fallback: estimate from image size at CONVERSION_DPI
+                slide_width_inches = orig_w / CONVERSION_DPI
+                slide_height_inches = orig_h / CONVERSION_DPI
+
+            x_scale = orig_w / slide_width_inches
+            y_scale = orig_h / slide_height_inches
+
+            draw = ImageDraw.Draw(img)
+
+            # Highlight each placeholder region
+            for region in regions:
+                # Convert from inches to pixels in the original image
+                px_left = int(region["left"] * x_scale)
+                px_top = int(region["top"] * y_scale)
+                px_width = int(region["width"] * x_scale)
+                px_height = int(region["height"] * y_scale)
+
+                # Draw highlight outline with red color and thick stroke
+                # Using a bright red outline instead of fill
+                stroke_width = max(
+                    5, min(orig_w, orig_h) // 150
+                )  # Thicker proportional stroke width
+                draw.rectangle(
+                    [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                    outline=(255, 0, 0),  # Bright red
+                    width=stroke_width,
+                )
+
+        # For unmodified JPEGs this drafts the decoder (DCT scaling) first
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        # Detach from the file so the image outlives the with block
+        return img.copy()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,391 @@
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from lxml import etree
+from PIL import Image, ImageChops, ImageDraw
+from pptx import Presentation
+from pptx.util import Inches
+
+from thumbnail import (
+    CONVERSION_DPI,
+    RenderCache,
+    create_grids,
+    load_thumbnail,
+    render_slides_cached,
+)
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+SLIDE_NUMBER_FIELD = (
+    '<a:fld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' id="{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}" type="slidenum">'
+    "<a:t>1</a:t></a:fld>"
+)
+DATE_FIELD = (
+    '<a:fld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' id="{B6F15528-21DE-4FAA-801E-634DDDAF4B2C}" type="datetime1">'
+    "<a:t>1/1/2024</a:t></a:fld>"
+)
+
+
+def build_deck(path, slide_count=6):
+    """Save a deck whose slides share one layout."""
+    prs = Presentation()
+    for idx in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {idx}"
+    prs.save(path)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRenderCacheKeys(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "deck.pptx"
+        build_deck(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def keys(self, prs, dpi=CONVERSION_DPI):
+        cache = RenderCache(Path(self.tmpdir.name) / "cache")
+        return [cache.slide_key(prs, idx, dpi) for idx in range(len(prs.slides))]
+
+    def test_keys_stable_across_save(self):
+        before = self.keys(Presentation(self.path))
+        prs = Presentation(self.path)
+        prs.save(self.path)
+        self.assertEqual(self.keys(Presentation(self.path)), before)
+
+    def test_edit_changes_only_that_slide(self):
+        before = self.keys(Presentation(self.path))
+        prs = Presentation(self.path)
+        prs.slides[2].shapes.title.text = "Edited"
+        after = self.keys(prs)
+        changed = [idx for idx, (a, b) in enumerate(zip(before, after)) if a != b]
+        self.assertEqual(changed, [2])
+
+    def test_layout_and_media_changes_invalidate(self):
+        before = self.keys(Presentation(self.path))
+
+        prs = Presentation(self.path)
+        layout = prs.slide_layouts[1]
+        layout.placeholders[0].left += Inches(1)
+        self.assertTrue(all(a != b for a, b in zip(before, self.keys(prs))))
+
+        prs = Presentation(self.path)
+        image = Path(self.tmpdir.name) / "pixel.png"
+        Image.new("RGB", (4, 4), "red").save(image)
+        prs.slides[4].shapes.add_picture(str(image), 0, 0)
+        after = self.keys(prs)
+        self.assertNotEqual(after[4], before[4])
+        self.assertEqual(after[:4] + after[5:], before[:4] + before[5:])
+        self.assertNotEqual(self.keys(prs, dpi=CONVERSION_DPI * 2)[0], after[0])
+
+    def test_slide_number_keys_depend_on_position(self):
+        prs = Presentation(self.path)
+        for slide in prs.slides:
+            paragraph = slide.shapes.title.text_frame.paragraphs[0]
+            paragraph.runs[0].text = "Same"
+            paragraph._p.append(etree.fromstring(SLIDE_NUMBER_FIELD))
+        keys = self.keys(prs)
+        # Identical slides showing their number must not share a render
+        self.assertEqual(len(set(keys)), len(keys))
+        # Without the field they render alike and share one
+        for slide in prs.slides:
+            paragraph = slide.shapes.title.text_frame.paragraphs[0]._p
+            paragraph.remove(paragraph[-1])
+        self.assertEqual(len(set(self.keys(prs))), 1)
+
+    def test_keys_survive_reordering(self):
+        before = self.keys(Presentation(self.path))
+        prs = Presentation(self.path)
+        slides = prs.slides._sldIdLst
+        slides.insert(0, slides[-1])
+        prs.save(self.path)
+        self.assertEqual(self.keys(Presentation(self.path)), before[-1:] + before[:-1])
+
+    def test_presentation_settings_invalidate(self):
+        before = self.keys(Presentation(self.path))
+
+        prs = Presentation(self.path)
+        default_style = prs.element.find(f"{{{P_NS}}}defaultTextStyle")
+        default_style[0][0].set("sz", "2400")  # lvl1pPr/defRPr
+        self.assertTrue(all(a != b for a, b in zip(before, self.keys(prs))))
+
+        prs = Presentation(self.path)
+        prs.element.find(f"{{{P_NS}}}sldSz").set("type", "custom")
+        self.assertTrue(all(a != b for a, b in zip(before, self.keys(prs))))
+
+        # The first slide number only matters to slides that show their number
+        prs = Presentation(self.path)
+        prs.element.set("firstSlideNum", "5")
+        self.assertEqual(self.keys(prs), before)
+        prs.slides[3].shapes.title.text_frame.paragraphs[0]._p.append(
+            etree.fromstring(SLIDE_NUMBER_FIELD)
+        )
+        numbered = self.keys(prs)
+        prs.element.set("firstSlideNum", "1")
+        self.assertNotEqual(self.keys(prs)[3], numbered[3])
+
+
+def slide_color(slide, number, day="day 1"):
+    """Color of the stand-in render: the title, plus the fields it shows."""
+    text = slide.shapes.title.text
+    if slide.element.xpath(".//a:fld[@type='slidenum']"):
+        text += f" #{number}"
+    if slide.element.xpath(".//a:fld[starts-with(@type, 'datetime')]"):
+        text += f" on {day}"
+    return hashlib.sha256(text.encode()).digest()[:3]
+
+
+def fake_render_pages(
+    pptx_path, temp_dir, dpi, prefix="slide", *args, day="day 1", **kwargs
+):
+    """Stand-in for LibreOffice: one image per slide, colored by what it shows."""
+    paths = []
+    for idx, slide in enumerate(Presentation(pptx_path).slides, start=1):
+        color = slide_color(slide, idx, day)
+        path = Path(temp_dir) / f"{prefix}-{idx:02d}.jpg"
+        Image.new("RGB", (40, 30), tuple(color)).save(path)
+        paths.append(path)
+    return paths
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRenderSlidesCached(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        self.path = self.dir / "deck.pptx"
+        build_deck(self.path)
+        self.cache = RenderCache(self.dir / "cache")
+        self.rendered = []
+        self.day = "day 1"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def render(self):
+        def render_pages(pptx_path, *args, **kwargs):
+            self.rendered.append(
+                [slide.shapes.title.text for slide in Presentation(pptx_path).slides]
+            )
+            return fake_render_pages(pptx_path, *args, day=self.day, **kwargs)
+
+        prs = Presentation(self.path)
+        temp_dir = Path(tempfile.mkdtemp(dir=self.dir))
+        with mock.patch("thumbnail.render_pages", render_pages):
+            with redirect_stdout(StringIO()):
+                images = render_slides_cached(
+                    self.path, prs, range(len(prs.slides)), temp_dir, 100, self.cache
+                )
+        return [images[idx] for idx in range(len(prs.slides))]
+
+    def assert_images_match(self, images):
+        """Each image is the render of the slide currently at its position."""
+        slides = Presentation(self.path).slides
+        for number, (image, slide) in enumerate(zip(images, slides), start=1):
+            expected = slide_color(slide, number, self.day)
+            with Image.open(image) as img:
+                pixel = img.getpixel((20, 15))
+            self.assertTrue(all(abs(a - b) < 8 for a, b in zip(pixel, expected)))
+
+    def test_renders_only_edited_slides(self):
+        first = self.render()
+        self.assertEqual(self.rendered, [[f"Slide {idx}" for idx in range(6)]])
+        self.assert_images_match(first)
+
+        self.assertEqual(self.render(), first)
+        self.assertEqual(len(self.rendered), 1)
+
+        prs = Presentation(self.path)
+        prs.slides[2].shapes.title.text = "Edited"
+        prs.slides[4].shapes.title.text = "Also edited"
+        prs.save(self.path)
+        images = self.render()
+        self.assertEqual(self.rendered[-1], ["Edited", "Also edited"])
+        for idx in (0, 1, 3, 5):
+            self.assertEqual(images[idx], first[idx])
+        self.assert_images_match(images)
+
+        # A presentation-wide setting re-renders every slide
+        prs = Presentation(self.path)
+        prs.element.find(f"{{{P_NS}}}defaultTextStyle")[0][0].set("sz", "2400")
+        prs.save(self.path)
+        self.render()
+        self.assertEqual(len(self.rendered[-1]), 6)
+
+    def test_changed_slide_keeps_its_number(self):
+        prs = Presentation(self.path)
+        for idx in (1, 4):
+            paragraph = prs.slides[idx].shapes.title.text_frame.paragraphs[0]
+            paragraph._p.append(etree.fromstring(SLIDE_NUMBER_FIELD))
+        prs.save(self.path)
+        self.assert_images_match(self.render())
+
+        # A subset deck would number the edited slide 1, so the deck is rendered
+        prs = Presentation(self.path)
+        prs.slides[4].shapes.title.text_frame.paragraphs[0].runs[0].text = "Edited"
+        prs.save(self.path)
+        images = self.render()
+        self.assertEqual(len(self.rendered[-1]), 6)
+        self.assert_images_match(images)
+        # Only the edited slide was stored; a later render reuses it
+        self.assertEqual(len(list(self.cache.directory.glob("*/*.jpg"))), 7)
+        self.assertEqual(self.render(), images)
+        self.assertEqual(len(self.rendered), 2)
+
+        # Edits to slides without the field still render on their own
+        prs = Presentation(self.path)
+        prs.slides[0].shapes.title.text = "First"
+        prs.save(self.path)
+        self.assert_images_match(self.render())
+        self.assertEqual(self.rendered[-1], ["First"])
+
+    def test_date_slides_are_not_cached(self):
+        prs = Presentation(self.path)
+        paragraph = prs.slides[2].shapes.title.text_frame.paragraphs[0]
+        paragraph._p.append(etree.fromstring(DATE_FIELD))
+        prs.save(self.path)
+        self.assert_images_match(self.render())
+        self.assertEqual(len(list(self.cache.directory.glob("*/*.jpg"))), 5)
+
+        self.day = "day 2"
+        images = self.render()
+        self.assertEqual(len(self.rendered[-1]), 1)
+        self.assert_images_match(images)
+
+    def test_pruning_keeps_images_in_use(self):
+        self.render()
+        entries = sorted(self.cache.directory.glob("*/*.jpg"))
+        size = entries[0].stat().st_size
+        for age, entry in enumerate(entries):
+            os.utime(entry, (1000 + age, 1000 + age))
+
+        # A new cache limited to four images drops the least recently used one
+        # that the current render does not need
+        self.cache = RenderCache(self.cache.directory, max_bytes=size * 4)
+        prs = Presentation(self.path)
+        prs.slides[0].shapes.title.text = "Edited"
+        prs.save(self.path)
+        images = self.render()
+        self.assertEqual(self.rendered[-1], ["Edited"])
+        self.assertTrue(all(image.exists() for image in images))
+        remaining = set(self.cache.directory.glob("*/*.jpg"))
+        self.assertEqual(remaining, set(images))
+
+
+def make_slide_images(directory, count):
+    """Write slide-sized JPEGs with some detail, as pdftoppm would at 100 DPI."""
+    paths = []
+    for idx in range(count):
+        img = Image.new("RGB", (1333, 750), "white")
+        draw = ImageDraw.Draw(img)
+        for line in range(20):
+            draw.text((40, 40 + line * 32), f"Slide {idx} line {line} " * 6, "black")
+        path = Path(directory) / f"slide-{idx:03d}.jpg"
+        img.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def load_thumbnail_overlay(img_path, size, regions, slide_dimensions):
+    """Reference implementation compositing a full-size RGBA overlay."""
+    with Image.open(img_path) as img:
+        orig_w, orig_h = img.size
+        img = img.convert("RGBA")
+        x_scale = orig_w / slide_dimensions[0]
+        y_scale = orig_h / slide_dimensions[1]
+        overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+        for region in regions:
+            px_left = int(region["left"] * x_scale)
+            px_top = int(region["top"] * y_scale)
+            px_width = int(region["width"] * x_scale)
+            px_height = int(region["height"] * y_scale)
+            overlay_draw.rectangle(
+                [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                outline=(255, 0, 0, 255),
+                width=max(5, min(orig_w, orig_h) // 150),
+            )
+        img = Image.alpha_composite(img, overlay).convert("RGB")
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        return img
+
+
+class TestCreateGrids(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_parallel_grids_match_serial(self):
+        images = make_slide_images(self.dir, 14)
+        regions = {3: [{"left": 1, "top": 1, "width": 4, "height": 2}]}
+        serial = create_grids(
+            images, 3, 300, self.dir / "serial.jpg", regions, (13.33, 7.5), jobs=1
+        )
+        parallel = create_grids(
+            images, 3, 300, self.dir / "parallel.jpg", regions, (13.33, 7.5), jobs=4
+        )
+        self.assertEqual(len(parallel), 2)
+        for a, b in zip(serial, parallel):
+            with Image.open(a) as img_a, Image.open(b) as img_b:
+                self.assertIsNone(ImageChops.difference(img_a, img_b).getbbox())
+
+    def test_outlines_match_overlay_compositing(self):
+        images = make_slide_images(self.dir, 3)
+        regions = [
+            {"left": 1, "top": 1, "width": 4, "height": 2},
+            {"left": 6.2, "top": 3.3, "width": 5, "height": 3.5},  # Off the edge
+        ]
+        for size in ((300, 169), (600, 337), (1333, 750)):
+            for path in images:
+                expected = load_thumbnail_overlay(path, size, regions, (13.33, 7.5))
+                actual = load_thumbnail(path, size, regions, (13.33, 7.5))
+                self.assertEqual(actual.mode, "RGB")
+                self.assertIsNone(ImageChops.difference(actual, expected).getbbox())
+
+    def test_benchmark_outlines(self):
+        """Print per-slide timings for outlined thumbnails."""
+        images = make_slide_images(self.dir, 40)
+        regions = [{"left": 1, "top": 1, "width": 4, "height": 2}]
+        timings = {}
+        for name, load in (
+            ("overlay", load_thumbnail_overlay),
+            ("direct", load_thumbnail),
+        ):
+            start = time.perf_counter()
+            for path in images:
+                load(path, (300, 169), regions, (13.33, 7.5))
+            timings[name] = (time.perf_counter() - start) / len(images)
+        print(
+            "\nOutlined thumbnails: "
+            + ", ".join(f"{name} {t * 1000:.1f} ms" for name, t in timings.items())
+        )
+
+    def test_benchmark(self):
+        """Print grid timings for 200 slides, serial and on all CPUs."""
+        images = make_slide_images(self.dir, 200)
+        timings = {}
+        for jobs in (1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            create_grids(images, 5, 300, self.dir / f"grid-{jobs}.jpg", jobs=jobs)
+            timings[jobs] = time.perf_counter() - start
+        print(
+            "\n200 slides: "
+            + ", ".join(f"{jobs} job(s) {t * 1000:.0f} ms" for jobs, t in timings.items())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
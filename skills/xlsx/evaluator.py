@@ -0,0 +1,1733 @@
+"""
+Excel Formula Evaluator
+Recalculates the formulas of an .xlsx file in Python, for machines without
+LibreOffice. It covers the functions generated workbooks mostly use;
+formulas calling anything else keep their cached values and are reported.
+"""
+
+import math
+import os
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from bisect import bisect_left, bisect_right
+from decimal import ROUND_DOWN, ROUND_HALF_UP, ROUND_UP, Decimal
+
+from lxml import etree
+
+from formulas import cell_name, parse_reference, tokenize, translate
+from recalc import (
+    CELL_TAG,
+    FORMULA_TAG,
+    INLINE_STRING_TAG,
+    MAX_LOCATIONS,
+    ROW_TAG,
+    SHEET_DATA_TAG,
+    SI_TAG,
+    VALUE_TAG,
+    read_workbook_parts,
+    string_text,
+)
+
+
+class Error(str):
+    """An Excel error value such as #DIV/0!"""
+
+
+DIV0 = Error('#DIV/0!')
+NA = Error('#N/A')
+NAME = Error('#NAME?')
+NUM = Error('#NUM!')
+REF = Error('#REF!')
+VALUE = Error('#VALUE!')
+
+# Result of a formula that could not be evaluated; its cached value is kept
+UNKNOWN = object()
+
+
+class Unsupported(Exception):
+    """A formula uses a function or syntax the evaluator does not implement"""
+
+    def __init__(self, name=None):
+        super().__init__(name)
+        self.name = name
+
+
+class _Failed(Exception):
+    """Raised inside functions and operators to return an error value"""
+
+    def __init__(self, error):
+        super().__init__(error)
+        self.error = error
+
+
+# Binding power of binary operators; ':' joins two references into one range
+_BINARY = {
+    '=': 1, '<>': 1, '<': 1, '>': 1, '<=': 1, '>=': 1,
+    '&': 2, '+': 3, '-': 3, '*': 4, '/': 4, '^': 5, ':': 8,
+}
+_PERCENT = 6
+_NEGATION = 7  # Binds tighter than '^', so =-2^2 is 4 as in Excel
+_COMPARISONS = {
+    '=': lambda order: order == 0,
+    '<>': lambda order: order != 0,
+    '<': lambda order: order < 0,
+    '>': lambda order: order > 0,
+    '<=': lambda order: order <= 0,
+    '>=': lambda order: order >= 0,
+}
+_NUMBER_TEXT_RE = re.compile(
+    r'\s*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?\s*'
+)
+_MISSING = ('missing',)
+
+
+class _Parser:
+    """Turns formula tokens into a tree of tuples, one per operation"""
+
+    def __init__(self, formula, sheet):
+        self.tokens = [token for token in tokenize(formula) if token.kind != 'space']
+        self.pos = 0
+        self.sheet = sheet
+
+    def parse(self):
+        node = self.expression(0)
+        if self.pos != len(self.tokens):
+            raise Unsupported()
+        return node
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            raise Unsupported()
+        self.pos += 1
+        return token
+
+    def expression(self, precedence):
+        node = self.operand()
+        while True:
+            token = self.peek()
+            if token is None or token.kind != 'operator':
+                return node
+            if token.text == '%':
+                if _PERCENT <= precedence:
+                    return node
+                self.pos += 1
+                node = ('percent', node)
+                continue
+            binding = _BINARY[token.text]
+            if binding <= precedence:
+                return node
+            self.pos += 1
+            right = self.expression(binding)
+            if token.text == ':':
+                node = ('range', node, right)
+            else:
+                node = ('op', token.text, node, right)
+
+    def operand(self):
+        kind, text = self.take()
+        if kind == 'number':
+            return ('value', float(text))
+        if kind == 'string':
+            return ('value', text[1:-1].replace('""', '"'))
+        if kind == 'error':
+            return ('value', Error(text))
+        if kind == 'ref':
+            reference = parse_reference(text, self.sheet)
+            if reference is None:
+                raise Unsupported()  # Another workbook or several sheets
+            return ('ref', reference)
+        if kind == 'operator' and text in '+-':
+            node = self.expression(_NEGATION)
+            return ('neg', node) if text == '-' else node
+        if kind == 'open':
+            node = self.expression(0)
+            self.expect('close')
+            return node
+        if kind == 'function':
+            self.expect('open')
+            name = text.upper()
+            for prefix in ('_XLFN.', '_XLWS.'):
+                if name.startswith(prefix):
+                    name = name[len(prefix):]
+            return ('call', name, self.arguments())
+        if kind == 'name':
+            key = text.rsplit('!', 1)[-1].upper()
+            if key in ('TRUE', 'FALSE'):
+                return ('value', key == 'TRUE')
+            return ('name', key)
+        if kind == 'array_open':
+            return ('value', self.array())
+        raise Unsupported()
+
+    def expect(self, kind):
+        if self.take().kind != kind:
+            raise Unsupported()
+
+    def arguments(self):
+        args = []
+        if self.peek() is not None and self.peek().kind == 'close':
+            self.pos += 1
+            return args
+        while True:
+            token = self.peek()
+            if token is not None and (token.kind == 'close' or token.text == ','):
+                args.append(_MISSING)
+            else:
+                args.append(self.expression(0))
+            token = self.take()
+            if token.kind == 'close':
+                return args
+            if token.text != ',':
+                raise Unsupported()
+
+    def array(self):
+        """An array constant such as {1,2;3,4}, as a list of rows"""
+        rows = [[]]
+        while True:
+            token = self.take()
+            sign = 1.0
+            if token.text in ('-', '+'):
+                sign = -1.0 if token.text == '-' else 1.0
+                token = self.take()
+            if token.kind == 'number':
+                rows[-1].append(sign * float(token.text))
+            elif token.kind == 'string':
+                rows[-1].append(token.text[1:-1].replace('""', '"'))
+            elif token.kind == 'error':
+                rows[-1].append(Error(token.text))
+            elif token.kind == 'name' and token.text.upper() in ('TRUE', 'FALSE'):
+                rows[-1].append(token.text.upper() == 'TRUE')
+            else:
+                raise Unsupported()
+            token = self.take()
+            if token.kind == 'array_close':
+                break
+            if token.text == ';':
+                rows.append([])
+            elif token.text != ',':
+                raise Unsupported()
+        if len({len(row) for row in rows}) != 1:
+            raise Unsupported()
+        return rows
+
+
+class Area:
+    """A rectangle of cells, read from the workbook when a function needs it"""
+
+    __slots__ = ('book', 'key', 'top', 'left', 'bottom', 'right')
+
+    def __init__(self, book, key, top, left, bottom, right):
+        self.book = book
+        self.key = key
+        self.top = top
+        self.left = left
+        self.bottom = bottom
+        self.right = right
+
+    @property
+    def height(self):
+        return self.bottom - self.top + 1
+
+    @property
+    def width(self):
+        return self.right - self.left + 1
+
+    @property
+    def cache_key(self):
+        return (self.key, self.top, self.left, self.bottom, self.right)
+
+    def cell(self, row, column):
+        """Value at a 0-based position in the area"""
+        value = self.book.cells.get((self.key, self.top + row, self.left + column))
+        if value is UNKNOWN:
+            raise Unsupported()
+        return value
+
+    def part(self, row, column, height, width):
+        return Area(
+            self.book, self.key, self.top + row, self.left + column,
+            self.top + row + height - 1, self.left + column + width - 1,
+        )
+
+    def values(self):
+        """Non-empty values, visiting only the cells the sheet has"""
+        book = self.book
+        index = book.columns.get(self.key)
+        if not index:
+            return
+        keys = book.column_keys[self.key]
+        cells = book.cells
+        for column in keys[bisect_left(keys, self.left):bisect_right(keys, self.right)]:
+            rows = index[column]
+            start = bisect_left(rows, self.top)
+            stop = bisect_right(rows, self.bottom)
+            for row in rows[start:stop]:
+                value = cells[self.key, row, column]
+                if value is UNKNOWN:
+                    raise Unsupported()
+                if value is not None:
+                    yield value
+
+    def rows(self):
+        """
+        All values as a list of rows; whole rows and columns are cut off
+        where the workbook's data ends
+        """
+        bottom = min(self.bottom, self.book.last_row)
+        right = min(self.right, self.book.last_column)
+        get = self.book.cells.get
+        grid = [
+            [get((self.key, row, column)) for column in range(self.left, right + 1)]
+            for row in range(self.top, bottom + 1)
+        ]
+        if any(UNKNOWN in row for row in grid):
+            raise Unsupported()
+        return grid
+
+    def intersect(self, context):
+        """The single value a range stands for outside array formulas"""
+        if self.top == self.bottom and self.left == self.right:
+            return self.cell(0, 0)
+        if self.left == self.right and self.top <= context.row <= self.bottom:
+            return self.cell(context.row - self.top, 0)
+        if self.top == self.bottom and self.left <= context.column <= self.right:
+            return self.cell(0, context.column - self.left)
+        return VALUE
+
+
+class _Context:
+    """The cell a formula is evaluated for"""
+
+    __slots__ = ('book', 'key', 'sheet', 'row', 'column', 'array')
+
+    def __init__(self, book, key, row, column, array=False):
+        self.book = book
+        self.key = key
+        self.sheet = book.sheet_names[key]
+        self.row = row
+        self.column = column
+        self.array = array
+
+    def as_array(self):
+        return _Context(self.book, self.key, self.row, self.column, True)
+
+
+class Formula:
+    __slots__ = ('key', 'text', 'bounds')
+
+    def __init__(self, key, text, bounds=None):
+        self.key = key  # (sheet key, row, column)
+        self.text = text
+        # (top, left, bottom, right) of the cells an array formula fills
+        self.bounds = bounds
+
+
+class Workbook:
+    """Cell values and formulas of every worksheet, with range indexes"""
+
+    def __init__(self, names):
+        self.names = names
+        self.sheet_names = {}  # Upper-cased sheet name -> name
+        self.cells = {}  # (sheet key, row, column) -> value
+        self.formulas = {}  # (sheet key, row, column) -> Formula
+        self.owners = {}  # Cell -> key of the formula computing it
+        self.columns = {}  # Sheet key -> {column: sorted rows with cells}
+        self.column_keys = {}
+        self.formula_columns = {}  # Same, for cells computed by formulas
+        self.formula_column_keys = {}
+        self.last_row = 0
+        self.last_column = 0
+        self._compiled = {}
+        self._references = {}
+        self._lookups = {}
+
+    def add_sheet(self, name):
+        key = name.upper()
+        self.sheet_names[key] = name
+        return key
+
+    def add_formula(self, formula):
+        self.formulas[formula.key] = formula
+        sheet, row, column = formula.key
+        if formula.bounds is None:
+            self.owners[formula.key] = formula.key
+            return
+        top, left, bottom, right = formula.bounds
+        for r in range(top, bottom + 1):
+            for c in range(left, right + 1):
+                self.owners[sheet, r, c] = formula.key
+                self.cells.setdefault((sheet, r, c), None)
+
+    def build_index(self):
+        for target, keys, cells in (
+            (self.columns, self.column_keys, self.cells),
+            (self.formula_columns, self.formula_column_keys, self.owners),
+        ):
+            for sheet, row, column in cells:
+                target.setdefault(sheet, {}).setdefault(column, []).append(row)
+                self.last_row = max(self.last_row, row)
+                self.last_column = max(self.last_column, column)
+            for sheet, columns in target.items():
+                for rows in columns.values():
+                    rows.sort()
+                keys[sheet] = sorted(columns)
+
+    def area(self, reference):
+        key = reference.sheet.upper()
+        if key not in self.sheet_names:
+            return REF
+        return Area(self, key, *reference[1:])
+
+    def compile(self, text, sheet):
+        """Parsed formula, shared by every cell with the same text and sheet"""
+        cache_key = (sheet, text)
+        node = self._compiled.get(cache_key)
+        if node is None:
+            try:
+                node = _Parser(text, sheet).parse()
+            except Unsupported as e:
+                node = e
+            self._compiled[cache_key] = node
+        if isinstance(node, Unsupported):
+            raise node
+        return node
+
+    def references(self, text, sheet):
+        """References a formula reads, following defined names"""
+        cache_key = (sheet, text)
+        found = self._references.get(cache_key)
+        if found is None:
+            found = []
+            try:
+                self._collect(self.compile(text, sheet), sheet, set(), found)
+            except Unsupported:
+                pass
+            self._references[cache_key] = found
+        return found
+
+    def _collect(self, node, sheet, seen, found):
+        kind = node[0]
+        if kind == 'ref':
+            found.append(node[1])
+        elif kind == 'name':
+            text = self.names.get(node[1])
+            if text and node[1] not in seen:
+                seen.add(node[1])
+                try:
+                    self._collect(self.compile(text, sheet), sheet, seen, found)
+                except Unsupported:
+                    pass
+        elif kind == 'call':
+            for arg in node[2]:
+                self._collect(arg, sheet, seen, found)
+        elif kind == 'op':
+            self._collect(node[2], sheet, seen, found)
+            self._collect(node[3], sheet, seen, found)
+        elif kind == 'range':
+            self._collect(node[1], sheet, seen, found)
+            self._collect(node[2], sheet, seen, found)
+        elif kind in ('neg', 'percent'):
+            self._collect(node[1], sheet, seen, found)
+
+    def precedents(self, key):
+        """Keys of the formulas computing cells that a formula reads"""
+        sheet = self.sheet_names[key[0]]
+        for ref in self.references(self.formulas[key].text, sheet):
+            sheet_key = ref.sheet.upper()
+            columns = self.formula_columns.get(sheet_key)
+            if columns is None:
+                continue
+            keys = self.formula_column_keys[sheet_key]
+            start = bisect_left(keys, ref.first_column)
+            stop = bisect_right(keys, ref.last_column)
+            for column in keys[start:stop]:
+                rows = columns[column]
+                start = bisect_left(rows, ref.first_row)
+                stop = bisect_right(rows, ref.last_row)
+                for row in rows[start:stop]:
+                    yield self.owners[sheet_key, row, column]
+
+    def lookup_index(self, cache_key, vector):
+        """
+        First position of each value in a lookup range, built once per range;
+        every formula in the range has its final value by the time any
+        formula reading it is evaluated
+        """
+        index = self._lookups.get(cache_key) if cache_key else None
+        if index is None:
+            index = {}
+            for position, item in enumerate(vector()):
+                key = _lookup_key(item)
+                if key is not None and key not in index:
+                    index[key] = position
+            if cache_key:
+                self._lookups[cache_key] = index
+        return index
+
+
+def evaluate(node, context):
+    """Value of a parsed formula; ranges are returned as Area"""
+    kind = node[0]
+    if kind == 'value':
+        return node[1]
+    if kind == 'ref':
+        return context.book.area(node[1])
+    if kind == 'op':
+        left = _operand(evaluate(node[2], context), context)
+        right = _operand(evaluate(node[3], context), context)
+        op = node[1]
+        if isinstance(left, list) or isinstance(right, list):
+            return _broadcast(lambda a, b: _apply(op, a, b), left, right)
+        return _apply(op, left, right)
+    if kind == 'call':
+        name = node[1]
+        entry = FUNCTIONS.get(name)
+        if entry is None:
+            raise Unsupported(name)
+        func, lazy, arrays, (low, high) = entry
+        if not low <= len(node[2]) <= high:
+            return VALUE
+        if arrays:
+            context = context.as_array()
+        args = node[2] if lazy else [evaluate(arg, context) for arg in node[2]]
+        try:
+            return func(args, context)
+        except _Failed as e:
+            return e.error
+    if kind == 'neg':
+        value = evaluate(node[1], context)
+        return _map(lambda item: _apply('-', 0.0, item), value, context)
+    if kind == 'percent':
+        value = evaluate(node[1], context)
+        return _map(lambda item: _apply('/', item, 100.0), value, context)
+    if kind == 'name':
+        text = context.book.names.get(node[1])
+        if text is None:
+            return NAME
+        return evaluate(context.book.compile(text.lstrip('='), context.sheet), context)
+    if kind == 'range':
+        first = evaluate(node[1], context)
+        last = evaluate(node[2], context)
+        if not (isinstance(first, Area) and isinstance(last, Area)):
+            return VALUE
+        if first.key != last.key:
+            return VALUE
+        return Area(
+            context.book, first.key,
+            min(first.top, last.top), min(first.left, last.left),
+            max(first.bottom, last.bottom), max(first.right, last.right),
+        )
+    if kind == 'missing':
+        return None
+    raise Unsupported()
+
+
+def _operand(value, context):
+    if isinstance(value, Area):
+        return value.rows() if context.array else value.intersect(context)
+    return value
+
+
+def _map(func, value, context):
+    value = _operand(value, context)
+    if isinstance(value, list):
+        return [[func(item) for item in row] for row in value]
+    return func(value)
+
+
+def _broadcast(func, left, right):
+    """Apply func element-wise, stretching single rows and columns as Excel does"""
+    left = left if isinstance(left, list) else [[left]]
+    right = right if isinstance(right, list) else [[right]]
+    height = max(len(left), len(right))
+    width = max(len(left[0]), len(right[0]))
+
+    return [
+        [
+            func(_grid_item(left, row, column), _grid_item(right, row, column))
+            for column in range(width)
+        ]
+        for row in range(height)
+    ]
+
+
+def _grid_item(grid, row, column):
+    """Item of an array at a position, repeating single rows and columns"""
+    if not grid or not grid[0]:
+        return None  # A range past the end of the workbook's data
+    row = 0 if len(grid) == 1 else row
+    column = 0 if len(grid[0]) == 1 else column
+    if row >= len(grid) or column >= len(grid[0]):
+        return NA
+    return grid[row][column]
+
+
+def _apply(op, a, b):
+    try:
+        if op == '&':
+            return _to_text(a) + _to_text(b)
+        if op in _COMPARISONS:
+            for value in (a, b):
+                if isinstance(value, Error):
+                    return value
+            return _COMPARISONS[op](_compare(a, b))
+        x = _to_number(a)
+        y = _to_number(b)
+        if op == '+':
+            result = x + y
+        elif op == '-':
+            result = x - y
+        elif op == '*':
+            result = x * y
+        elif op == '/':
+            if y == 0:
+                return DIV0
+            result = x / y
+        else:
+            if x == 0 and y <= 0:
+                return DIV0 if y < 0 else NUM
+            if x < 0 and y != int(y):
+                return NUM
+            result = x ** y
+    except _Failed as e:
+        return e.error
+    except OverflowError:
+        return NUM
+    return result if math.isfinite(result) else NUM
+
+
+def _scalar(value, context):
+    if isinstance(value, Area):
+        return value.intersect(context)
+    if isinstance(value, list):
+        return value[0][0]
+    return value
+
+
+def _to_number(value):
+    if isinstance(value, float):
+        return value
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, Error):
+        raise _Failed(value)
+    number = _parse_number(value)
+    if number is None:
+        raise _Failed(VALUE)
+    return number
+
+
+def _parse_number(text):
+    """Number for numeric text such as ' 12.5 ' or '40%', otherwise None"""
+    percent = text.rstrip().endswith('%')
+    if percent:
+        text = text.rstrip()[:-1]
+    if not _NUMBER_TEXT_RE.fullmatch(text):
+        return None
+    number = float(text)
+    return number / 100 if percent else number
+
+
+def _to_text(value):
+    if isinstance(value, Error):
+        raise _Failed(value)
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return number_text(value)
+
+
+def _to_bool(value):
+    if isinstance(value, Error):
+        raise _Failed(value)
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    if isinstance(value, float):
+        return value != 0
+    upper = value.strip().upper()
+    if upper in ('TRUE', 'FALSE'):
+        return upper == 'TRUE'
+    raise _Failed(VALUE)
+
+
+def number_text(number):
+    """A number as Excel turns it into text, with up to 15 significant digits"""
+    if number == int(number) and abs(number) < 1e15:
+        return str(int(number))
+    text = '%.15g' % number
+    if 'e' in text:
+        mantissa, exponent = text.split('e')
+        sign = '-' if exponent.startswith('-') else '+'
+        return f"{mantissa}E{sign}{abs(int(exponent)):02d}"
+    return text
+
+
+def _rank(value):
+    """Excel sorts numbers before text before logical values"""
+    if isinstance(value, bool):
+        return 2
+    if isinstance(value, str):
+        return 1
+    return 0
+
+
+def _compare(a, b):
+    """-1, 0 or 1; blanks compare as the other side's kind of empty value"""
+    if a is None:
+        a = _blank_like(b)
+    if b is None:
+        b = _blank_like(a)
+    rank_a, rank_b = _rank(a), _rank(b)
+    if rank_a != rank_b:
+        return -1 if rank_a < rank_b else 1
+    if rank_a == 1:
+        a, b = a.casefold(), b.casefold()
+    elif rank_a == 0 and abs(a - b) <= 1e-15 * max(abs(a), abs(b)):
+        return 0
+    return (a > b) - (a < b)
+
+
+def _blank_like(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, str):
+        return ''
+    return 0.0
+
+
+def _lookup_key(value):
+    if value is None or isinstance(value, Error):
+        return None
+    if isinstance(value, str):
+        return (1, value.casefold())
+    return (_rank(value), value)
+
+
+FUNCTIONS = {}
+
+
+def function(*names, lazy=False, arrays=False, args=(0, 255)):
+    """
+    Register an Excel function
+
+    Args:
+        lazy: Pass the parsed arguments instead of their values, for
+            functions that only evaluate some of them (IF, IFERROR)
+        arrays: Evaluate the arguments as in an array formula (SUMPRODUCT)
+        args: (fewest, most) arguments accepted; other counts give #VALUE!
+    """
+    def register(func):
+        for name in names:
+            FUNCTIONS[name] = (func, lazy, arrays, args)
+        return func
+    return register
+
+
+def _items(value):
+    """Values in a range or array, skipping empty cells"""
+    if isinstance(value, Area):
+        return value.values()
+    return (item for row in value for item in row if item is not None)
+
+
+def _numbers(args):
+    """
+    Numbers among function arguments as SUM sees them: text and logical
+    values inside ranges are skipped, while direct arguments are converted
+    """
+    for value in args:
+        if isinstance(value, (Area, list)):
+            for item in _items(value):
+                if isinstance(item, Error):
+                    raise _Failed(item)
+                if isinstance(item, float):
+                    yield item
+        elif value is not None:
+            yield _to_number(value)
+
+
+def _number_arg(args, index, context, default=None):
+    if index >= len(args) or (args[index] is None and default is not None):
+        if default is None:
+            raise _Failed(VALUE)
+        return default
+    return _to_number(_scalar(args[index], context))
+
+
+def _vector(value, context):
+    """
+    (values, cache key) of a single row or column used as a lookup range;
+    values is a function building the list, called only when needed
+    """
+    if isinstance(value, Area):
+        if value.height != 1 and value.width != 1:
+            raise _Failed(NA)
+        return lambda: [item for row in value.rows() for item in row], value.cache_key
+    if isinstance(value, list):
+        if len(value) != 1 and len(value[0]) != 1:
+            raise _Failed(NA)
+        return lambda: [item for row in value for item in row], None
+    return lambda: [value], None
+
+
+def _wildcard(pattern):
+    """Regex for Excel's * and ? wildcards, where ~ escapes the next character"""
+    parts = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == '~':
+            escaped = True
+        elif char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _find(lookup, values, cache_key, match_type, book):
+    """0-based position of lookup in values as MATCH finds it, or None"""
+    if match_type == 0:
+        if isinstance(lookup, str) and any(char in lookup for char in '*?~'):
+            pattern = _wildcard(lookup)
+            return next(
+                (position for position, item in enumerate(values())
+                 if isinstance(item, str) and not isinstance(item, Error)
+                 and pattern.fullmatch(item)),
+                None,
+            )
+        return book.lookup_index(cache_key, values).get(_lookup_key(lookup))
+    items = values()
+    if match_type < 0:
+        # Smallest value not less than lookup, in descending data
+        found = None
+        for position, item in enumerate(items):
+            if item is None or isinstance(item, Error) or _rank(item) != _rank(lookup):
+                continue
+            if _compare(item, lookup) < 0:
+                break
+            found = position
+        return found
+    # Binary search for the last value not greater than lookup, in
+    # ascending data; blanks and other kinds of value sort last
+    low, high = 0, len(items) - 1
+    found = None
+    while low <= high:
+        middle = (low + high) // 2
+        item = items[middle]
+        comparable = item is not None and not isinstance(item, Error)
+        if comparable and _compare(item, lookup) <= 0:
+            found = middle
+            low = middle + 1
+        else:
+            high = middle - 1
+    # Step back to a value of the same kind as lookup
+    while found is not None and (
+        items[found] is None or _rank(items[found]) != _rank(lookup)
+    ):
+        found = found - 1 if found else None
+    return found
+
+
+def _lookup_value(args, context):
+    lookup = _scalar(args[0], context)
+    if isinstance(lookup, Error):
+        raise _Failed(lookup)
+    return lookup
+
+
+@function('SUM', args=(1, 255))
+def _sum(args, context):
+    return sum(_numbers(args), 0.0)
+
+
+@function('AVERAGE', args=(1, 255))
+def _average(args, context):
+    numbers = list(_numbers(args))
+    if not numbers:
+        return DIV0
+    return sum(numbers) / len(numbers)
+
+
+@function('MIN', args=(1, 255))
+def _min(args, context):
+    return min(_numbers(args), default=0.0)
+
+
+@function('MAX', args=(1, 255))
+def _max(args, context):
+    return max(_numbers(args), default=0.0)
+
+
+@function('PRODUCT', args=(1, 255))
+def _product(args, context):
+    return math.prod(_numbers(args))
+
+
+@function('COUNT', args=(1, 255))
+def _count(args, context):
+    count = 0
+    for value in args:
+        if isinstance(value, (Area, list)):
+            count += sum(1 for item in _items(value) if isinstance(item, float))
+        elif isinstance(value, (float, bool)) or (
+            isinstance(value, str) and not isinstance(value, Error)
+            and _parse_number(value) is not None
+        ):
+            count += 1
+    return float(count)
+
+
+@function('COUNTA', args=(1, 255))
+def _counta(args, context):
+    count = 0
+    for value in args:
+        if isinstance(value, (Area, list)):
+            count += sum(1 for _ in _items(value))
+        elif value is not None:
+            count += 1
+    return float(count)
+
+
+@function('COUNTBLANK', args=(1, 1))
+def _countblank(args, context):
+    area = args[0]
+    if not isinstance(area, Area):
+        raise _Failed(VALUE)
+    filled = sum(1 for item in area.values() if item != '')
+    return float(area.height * area.width - filled)
+
+
+@function('SUMPRODUCT', arrays=True, args=(1, 255))
+def _sumproduct(args, context):
+    grids = []
+    for value in args:
+        value = _operand(value, context)
+        grids.append(value if isinstance(value, list) else [[value]])
+    height, width = len(grids[0]), len(grids[0][0])
+    if any(len(grid) != height or len(grid[0]) != width for grid in grids):
+        return VALUE
+    total = 0.0
+    for row in range(height):
+        for column in range(width):
+            product = 1.0
+            for grid in grids:
+                item = grid[row][column]
+                if isinstance(item, Error):
+                    raise _Failed(item)
+                product *= item if isinstance(item, float) else 0.0
+            total += product
+    return total
+
+
+def _round(args, context, rounding):
+    number = _number_arg(args, 0, context)
+    digits = int(_number_arg(args, 1, context, 0.0))
+    exponent = Decimal(1).scaleb(-digits)
+    # Round the shortest decimal form, so ROUND(2.675, 2) is 2.68 as in Excel
+    return float(Decimal(repr(number)).quantize(exponent, rounding=rounding))
+
+
+@function('ROUND', args=(2, 2))
+def _round_half_up(args, context):
+    return _round(args, context, ROUND_HALF_UP)
+
+
+@function('ROUNDUP', args=(2, 2))
+def _roundup(args, context):
+    return _round(args, context, ROUND_UP)
+
+
+@function('ROUNDDOWN', 'TRUNC', args=(1, 2))
+def _rounddown(args, context):
+    return _round(args, context, ROUND_DOWN)
+
+
+@function('INT', args=(1, 1))
+def _int(args, context):
+    return float(math.floor(_number_arg(args, 0, context)))
+
+
+@function('ABS', args=(1, 1))
+def _abs(args, context):
+    return abs(_number_arg(args, 0, context))
+
+
+@function('SIGN', args=(1, 1))
+def _sign(args, context):
+    number = _number_arg(args, 0, context)
+    return float((number > 0) - (number < 0))
+
+
+@function('MOD', args=(2, 2))
+def _mod(args, context):
+    number = _number_arg(args, 0, context)
+    divisor = _number_arg(args, 1, context)
+    if divisor == 0:
+        return DIV0
+    return number - divisor * math.floor(number / divisor)
+
+
+@function('POWER', args=(2, 2))
+def _power(args, context):
+    return _apply('^', _number_arg(args, 0, context), _number_arg(args, 1, context))
+
+
+@function('SQRT', args=(1, 1))
+def _sqrt(args, context):
+    number = _number_arg(args, 0, context)
+    return NUM if number < 0 else math.sqrt(number)
+
+
+@function('EXP', args=(1, 1))
+def _exp(args, context):
+    try:
+        return math.exp(_number_arg(args, 0, context))
+    except OverflowError:
+        return NUM
+
+
+@function('LN', args=(1, 1))
+def _ln(args, context):
+    number = _number_arg(args, 0, context)
+    return math.log(number) if number > 0 else NUM
+
+
+@function('LOG10', 'LOG', args=(1, 2))
+def _log(args, context):
+    number = _number_arg(args, 0, context)
+    base = _number_arg(args, 1, context, 10.0)
+    if number <= 0 or base <= 0:
+        return NUM
+    if base == 1:
+        return DIV0
+    return math.log10(number) if base == 10 else math.log(number, base)
+
+
+@function('PI', args=(0, 0))
+def _pi(args, context):
+    return math.pi
+
+
+@function('IF', lazy=True, args=(1, 3))
+def _if(args, context):
+    condition = _scalar(evaluate(args[0], context), context)
+    if _to_bool(condition):
+        return evaluate(args[1], context) if len(args) > 1 else True
+    return evaluate(args[2], context) if len(args) > 2 else False
+
+
+@function('IFERROR', lazy=True, args=(2, 2))
+def _iferror(args, context):
+    value = _scalar(evaluate(args[0], context), context)
+    return evaluate(args[1], context) if isinstance(value, Error) else value
+
+
+@function('IFNA', lazy=True, args=(2, 2))
+def _ifna(args, context):
+    value = _scalar(evaluate(args[0], context), context)
+    is_na = isinstance(value, Error) and value == NA
+    return evaluate(args[1], context) if is_na else value
+
+
+@function('CHOOSE', lazy=True, args=(2, 255))
+def _choose(args, context):
+    index = int(_to_number(_scalar(evaluate(args[0], context), context)))
+    if not 1 <= index < len(args):
+        return VALUE
+    return evaluate(args[index], context)
+
+
+def _logical(args):
+    values = []
+    for value in args:
+        if isinstance(value, (Area, list)):
+            for item in _items(value):
+                if isinstance(item, Error):
+                    raise _Failed(item)
+                if isinstance(item, (bool, float)):
+                    values.append(bool(item))
+        elif value is not None:
+            values.append(_to_bool(value))
+    if not values:
+        raise _Failed(VALUE)
+    return values
+
+
+@function('AND', args=(1, 255))
+def _and(args, context):
+    return all(_logical(args))
+
+
+@function('OR', args=(1, 255))
+def _or(args, context):
+    return any(_logical(args))
+
+
+@function('NOT', args=(1, 1))
+def _not(args, context):
+    return not _to_bool(_scalar(args[0], context))
+
+
+@function('TRUE', args=(0, 0))
+def _true(args, context):
+    return True
+
+
+@function('FALSE', args=(0, 0))
+def _false(args, context):
+    return False
+
+
+@function('NA', args=(0, 0))
+def _na(args, context):
+    return NA
+
+
+def _is(test):
+    return lambda args, context: test(_scalar(args[0], context))
+
+
+for _name, _test in {
+    'ISERROR': lambda value: isinstance(value, Error),
+    'ISERR': lambda value: isinstance(value, Error) and value != NA,
+    'ISNA': lambda value: value == NA and isinstance(value, Error),
+    'ISBLANK': lambda value: value is None,
+    'ISNUMBER': lambda value: isinstance(value, float),
+    'ISTEXT': lambda value: isinstance(value, str) and not isinstance(value, Error),
+    'ISLOGICAL': lambda value: isinstance(value, bool),
+}.items():
+    function(_name, args=(1, 1))(_is(_test))
+
+
+def _table_lookup(args, context, by_rows):
+    lookup = _lookup_value(args, context)
+    table = args[1]
+    if not isinstance(table, (Area, list)):
+        raise _Failed(VALUE)
+    index = int(_number_arg(args, 2, context))
+    approximate = _to_bool(_scalar(args[3], context)) if len(args) > 3 else True
+    if isinstance(table, Area):
+        height, width = table.height, table.width
+    else:
+        height, width = len(table), len(table[0])
+    size = width if by_rows else height
+    if index < 1:
+        raise _Failed(VALUE)
+    if index > size:
+        raise _Failed(REF)
+    if isinstance(table, Area):
+        keys = table.part(0, 0, height, 1) if by_rows else table.part(0, 0, 1, width)
+        values, cache_key = _vector(keys, context)
+    elif by_rows:
+        values, cache_key = (lambda: [row[0] for row in table]), None
+    else:
+        values, cache_key = (lambda: list(table[0])), None
+    position = _find(lookup, values, cache_key, 1 if approximate else 0, context.book)
+    if position is None:
+        return NA
+    row, column = (position, index - 1) if by_rows else (index - 1, position)
+    value = table.cell(row, column) if isinstance(table, Area) else table[row][column]
+    return 0.0 if value is None else value
+
+
+@function('VLOOKUP', args=(3, 4))
+def _vlookup(args, context):
+    return _table_lookup(args, context, by_rows=True)
+
+
+@function('HLOOKUP', args=(3, 4))
+def _hlookup(args, context):
+    return _table_lookup(args, context, by_rows=False)
+
+
+@function('MATCH', args=(2, 3))
+def _match(args, context):
+    lookup = _lookup_value(args, context)
+    values, cache_key = _vector(args[1], context)
+    match_type = _number_arg(args, 2, context, 1.0)
+    position = _find(lookup, values, cache_key, match_type, context.book)
+    return NA if position is None else float(position + 1)
+
+
+@function('INDEX', args=(2, 3))
+def _index(args, context):
+    table = args[0]
+    row = int(_number_arg(args, 1, context))
+    column = int(_number_arg(args, 2, context, 0.0))
+    if isinstance(table, Area):
+        height, width = table.height, table.width
+    elif isinstance(table, list):
+        height, width = len(table), len(table[0])
+    else:
+        height = width = 1
+        table = [[table]]
+    if len(args) == 2 and height == 1:
+        row, column = 1, row  # One index into a single row picks a column
+    if row < 0 or column < 0 or row > height or column > width:
+        raise _Failed(REF)
+    if row and not column and width == 1:
+        column = 1
+    if not isinstance(table, Area):
+        if not (row and column):
+            raise _Failed(VALUE)
+        return table[row - 1][column - 1]
+    if row and column:
+        return table.part(row - 1, column - 1, 1, 1)
+    if row:
+        return table.part(row - 1, 0, 1, width)
+    if column:
+        return table.part(0, column - 1, height, 1)
+    return table
+
+
+def _position(args, context, rows):
+    if not args:
+        return float(context.row if rows else context.column)
+    area = evaluate(args[0], context)
+    if not isinstance(area, Area):
+        raise _Failed(VALUE)
+    return float(area.top if rows else area.left)
+
+
+@function('ROW', lazy=True, args=(0, 1))
+def _row(args, context):
+    return _position(args, context, rows=True)
+
+
+@function('COLUMN', lazy=True, args=(0, 1))
+def _column(args, context):
+    return _position(args, context, rows=False)
+
+
+def _size(value, rows):
+    if isinstance(value, Area):
+        return float(value.height if rows else value.width)
+    if isinstance(value, list):
+        return float(len(value) if rows else len(value[0]))
+    return 1.0
+
+
+@function('ROWS', args=(1, 1))
+def _rows(args, context):
+    return _size(args[0], rows=True)
+
+
+@function('COLUMNS', args=(1, 1))
+def _columns(args, context):
+    return _size(args[0], rows=False)
+
+
+def _text_arg(args, index, context, default=None):
+    if index >= len(args):
+        if default is None:
+            raise _Failed(VALUE)
+        return default
+    return _to_text(_scalar(args[index], context))
+
+
+@function('CONCATENATE', args=(1, 255))
+def _concatenate(args, context):
+    return ''.join(_text_arg(args, index, context) for index in range(len(args)))
+
+
+@function('CONCAT', args=(1, 255))
+def _concat(args, context):
+    parts = []
+    for value in args:
+        if isinstance(value, (Area, list)):
+            parts.extend(_to_text(item) for item in _items(value))
+        else:
+            parts.append(_to_text(value))
+    return ''.join(parts)
+
+
+@function('LEN', args=(1, 1))
+def _len(args, context):
+    return float(len(_text_arg(args, 0, context)))
+
+
+@function('LEFT', args=(1, 2))
+def _left(args, context):
+    count = _number_arg(args, 1, context, 1.0)
+    if count < 0:
+        return VALUE
+    return _text_arg(args, 0, context)[:int(count)]
+
+
+@function('RIGHT', args=(1, 2))
+def _right(args, context):
+    count = _number_arg(args, 1, context, 1.0)
+    if count < 0:
+        return VALUE
+    text = _text_arg(args, 0, context)
+    return text[len(text) - int(count):] if count else ''
+
+
+@function('MID', args=(3, 3))
+def _mid(args, context):
+    start = int(_number_arg(args, 1, context))
+    count = int(_number_arg(args, 2, context))
+    if start < 1 or count < 0:
+        return VALUE
+    return _text_arg(args, 0, context)[start - 1:start - 1 + count]
+
+
+@function('UPPER', args=(1, 1))
+def _upper(args, context):
+    return _text_arg(args, 0, context).upper()
+
+
+@function('LOWER', args=(1, 1))
+def _lower(args, context):
+    return _text_arg(args, 0, context).lower()
+
+
+@function('TRIM', args=(1, 1))
+def _trim(args, context):
+    return ' '.join(part for part in _text_arg(args, 0, context).split(' ') if part)
+
+
+@function('VALUE', args=(1, 1))
+def _value(args, context):
+    value = _scalar(args[0], context)
+    if isinstance(value, str) and not isinstance(value, Error):
+        number = _parse_number(value)
+        return VALUE if number is None else number
+    return _to_number(value)
+
+
+def _criterion(criteria):
+    """Test for the criteria of SUMIF, COUNTIF and friends, such as '>=5'"""
+    if isinstance(criteria, Error):
+        raise _Failed(criteria)
+    if isinstance(criteria, bool):
+        return lambda value: value is criteria
+    if isinstance(criteria, float) or criteria is None:
+        number = criteria or 0.0
+        return lambda value: isinstance(value, float) and value == number
+    operators = ('<=', '>=', '<>', '<', '>', '=')
+    op = next((op for op in operators if criteria.startswith(op)), '')
+    operand = criteria[len(op):]
+    number = _parse_number(operand)
+    if op in ('', '=', '<>'):
+        if operand == '':
+            if op == '<>':
+                return lambda value: value is not None and value != ''
+            if op == '=':
+                return lambda value: value is None
+            return lambda value: value is None or value == ''
+        if number is not None:
+            def test(value):
+                return isinstance(value, float) and value == number
+        elif operand.upper() in ('TRUE', 'FALSE'):
+            flag = operand.upper() == 'TRUE'
+
+            def test(value):
+                return value is flag
+        else:
+            pattern = _wildcard(operand)
+
+            def test(value):
+                return (
+                    isinstance(value, str) and not isinstance(value, Error)
+                    and pattern.fullmatch(value) is not None
+                )
+        if op == '<>':
+            return lambda value: not test(value)
+        return test
+    check = _COMPARISONS[op]
+    if number is not None:
+        return lambda value: (
+            isinstance(value, float) and check(_compare(value, number))
+        )
+    return lambda value: (
+        isinstance(value, str) and not isinstance(value, Error)
+        and check(_compare(value, operand))
+    )
+
+
+def _conditional(ranges, criteria, target, context):
+    """
+    Values of target (a range the shape of the first criteria range) where
+    every criteria range meets its criteria
+
+    Returns:
+        (matching values, number of matching cells past the end of the
+        workbook's data, which are blank)
+    """
+    tests = [_criterion(_scalar(value, context)) for value in criteria]
+    areas = ranges + ([target] if target is not None else [])
+    if not all(isinstance(area, Area) for area in areas):
+        raise _Failed(VALUE)
+    first = areas[0]
+    if any(area.height != first.height or area.width != first.width for area in areas):
+        raise _Failed(VALUE)
+    grids = [area.rows() for area in areas]
+    height = len(grids[0])
+    width = len(grids[0][0]) if height else 0
+    found = []
+    for row in range(height):
+        for column in range(width):
+            if all(test(grid[row][column]) for test, grid in zip(tests, grids)):
+                found.append(grids[-1][row][column])
+    blanks = 0
+    if all(test(None) for test in tests):
+        blanks = first.height * first.width - height * width
+    return found, blanks
+
+
+def _numbers_in(values):
+    for value in values:
+        if isinstance(value, Error):
+            raise _Failed(value)
+        if isinstance(value, float):
+            yield value
+
+
+def _average_of(values):
+    numbers = list(_numbers_in(values))
+    return sum(numbers) / len(numbers) if numbers else DIV0
+
+
+@function('SUMIF', args=(2, 3))
+def _sumif(args, context):
+    target = args[2] if len(args) > 2 else args[0]
+    found, _ = _conditional([args[0]], [args[1]], target, context)
+    return sum(_numbers_in(found), 0.0)
+
+
+@function('SUMIFS', args=(3, 255))
+def _sumifs(args, context):
+    if len(args) % 2 == 0:
+        return VALUE
+    found, _ = _conditional(list(args[1::2]), list(args[2::2]), args[0], context)
+    return sum(_numbers_in(found), 0.0)
+
+
+@function('AVERAGEIF', args=(2, 3))
+def _averageif(args, context):
+    target = args[2] if len(args) > 2 else args[0]
+    found, _ = _conditional([args[0]], [args[1]], target, context)
+    return _average_of(found)
+
+
+@function('AVERAGEIFS', args=(3, 255))
+def _averageifs(args, context):
+    if len(args) % 2 == 0:
+        return VALUE
+    found, _ = _conditional(list(args[1::2]), list(args[2::2]), args[0], context)
+    return _average_of(found)
+
+
+@function('COUNTIF', args=(2, 2))
+def _countif(args, context):
+    found, blanks = _conditional([args[0]], [args[1]], None, context)
+    return float(len(found) + blanks)
+
+
+@function('COUNTIFS', args=(2, 254))
+def _countifs(args, context):
+    if len(args) % 2:
+        return VALUE
+    found, blanks = _conditional(list(args[0::2]), list(args[1::2]), None, context)
+    return float(len(found) + blanks)
+
+
+def _cell_value(element, strings):
+    """Cached value of a <c> element"""
+    cell_type = element.get('t', 'n')
+    if cell_type == 'inlineStr':
+        inline = element.find(INLINE_STRING_TAG)
+        return None if inline is None else string_text(inline)
+    text = element.findtext(VALUE_TAG)
+    if text is None:
+        return None
+    if cell_type == 'n':
+        return float(text) if text else None
+    if cell_type == 's':
+        return strings[int(text)]
+    if cell_type == 'b':
+        return text == '1'
+    if cell_type == 'e':
+        return Error(text)
+    return text  # 'str' formula results and ISO 8601 'd' dates
+
+
+def load_workbook(zf):
+    """
+    Read every worksheet's values and formulas from an open .xlsx archive
+
+    Returns:
+        (Workbook, list of (sheet name, part path))
+    """
+    sheets, shared_strings_path, names = read_workbook_parts(zf)
+    strings = []
+    if shared_strings_path is not None:
+        with zf.open(shared_strings_path) as f:
+            for _, element in ET.iterparse(f):
+                if element.tag == SI_TAG:
+                    strings.append(string_text(element))
+                    element.clear()
+    book = Workbook(names)
+    for sheet_name, path in sheets:
+        _load_sheet(book, zf, path, book.add_sheet(sheet_name), strings)
+    book.build_index()
+    return book, sheets
+
+
+def _load_sheet(book, zf, path, key, strings):
+    row_number = 0
+    column_number = 0
+    sheet_data = None
+    shared_formulas = {}
+    with zf.open(path) as f:
+        for event, element in ET.iterparse(f, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == ROW_TAG:
+                    row = element.get('r')
+                    row_number = int(row) if row else row_number + 1
+                    column_number = 0
+                elif tag == SHEET_DATA_TAG:
+                    sheet_data = element
+                continue
+            if tag == CELL_TAG:
+                reference = element.get('r')
+                if reference:
+                    column_number = _column_number(reference)
+                else:
+                    column_number += 1
+                cell = (key, row_number, column_number)
+                book.cells[cell] = _cell_value(element, strings)
+                formula = element.find(FORMULA_TAG)
+                if formula is not None:
+                    _add_formula(book, cell, formula, shared_formulas)
+            elif tag == ROW_TAG and sheet_data is not None:
+                sheet_data.clear()
+
+
+def _column_number(reference):
+    number = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        number = number * 26 + ord(char.upper()) - 64
+    return number
+
+
+def _add_formula(book, cell, formula, shared_formulas):
+    formula_type = formula.get('t', 'normal')
+    text = formula.text
+    if formula_type == 'shared':
+        index = formula.get('si')
+        if text:
+            shared_formulas[index] = (cell[1], cell[2], text)
+        elif index in shared_formulas:
+            row, column, text = shared_formulas[index]
+            text = translate(text, cell[1] - row, cell[2] - column)
+    if not text or formula_type == 'dataTable':
+        return
+    bounds = None
+    if formula_type == 'array' and formula.get('ref'):
+        ref = parse_reference(formula.get('ref'), book.sheet_names[cell[0]])
+        if ref is not None:
+            bounds = tuple(ref[1:])
+    book.add_formula(Formula(cell, text, bounds))
+
+
+def calculate(book):
+    """
+    Evaluate every formula after the formulas it reads
+
+    The order comes from a depth-first walk of each formula's precedents,
+    kept on an explicit stack so long chains of formulas do not hit
+    Python's recursion limit. Formulas that read themselves through a cycle
+    get #VALUE!.
+
+    Returns:
+        (keys of formulas that could not be evaluated with the unsupported
+        function names found, keys of formulas in cycles)
+    """
+    unsupported = []
+    function_names = set()
+    circular = set()
+    done = set()
+    depth = {}  # Formulas on the stack -> their position in it
+    for start in book.formulas:
+        if start in done:
+            continue
+        depth[start] = 0
+        stack = [(start, book.precedents(start))]
+        while stack:
+            key, precedents = stack[-1]
+            for precedent in precedents:
+                if precedent in done:
+                    continue
+                if precedent in depth:
+                    circular.update(entry for entry, _ in stack[depth[precedent]:])
+                    continue
+                depth[precedent] = len(stack)
+                stack.append((precedent, book.precedents(precedent)))
+                break
+            else:
+                stack.pop()
+                del depth[key]
+                done.add(key)
+                if key in circular:
+                    _store(book, book.formulas[key], VALUE)
+                    continue
+                try:
+                    _store(book, book.formulas[key], _calculate_formula(book, key))
+                except (Unsupported, RecursionError) as e:
+                    unsupported.append(key)
+                    if isinstance(e, Unsupported) and e.name:
+                        function_names.add(e.name)
+                    _store(book, book.formulas[key], UNKNOWN)
+    return (unsupported, sorted(function_names)), sorted(circular)
+
+
+def _calculate_formula(book, key):
+    sheet, row, column = key
+    formula = book.formulas[key]
+    context = _Context(book, sheet, row, column, array=formula.bounds is not None)
+    return evaluate(book.compile(formula.text, context.sheet), context)
+
+
+def _store(book, formula, value):
+    """Save a formula's result in the cells it fills"""
+    sheet, row, column = formula.key
+    if formula.bounds is None:
+        if value is not UNKNOWN:
+            context = _Context(book, sheet, row, column)
+            value = _scalar(value, context)
+        book.cells[formula.key] = 0.0 if value is None else value
+        return
+    if isinstance(value, Area):
+        value = value.rows()
+    top, left, bottom, right = formula.bounds
+    for r in range(top, bottom + 1):
+        for c in range(left, right + 1):
+            item = value
+            if isinstance(value, list):
+                item = _grid_item(value, r - top, c - left)
+            book.cells[sheet, r, c] = 0.0 if item is None else item
+
+
+def _set_value(element, value):
+    """Replace a <c> element's cached value"""
+    for child in element.findall(VALUE_TAG) + element.findall(INLINE_STRING_TAG):
+        element.remove(child)
+    cached = etree.Element(VALUE_TAG)
+    if isinstance(value, Error):
+        element.set('t', 'e')
+        cached.text = str(value)
+    elif isinstance(value, str):
+        element.set('t', 'str')
+        cached.text = value
+    elif isinstance(value, bool):
+        element.set('t', 'b')
+        cached.text = '1' if value else '0'
+    else:
+        element.attrib.pop('t', None)
+        text = repr(value)
+        cached.text = text[:-2] if text.endswith('.0') else text
+    formula = element.find(FORMULA_TAG)
+    if formula is not None:
+        formula.addnext(cached)
+    else:
+        element.insert(0, cached)
+
+
+def _write_sheet(xml, book, key):
+    """Sheet XML with the computed values stored in its formula cells"""
+    # lxml keeps the namespace prefixes that mc:Ignorable and Excel rely on
+    root = etree.fromstring(xml, etree.XMLParser(huge_tree=True))
+    sheet_data = root.find(SHEET_DATA_TAG)
+    row_number = 0
+    for row in sheet_data.iter(ROW_TAG):
+        row_number = int(row.get('r')) if row.get('r') else row_number + 1
+        column_number = 0
+        for element in row.iter(CELL_TAG):
+            reference = element.get('r')
+            if reference:
+                column_number = _column_number(reference)
+            else:
+                column_number += 1
+            cell = (key, row_number, column_number)
+            if cell in book.owners:
+                value = book.cells[cell]
+                if value is not UNKNOWN:
+                    _set_value(element, value)
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _locations(book, keys):
+    return [
+        f"{book.sheet_names[sheet]}!{cell_name(row, column)}"
+        for sheet, row, column in keys[:MAX_LOCATIONS]
+    ]
+
+
+def evaluate_workbook(filename):
+    """
+    Recalculate an .xlsx file's formulas in place
+
+    Cells computed by array formulas must already exist in the sheet XML,
+    as Excel and LibreOffice write them; openpyxl-written workbooks only
+    get the first cell of an array formula.
+
+    Returns:
+        dict with the number of formulas, and the formulas that were not
+        evaluated (using functions listed in 'functions' or syntax this
+        module does not support) or that are in reference cycles
+    """
+    with zipfile.ZipFile(filename) as zf:
+        book, sheets = load_workbook(zf)
+        (unsupported, function_names), circular = calculate(book)
+        fd, path = tempfile.mkstemp(
+            suffix='.xlsx', dir=os.path.dirname(os.path.abspath(filename))
+        )
+        os.close(fd)
+        try:
+            sheet_keys = {path: name.upper() for name, path in sheets}
+            with zipfile.ZipFile(path, 'w') as out:
+                for info in zf.infolist():
+                    key = sheet_keys.get(info.filename)
+                    if key is not None:
+                        out.writestr(info, _write_sheet(zf.read(info), book, key))
+                    else:
+                        with zf.open(info) as src, out.open(info, 'w') as dst:
+                            shutil.copyfileobj(src, dst)
+        except BaseException:
+            os.unlink(path)
+            raise
+    shutil.copymode(filename, path)  # mkstemp creates the file private
+    os.replace(path, filename)
+    return {
+        'formulas': len(book.formulas),
+        'not_evaluated': {
+            'count': len(unsupported),
+            'locations': _locations(book, unsupported),
+            'functions': function_names,
+        },
+        'circular': {'count': len(circular), 'locations': _locations(book, circular)},
+    }
@@ -0,0 +1,307 @@
+import os
+import subprocess
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.workbook.defined_name import DefinedName
+
+from evaluator import evaluate_workbook, number_text
+from recalc import recalc
+from recalc_test import write_xlsx
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestEvaluateWorkbook(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def evaluate(self, formulas):
+        """Evaluate formulas on a sheet next to a small data table."""
+        wb = Workbook()
+        data = wb.active
+        data.title = "Data"
+        rows = [
+            ("Key", "Price", "Qty"),
+            ("apple", 1.5, 10),
+            ("Banana", 0.25, 0),
+            ("cherry", 4, 3),
+            ("date", "n/a", 7),
+        ]
+        for row in rows:
+            data.append(row)
+        model = wb.create_sheet("My Model")
+        for coordinate, formula in formulas.items():
+            model[coordinate] = formula
+        wb.defined_names["Rate"] = DefinedName("Rate", attr_text="Data!$B$2")
+        path = self.dir / "model.xlsx"
+        wb.save(path)
+        stats = evaluate_workbook(path)
+        values = load_workbook(path, data_only=True)["My Model"]
+        return {coordinate: values[coordinate].value for coordinate in formulas}, stats
+
+    def test_functions(self):
+        cases = {
+            "=1+2*3-4/2": 5,
+            "=-2^2": 4,
+            "=2^3^2": 64,
+            "=10%*3": 0.3,
+            '="a"&1/4&TRUE': "a0.25TRUE",
+            "=0.1+0.2=0.3": True,
+            '="B"<"a"': False,
+            '=1<"1"': True,
+            "=1/0": "#DIV/0!",
+            '=1+"2"': 3,
+            '=1+"x"': "#VALUE!",
+            "=SUM(Data!B2:C5)": 25.75,
+            "=SUM(Data!B:B,1,TRUE)": 7.75,
+            "=AVERAGE(Data!B2:B5)": 1.9166666666666667,
+            "=MIN(Data!C:C)+MAX(Data!C:C)": 10,
+            "=COUNT(Data!A1:C5)+COUNTA(Data!A1:C5)": 7 + 15,
+            "=COUNTBLANK(Data!D1:D4)": 4,
+            "=PRODUCT(Data!B2,Data!C2)": 15,
+            "=SUMPRODUCT(Data!B2:B5,Data!C2:C5)": 27,
+            "=SUMPRODUCT((Data!C2:C5>2)*1)": 3,
+            "=ROUND(2.675,2)+ROUNDUP(-1.21,1)+ROUNDDOWN(1.29,1)": 2.68 - 1.3 + 1.2,
+            "=ROUND(1234,-2)": 1200,
+            "=INT(-1.5)+MOD(-3,2)+ABS(-2)+SIGN(-4)": -2 + 1 + 2 - 1,
+            "=SQRT(16)+POWER(2,10)+LOG10(1000)+LN(1)": 4 + 1024 + 3,
+            "=SQRT(-1)": "#NUM!",
+            '=IF(Data!C3,"yes","no")': "no",
+            "=IF(FALSE,1/0)": False,
+            "=IF(Data!C3,,)": 0,
+            "=IFERROR(1/0,-1)": -1,
+            "=IFNA(NA(),2)+ISNA(NA())": 3,
+            "=ISERROR(Data!B5*1)": True,
+            "=ISBLANK(Data!A9)": True,
+            "=ISTEXT(Data!B5)": True,
+            "=AND(Data!C2:C4)": False,
+            "=OR(Data!C2:C4,FALSE)": True,
+            "=NOT(0)": True,
+            "=CHOOSE(2,1/0,7)": 7,
+            '=VLOOKUP("CHERRY",Data!A2:C5,3,FALSE)': 3,
+            '=VLOOKUP("fig",Data!A2:C5,3,FALSE)': "#N/A",
+            '=VLOOKUP("c*",Data!A2:C5,2,FALSE)': 4,
+            "=VLOOKUP(5,Data!C2:C5,1,FALSE)": "#N/A",
+            '=VLOOKUP("apple",Data!A2:C5,4,FALSE)': "#REF!",
+            '=HLOOKUP("Qty",Data!A1:C5,3,FALSE)': 0,
+            '=MATCH("date",Data!A:A,0)': 5,
+            "=MATCH(2,{1,2,3,5})+MATCH(4,{1,2,3,5},1)": 5,
+            "=MATCH(4,{9,7,4,1},-1)": 3,
+            "=VLOOKUP(3.5,{1,\"a\";3,\"b\";5,\"c\"},2)": "b",
+            "=INDEX(Data!A1:C5,3,1)": "Banana",
+            "=INDEX(Data!A2:A5,2)&INDEX({1,2,3},3)": "Banana3",
+            "=SUM(INDEX(Data!A1:C5,0,3))": 20,
+            "=INDEX(Data!A1:C5,9,1)": "#REF!",
+            '=INDEX(Data!C2:C5,MATCH("date",Data!A2:A5,0))': 7,
+            '=SUMIF(Data!C2:C5,">2",Data!B2:B5)': 5.5,
+            '=SUMIF(Data!A2:A5,"<>banana",Data!C2:C5)': 20,
+            '=COUNTIF(Data!A2:A5,"?a*")': 2,
+            '=COUNTIF(Data!B2:B5,"<1")': 1,
+            '=SUMIFS(Data!C2:C5,Data!B2:B5,">1",Data!A2:A5,"c*")': 3,
+            '=COUNTIFS(Data!C2:C5,">=3",Data!C2:C5,"<10")': 2,
+            '=AVERAGEIF(Data!C2:C5,">0")': 20 / 3,
+            "=COLUMN()+ROW(Data!C7)+ROWS(Data!A:A)+COLUMNS(Data!A1:C1)": 2**20 + 11,
+            '=CONCATENATE("x",1/3)': "x0.333333333333333",
+            '=LEFT("hello",2)&MID("hello",2,3)&RIGHT("hello")&LEN("hé")': "heello2",
+            '=UPPER("a")&LOWER("B")&TRIM("  a   b ")&VALUE("1e3")': "Aba b1000",
+            "=Rate*2": 3,
+            "=Missing+1": "#NAME?",
+            "=SUM(Data!A2:A3:Data!C4)": 18.75,
+        }
+        formulas = {f"A{row}": formula for row, formula in enumerate(cases, start=1)}
+        values, stats = self.evaluate(formulas)
+        self.assertEqual(stats["not_evaluated"]["count"], 0, stats)
+        for (coordinate, formula), expected in zip(formulas.items(), cases.values()):
+            with self.subTest(formula=formula):
+                if isinstance(expected, float):
+                    self.assertAlmostEqual(values[coordinate], expected, places=12)
+                else:
+                    self.assertEqual(values[coordinate], expected)
+
+    def test_dependency_order_cycles_and_unsupported(self):
+        values, stats = self.evaluate(
+            {
+                "A1": "=A2*2",  # Evaluated after the cells it reads
+                "A2": "=SUM(B1:B3)",
+                "B1": "=1",
+                "B3": "=B1+1",
+                "C1": "=C2",
+                "C2": "=C1+A1",
+                "C3": "=C2",
+                "D1": "=INDIRECT(\"A1\")",
+                "D2": "=D1+1",
+                "D3": '=IF(TRUE,1,INDIRECT("A1"))',
+            }
+        )
+        self.assertEqual(values["A1"], 6)
+        self.assertEqual(values["C1"], "#VALUE!")
+        self.assertEqual(values["C3"], "#VALUE!")
+        self.assertIsNone(values["D1"])
+        self.assertIsNone(values["D2"])
+        self.assertEqual(values["D3"], 1)
+        self.assertEqual(
+            stats["circular"],
+            {"count": 2, "locations": ["My Model!C1", "My Model!C2"]},
+        )
+        self.assertEqual(
+            stats["not_evaluated"],
+            {
+                "count": 2,
+                "locations": ["My Model!D1", "My Model!D2"],
+                "functions": ["INDIRECT"],
+            },
+        )
+
+    def test_shared_and_array_formulas(self):
+        path = self.dir / "raw.xlsx"
+        write_xlsx(
+            path,
+            [
+                (
+                    "S",
+                    '<row r="1"><c r="A1"><v>2</v></c>'
+                    '<c r="B1"><f t="shared" ref="B1:B3" si="0">A1*10</f><v>0</v></c>'
+                    '<c r="C1" t="s"><f t="array" ref="C1:C3">A1:A3&amp;"!"</f>'
+                    "<v>0</v></c></row>"
+                    '<row r="2"><c r="A2"><v>3</v></c><c r="B2"><f t="shared" si="0"/>'
+                    '</c><c r="C2" t="s"><v>0</v></c></row>'
+                    '<row r="3"><c r="A3" t="s"><v>1</v></c><c r="B3"><f t="shared"'
+                    ' si="0"/></c><c r="C3"/></row>',
+                )
+            ],
+            shared_strings=["<si><t>stale</t></si>", "<si><t>x</t></si>"],
+        )
+        evaluate_workbook(path)
+        values = load_workbook(path, data_only=True)["S"]
+        column_b = [values[f"B{row}"].value for row in (1, 2, 3)]
+        self.assertEqual(column_b, [20, 30, "#VALUE!"])
+        column_c = [values[f"C{row}"].value for row in (1, 2, 3)]
+        self.assertEqual(column_c, ["2!", "3!", "x!"])
+
+    def test_keeps_formulas_and_namespace_prefixes(self):
+        path = self.dir / "prefixes.xlsx"
+        wb = Workbook()
+        wb.active["A1"] = 2
+        wb.active["A2"] = "=A1*3"
+        wb.save(path)
+        with zipfile.ZipFile(path) as zf:
+            parts = {name: zf.read(name) for name in zf.namelist()}
+        sheet = "xl/worksheets/sheet1.xml"
+        parts[sheet] = parts[sheet].replace(
+            b"<worksheet ",
+            b'<worksheet xmlns:mc="http://schemas.openxmlformats.org/'
+            b'markup-compatibility/2006" xmlns:x14ac="http://schemas.microsoft.com/'
+            b'office/spreadsheetml/2009/9/ac" mc:Ignorable="x14ac" ',
+            1,
+        )
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in parts.items():
+                zf.writestr(name, data)
+
+        evaluate_workbook(path)
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(sorted(zf.namelist()), sorted(parts))
+            xml = zf.read(sheet)
+        self.assertIn(b'xmlns:x14ac="', xml)
+        self.assertIn(b'mc:Ignorable="x14ac"', xml)
+        self.assertIn(b"<f>A1*3</f><v>6</v>", xml)
+        self.assertEqual(load_workbook(path)["Sheet"]["A2"].value, "=A1*3")
+
+    def test_keeps_file_mode(self):
+        path = self.dir / "shared.xlsx"
+        wb = Workbook()
+        wb.active["A1"] = "=1+1"
+        wb.save(path)
+        os.chmod(path, 0o644)
+        evaluate_workbook(path)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+        self.assertEqual(load_workbook(path, data_only=True)["Sheet"]["A1"].value, 2)
+
+    def test_number_text(self):
+        self.assertEqual(number_text(3.0), "3")
+        self.assertEqual(number_text(0.1 + 0.2), "0.3")
+        self.assertEqual(number_text(1e20), "1E+20")
+        self.assertEqual(number_text(-1.5e-7), "-1.5E-07")
+
+    def test_recalc_falls_back_without_libreoffice(self):
+        path = self.dir / "fallback.xlsx"
+        wb = Workbook()
+        wb.active["A1"] = 0
+        wb.active["A2"] = "=1/A1"
+        wb.active["A3"] = "=A2+1"
+        wb.save(path)
+        with mock.patch.dict(os.environ, {"PATH": str(self.dir)}):
+            result = recalc(str(path))
+        self.assertEqual(result["engine"], "python")
+        self.assertEqual(result["total_errors"], 2)
+        self.assertEqual(result["root_causes"]["cells"][0]["location"], "Sheet!A2")
+        self.assertEqual(result["newly_computed_formulas"], 2)
+
+    def test_recalc_restores_file_killed_while_saving(self):
+        path = self.dir / "killed.xlsx"
+        wb = Workbook()
+        wb.active["A1"] = 0
+        wb.active["A2"] = "=1/A1"
+        wb.save(path)
+
+        def killed_while_saving(cmd, timeout):
+            with open(path, "r+b") as f:
+                f.truncate(100)
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        with mock.patch("shutil.which", return_value="soffice"), mock.patch(
+            "recalc.setup_libreoffice_macro", return_value=True
+        ), mock.patch("recalc.run_with_timeout", killed_while_saving):
+            result = recalc(str(path))
+        self.assertEqual(result["engine"], "python")
+        self.assertEqual(result["total_errors"], 1)
+        self.assertEqual(load_workbook(path)["Sheet"]["A2"].value, "=1/A1")
+
+    def test_benchmark(self):
+        """Print timings for 10,000 lookup, arithmetic and running total formulas."""
+        rows = 2000
+        wb = Workbook()
+        inputs = wb.active
+        inputs.title = "Inputs"
+        for row in range(1, rows + 1):
+            inputs.append([f"k{row}", row * 1.5])
+        model = wb.create_sheet("Model")
+        for row in range(1, rows + 1):
+            table = f"Inputs!$A$1:$B${rows}"
+            prices = f"Inputs!$B$1:$B${rows}"
+            model.append(
+                [
+                    f'=VLOOKUP("k{row}",{table},2,FALSE)',
+                    f"=A{row}*1.1",
+                    f"=IF(B{row}>100,B{row}-100,0)",
+                    f"=C{row}+D{row - 1}" if row > 1 else "=C1",
+                    f"=INDEX({prices},MATCH(A{row},{prices},0))",
+                ]
+            )
+        path = self.dir / "benchmark.xlsx"
+        wb.save(path)
+
+        start = time.perf_counter()
+        stats = evaluate_workbook(path)
+        elapsed = time.perf_counter() - start
+        print(f"\n{stats['formulas']} formulas: {elapsed * 1000:.0f} ms")
+        values = load_workbook(path, data_only=True)["Model"]
+        self.assertAlmostEqual(values[f"E{rows}"].value, rows * 1.5)
+        self.assertAlmostEqual(
+            values[f"D{rows}"].value,
+            sum(max(row * 1.5 * 1.1 - 100, 0) for row in range(1, rows + 1)),
+            places=6,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
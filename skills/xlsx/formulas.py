@@ -0,0 +1,398 @@
+"""
+Excel Formula References
+Tokenizes formulas as stored in .xlsx files, resolves the cells and ranges
+they refer to, and traces error values back to the cells they start from
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+MAX_ROW = 1048576
+MAX_COLUMN = 16384
+
+# A rectangle of cells on one sheet, 1-based and inclusive
+Reference = namedtuple('Reference', 'sheet first_row first_column last_row last_column')
+Token = namedtuple('Token', 'kind text')
+
+_SHEET = r"(?:'(?:[^']|'')+'|(?:[^\W\d]|\\)[\w.]*)"
+_COLUMN = r'\$?[A-Za-z]{1,3}'
+_ROW = r'\$?[0-9]{1,7}'
+_TOKEN_RE = re.compile(
+    rf"""
+      (?P<string>"(?:[^"]|"")*")
+    | (?P<error>\#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A|GETTING_DATA))
+    | (?P<ref>
+          (?:\[[0-9]+\])?
+          (?:{_SHEET}(?::{_SHEET})?!)?
+          (?:{_COLUMN}{_ROW}(?::{_COLUMN}{_ROW})?|{_COLUMN}:{_COLUMN}|{_ROW}:{_ROW})
+          (?![\w.(!])
+      )
+    | (?P<function>(?:[^\W\d]|_)[\w.]*(?=\())
+    | (?P<number>(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)
+    | (?P<name>(?:{_SHEET}!)?(?:[^\W\d]|[_\\])[\w.?\\]*)
+    | (?P<operator><>|<=|>=|[-+*/^&=<>%:])
+    | (?P<open>\()
+    | (?P<close>\))
+    | (?P<separator>[,;])
+    | (?P<array_open>\{{)
+    | (?P<array_close>\}})
+    | (?P<space>\s+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE,
+)
+_REF_PART_RE = re.compile(r'(\$?)([A-Za-z]{1,3})?(\$?)([0-9]{1,7})?')
+
+
+def column_index(letters):
+    """1-based column number of column letters ('A' is 1, 'AA' is 27)"""
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + ord(char) - 64
+    return number
+
+
+def column_letters(index):
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def cell_name(row, column):
+    return f"{column_letters(column)}{row}"
+
+
+def split_cell(name):
+    """(row, column) of a cell name such as 'B7' or '$B$7'"""
+    match = _REF_PART_RE.fullmatch(name)
+    return int(match.group(4)), column_index(match.group(2))
+
+
+def tokenize(formula):
+    """
+    Split formula text (without the leading '=') into tokens
+
+    Token kinds are the group names of _TOKEN_RE. References that are out of
+    Excel's grid (such as names that look like cells) are returned as names.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(formula):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'ref' and _parse_area(_split_sheet(text)[1]) is None:
+            kind = 'name'
+        tokens.append(Token(kind, text))
+    return tokens
+
+
+def _split_sheet(text):
+    """(sheet prefix without '!' or None, area) of reference text"""
+    if '!' not in text:
+        return None, text
+    prefix, area = text.rsplit('!', 1)
+    return prefix, area
+
+
+def _unquote_sheet(prefix):
+    if prefix.startswith("'"):
+        return prefix[1:-1].replace("''", "'")
+    return prefix
+
+
+def _parse_area(area):
+    """(first_row, first_column, last_row, last_column) of an A1-style area"""
+    corners = []
+    for part in area.split(':'):
+        match = _REF_PART_RE.fullmatch(part)
+        if match is None or not (match.group(2) or match.group(4)):
+            return None
+        corners.append(match)
+    if len(corners) == 1 and not (corners[0].group(2) and corners[0].group(4)):
+        return None
+    rows = [int(m.group(4)) if m.group(4) else None for m in corners]
+    columns = [column_index(m.group(2)) if m.group(2) else None for m in corners]
+    if None in rows and None in columns:
+        return None
+    if None in rows:
+        if any(rows):
+            return None
+        rows = [1, MAX_ROW]
+    if None in columns:
+        if any(columns):
+            return None
+        columns = [1, MAX_COLUMN]
+    if max(rows) > MAX_ROW or max(columns) > MAX_COLUMN or min(rows) < 1:
+        return None
+    return min(rows), min(columns), max(rows), max(columns)
+
+
+def parse_reference(text, sheet):
+    """
+    Reference for reference text, or None for external and 3D references
+
+    Args:
+        text: Reference such as 'B7', '$A$1:$C$9', "'My Sheet'!A:A"
+        sheet: Sheet the formula is on, used when text has no sheet prefix
+    """
+    if text.startswith('['):
+        return None  # Another workbook
+    prefix, area = _split_sheet(text)
+    if prefix is not None:
+        if re.fullmatch(rf'{_SHEET}:{_SHEET}', prefix):
+            return None  # Spans several sheets
+        sheet = _unquote_sheet(prefix)
+    bounds = _parse_area(area)
+    if bounds is None:
+        return None
+    return Reference(sheet, *bounds)
+
+
+def references(formula, sheet, names=None, _seen=()):
+    """
+    Cells and ranges a formula reads, following defined names
+
+    Args:
+        formula: Formula text, with or without the leading '='
+        sheet: Name of the sheet the formula is on
+        names: dict mapping upper-cased defined names to their formula text
+
+    Returns:
+        list of Reference; references computed at run time (INDIRECT,
+        OFFSET) and to other workbooks are not included
+    """
+    found = []
+    for kind, text in tokenize(formula.lstrip('=')):
+        if kind == 'ref':
+            reference = parse_reference(text, sheet)
+            if reference is not None:
+                found.append(reference)
+        elif kind == 'name' and names:
+            key = _split_sheet(text)[1].upper()
+            if key in names and key not in _seen:
+                found.extend(references(names[key], sheet, names, _seen + (key,)))
+    return found
+
+
+def translate(formula, row_offset, column_offset):
+    """
+    Move a formula's relative references, as Excel does when filling or for
+    the cells of a shared formula; references pushed off the grid become #REF!
+    """
+    parts = []
+    for kind, text in tokenize(formula):
+        if kind == 'ref' and not text.startswith('['):
+            prefix, area = _split_sheet(text)
+            shifted = [
+                _shift(part, row_offset, column_offset) for part in area.split(':')
+            ]
+            if None in shifted:
+                text = '#REF!'
+            else:
+                text = ('' if prefix is None else prefix + '!') + ':'.join(shifted)
+        parts.append(text)
+    return ''.join(parts)
+
+
+def _shift(part, row_offset, column_offset):
+    match = _REF_PART_RE.fullmatch(part)
+    column_absolute, letters, row_absolute, digits = match.groups()
+    text = ''
+    if letters:
+        column = column_index(letters) + (0 if column_absolute else column_offset)
+        if not 1 <= column <= MAX_COLUMN:
+            return None
+        text += column_absolute + column_letters(column)
+    if digits:
+        row = int(digits) + (0 if row_absolute else row_offset)
+        if not 1 <= row <= MAX_ROW:
+            return None
+        text += row_absolute + str(row)
+    return text
+
+
+def find_root_causes(error_cells, names=None):
+    """
+    Collapse cascaded errors into the cells they start from
+
+    An error cell is a root cause when none of the cells it reads holds an
+    error; errors feeding each other in a cycle that no such cell leads to are
+    reported once per cycle, by their first cell. Dependents are indexed from
+    each error cell to the error formulas that read it.
+
+    Counting the cells each root affects does not walk the shared downstream
+    cells once per root: cycles are condensed into single nodes, and the
+    cells every node reaches are kept as ranges of a depth-first numbering,
+    merged from the last dependents up. A chain or tree of dependents is a
+    single range however many roots feed it.
+
+    Args:
+        error_cells: list of (sheet, row, column, error, formula) for every
+            cell with an error; formula is None for values
+        names: dict mapping upper-cased defined names to their formula text
+
+    Returns:
+        list of (index into error_cells, number of error cells that depend on
+        it), with the roots affecting the most cells first
+    """
+    # Error cells by sheet, then column, as sorted rows for range lookups
+    index = {}
+    ids = {}
+    for idx, (sheet, row, column, _, _) in enumerate(error_cells):
+        key = sheet.upper()
+        index.setdefault(key, {}).setdefault(column, []).append(row)
+        ids[key, row, column] = idx
+    columns_by_sheet = {}
+    for key, columns in index.items():
+        for rows in columns.values():
+            rows.sort()
+        columns_by_sheet[key] = sorted(columns)
+
+    dependents = [[] for _ in error_cells]
+    for idx, (sheet, _, _, _, formula) in enumerate(error_cells):
+        if formula is None:
+            continue
+        for ref in references(formula, sheet, names):
+            key = ref.sheet.upper()
+            columns = index.get(key)
+            if columns is None:
+                continue
+            keys = columns_by_sheet[key]
+            start = bisect_left(keys, ref.first_column)
+            stop = bisect_right(keys, ref.last_column)
+            for column in keys[start:stop]:
+                rows = columns[column]
+                start = bisect_left(rows, ref.first_row)
+                stop = bisect_right(rows, ref.last_row)
+                for row in rows[start:stop]:
+                    precedent = ids[key, row, column]
+                    if precedent != idx:
+                        dependents[precedent].append(idx)
+
+    components, component_of = _strongly_connected(dependents)
+    # Edges between components, without duplicates
+    children = []
+    parent_count = [0] * len(components)
+    last_parent = [-1] * len(components)
+    for component, members in enumerate(components):
+        targets = []
+        for member in members:
+            for dependent in dependents[member]:
+                target = component_of[dependent]
+                if target != component and last_parent[target] != component:
+                    last_parent[target] = component
+                    parent_count[target] += 1
+                    targets.append(target)
+        children.append(targets)
+    sources = [c for c in reversed(range(len(components))) if not parent_count[c]]
+
+    # Number components depth-first from the sources; every component reaches
+    # the range of numbers given out while it was on the stack
+    first = [-1] * len(components)
+    last = [-1] * len(components)
+    sizes = []  # Cells per component, by number
+    for source in sources:
+        first[source] = len(sizes)
+        sizes.append(len(components[source]))
+        stack = [(source, 0)]
+        while stack:
+            component, position = stack[-1]
+            if position < len(children[component]):
+                stack[-1] = (component, position + 1)
+                child = children[component][position]
+                if first[child] == -1:
+                    first[child] = len(sizes)
+                    sizes.append(len(components[child]))
+                    stack.append((child, 0))
+            else:
+                stack.pop()
+                last[component] = len(sizes) - 1
+    totals = list(accumulate(sizes, initial=0))
+
+    # Components come out of _strongly_connected after all they reach, so
+    # children's ranges are complete when their parents merge them
+    reach = [None] * len(components)
+    remaining = parent_count[:]
+    roots = []
+    for component in range(len(components)):
+        ranges = [(first[component], last[component])]
+        for child in children[component]:
+            ranges.extend(reach[child])
+            remaining[child] -= 1
+            if not remaining[child]:
+                reach[child] = None  # Every parent has merged it
+        ranges = _merge_ranges(ranges)
+        if parent_count[component]:
+            reach[component] = ranges
+        else:
+            cells = sum(totals[stop + 1] - totals[start] for start, stop in ranges)
+            roots.append((min(components[component]), cells - 1))
+    roots.sort(key=lambda root: (-root[1], root[0]))
+    return roots
+
+
+def _merge_ranges(ranges):
+    """Sorted, non-overlapping union of inclusive (start, stop) ranges"""
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, stop in ranges[1:]:
+        last_start, last_stop = merged[-1]
+        if start <= last_stop + 1:
+            if stop > last_stop:
+                merged[-1] = (last_start, stop)
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _strongly_connected(graph):
+    """
+    Strongly connected components of a graph given as adjacency lists
+    (iterative Tarjan), each listed after every component it reaches
+
+    Returns:
+        (list of components as lists of nodes, component index of each node)
+    """
+    order = [-1] * len(graph)
+    low = [0] * len(graph)
+    component_of = [-1] * len(graph)
+    components = []
+    open_nodes = []
+    counter = 0
+    for start in range(len(graph)):
+        if order[start] != -1:
+            continue
+        order[start] = low[start] = counter
+        counter += 1
+        open_nodes.append(start)
+        stack = [(start, 0)]
+        while stack:
+            node, position = stack[-1]
+            edges = graph[node]
+            if position < len(edges):
+                stack[-1] = (node, position + 1)
+                target = edges[position]
+                if order[target] == -1:
+                    order[target] = low[target] = counter
+                    counter += 1
+                    open_nodes.append(target)
+                    stack.append((target, 0))
+                elif component_of[target] == -1 and order[target] < low[node]:
+                    low[node] = order[target]  # Still open: part of a cycle
+                continue
+            stack.pop()
+            if stack and low[node] < low[stack[-1][0]]:
+                low[stack[-1][0]] = low[node]
+            if low[node] == order[node]:
+                component = []
+                while True:
+                    member = open_nodes.pop()
+                    component_of[member] = len(components)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components, component_of
@@ -0,0 +1,170 @@
+import time
+import unittest
+from random import Random
+
+from formulas import (
+    MAX_COLUMN,
+    MAX_ROW,
+    Reference,
+    column_index,
+    column_letters,
+    find_root_causes,
+    references,
+    tokenize,
+    translate,
+)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestReferences(unittest.TestCase):
+    def test_columns(self):
+        for index in (1, 26, 27, 702, 703, MAX_COLUMN):
+            self.assertEqual(column_index(column_letters(index)), index)
+        self.assertEqual(column_letters(MAX_COLUMN), "XFD")
+
+    def test_tokenize_round_trips(self):
+        formula = "IF(A1>=0,SUM('Q1 ''24'!B2:B9)&\"a\"\"b\",{1,2;3,4})"
+        tokens = tokenize(formula)
+        self.assertEqual("".join(text for _, text in tokens), formula)
+        self.assertIn(("ref", "'Q1 ''24'!B2:B9"), tokens)
+        self.assertIn(("string", '"a""b"'), tokens)
+
+    def test_functions_and_names_are_not_cells(self):
+        tokens = tokenize("LOG10(A1)+ABCD1+_xlfn.X(1)")
+        kinds = {text: kind for kind, text in tokens}
+        self.assertEqual(kinds["LOG10"], "function")
+        self.assertEqual(kinds["A1"], "ref")
+        self.assertEqual(kinds["ABCD1"], "name")
+        self.assertEqual(kinds["_xlfn.X"], "function")
+
+    def test_references(self):
+        names = {"RATE": "Inputs!$B$2", "LOOP": "Loop+A1"}
+        self.assertEqual(
+            references("=SUM(A1:B2)*'My Sheet'!$C$3+Rate+Loop+x!A:A+3:4", "S", names),
+            [
+                Reference("S", 1, 1, 2, 2),
+                Reference("My Sheet", 3, 3, 3, 3),
+                Reference("Inputs", 2, 2, 2, 2),
+                Reference("S", 1, 1, 1, 1),
+                Reference("x", 1, 1, MAX_ROW, 1),
+                Reference("S", 3, 1, 4, MAX_COLUMN),
+            ],
+        )
+        # Other workbooks, sheet spans and computed references are skipped
+        self.assertEqual(
+            references('[1]Data!A1+Jan:Dec!B2+INDIRECT("C3")+"D4"', "S"), []
+        )
+
+    def test_translate(self):
+        self.assertEqual(
+            translate("SUM(A1:$B2)+Sheet2!C$3+$D$4+A:A+1:1", 2, 1),
+            "SUM(B3:$B4)+Sheet2!D$3+$D$4+B:B+3:3",
+        )
+        self.assertEqual(translate('A2&"A1"', -1, 0), 'A1&"A1"')
+        self.assertEqual(translate("A1+B2", -1, 0), "#REF!+B1")
+        self.assertEqual(translate("XFD1", 0, 1), "#REF!")
+
+
+class TestFindRootCauses(unittest.TestCase):
+    def test_cascade(self):
+        cells = [
+            ("S", 1, 1, "#DIV/0!", "B1/0"),  # root
+            ("S", 1, 3, "#DIV/0!", "A1*2"),
+            ("s", 5, 3, "#DIV/0!", "SUM(A1:C3)"),  # Sheet names ignore case
+            ("T", 1, 1, "#N/A", None),  # root
+            ("T", 2, 1, "#N/A", "S!C5+A1"),
+            ("T", 9, 9, "#REF!", "#REF!+A1:A3"),  # In both cascades
+        ]
+        self.assertEqual(find_root_causes(cells), [(0, 4), (3, 2)])
+
+        cells.append(("T", 9, 10, "#REF!", "#REF!"))
+        self.assertEqual(find_root_causes(cells), [(0, 4), (3, 2), (6, 0)])
+
+    def test_cycles_report_one_cell(self):
+        cells = [
+            ("S", 1, 1, "#NUM!", "A2"),
+            ("S", 2, 1, "#NUM!", "A3"),
+            ("S", 3, 1, "#NUM!", "A1"),
+            ("S", 4, 1, "#NUM!", "A3"),
+        ]
+        self.assertEqual(find_root_causes(cells), [(0, 3)])
+
+    def test_benchmark(self):
+        """Print timings for a 50,000-cell error cascade with column totals."""
+        cells = [("Inputs", 1, 1, "#REF!", "#REF!")]
+        for column in range(2, 12):
+            for row in range(1, 5000):
+                cells.append(("Model", row, column, "#REF!", f"Inputs!$A$1*{row}"))
+            letter = column_letters(column)
+            total = f"SUM({letter}1:{letter}4999)"
+            cells.append(("Model", 5000, column, "#REF!", total))
+
+        start = time.perf_counter()
+        roots = find_root_causes(cells)
+        elapsed = time.perf_counter() - start
+        print(f"\n{len(cells)} error cells: {elapsed * 1000:.0f} ms")
+        self.assertEqual(roots, [(0, len(cells) - 1)])
+
+    def test_matches_a_walk_from_every_cell(self):
+        random = Random(7)
+        for trial in range(40):
+            cells = []
+            for idx in range(random.randint(1, 30)):
+                row, column = divmod(idx, 6)
+                refs = [
+                    f"{column_letters(random.randint(1, 6))}{random.randint(1, 6)}"
+                    for _ in range(random.choice([0, 1, 1, 2, 3]))
+                ]
+                formula = "+".join(refs) or random.choice([None, "#REF!"])
+                cells.append(("S", row + 1, column + 1, "#REF!", formula))
+            with self.subTest(trial=trial):
+                self.assertEqual(find_root_causes(cells), walk_root_causes(cells))
+
+    def test_many_roots_scale(self):
+        """Print timings for roots that all feed one long chain and a cycle."""
+        for roots, chain in ((500, 5000), (2000, 20000)):
+            cells = [("Inputs", row, 1, "#N/A", None) for row in range(1, roots + 1)]
+            cells.append(("Model", 1, 1, "#N/A", f"SUM(Inputs!A1:A{roots})+B1"))
+            cells.append(("Model", 1, 2, "#N/A", "A2"))
+            for row in range(2, chain + 1):
+                cells.append(("Model", row, 1, "#N/A", f"A{row - 1}+B1"))
+
+            start = time.perf_counter()
+            causes = find_root_causes(cells)
+            elapsed = time.perf_counter() - start
+            print(f"\n{roots} roots, {chain}-cell chain: {elapsed * 1000:.0f} ms")
+            self.assertEqual(causes, [(idx, chain + 1) for idx in range(roots)])
+
+
+def walk_root_causes(cells):
+    """find_root_causes by a breadth-first walk from every cell."""
+    positions = {(cell[0], cell[1], cell[2]): idx for idx, cell in enumerate(cells)}
+    dependents = [set() for _ in cells]
+    for idx, (sheet, _, _, _, formula) in enumerate(cells):
+        for ref in references(formula or "", sheet):
+            for row in range(ref.first_row, ref.last_row + 1):
+                for column in range(ref.first_column, ref.last_column + 1):
+                    precedent = positions.get((ref.sheet, row, column))
+                    if precedent not in (None, idx):
+                        dependents[precedent].add(idx)
+    reach = []
+    for idx in range(len(cells)):
+        seen = {idx}
+        queue = [idx]
+        for cell in queue:
+            for dependent in dependents[cell] - seen:
+                seen.add(dependent)
+                queue.append(dependent)
+        reach.append(seen)
+    causes = []
+    for idx in range(len(cells)):
+        # Reported when only cells in its own cycle reach it, once per cycle
+        upstream = [other for other in range(len(cells)) if idx in reach[other]]
+        if all(other in reach[idx] and other >= idx for other in upstream):
+            causes.append((idx, len(reach[idx]) - 1))
+    causes.sort(key=lambda cause: (-cause[1], cause[0]))
+    return causes
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,61 @@
 """
 Excel Formula Recalculation Script
 Recalculates all formulas in an Excel file using LibreOffice
+
+Run `python recalc.py --serve` to keep LibreOffice running between calls;
+later invocations hand their workbooks to that server instead of starting
+a new soffice process for each one.
 """
 
+import contextlib
+import getpass
 import json
+import math
+import queue
+import shutil
+import signal
+import stat
 import sys
 import subprocess
 import os
 import platform
+import posixpath
+import tempfile
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
 from pathlib import Path
-from openpyxl import load_workbook
+
+from formulas import cell_name, column_index, find_root_causes, split_cell, translate
+
+EXCEL_ERRORS = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
+MAX_LOCATIONS = 20  # Locations listed per error type
+# Below this much sheet XML, starting worker processes costs more than it saves
+PARALLEL_SCAN_MIN_BYTES = 4 * 2**20
+# Formula types openpyxl reads as objects rather than '=...' strings
+NON_STRING_FORMULAS = ('array', 'dataTable')
+
+# SpreadsheetML element names used when scanning the sheet XML
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+SHEET_TAG = NS_MAIN + 'sheet'
+DEFINED_NAME_TAG = NS_MAIN + 'definedName'
+SHEET_DATA_TAG = NS_MAIN + 'sheetData'
+ROW_TAG = NS_MAIN + 'row'
+CELL_TAG = NS_MAIN + 'c'
+FORMULA_TAG = NS_MAIN + 'f'
+VALUE_TAG = NS_MAIN + 'v'
+INLINE_STRING_TAG = NS_MAIN + 'is'
+SI_TAG = NS_MAIN + 'si'
+RUN_TAG = NS_MAIN + 'r'
+T_TAG = NS_MAIN + 't'
+REL_ID_ATTR = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+# Overrides the socket path (or Windows pipe name) of the recalculation server
+SERVER_ENV = 'RECALC_SERVER'
 
 
 def setup_libreoffice_macro():
@@ -50,13 +96,17 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def recalc(filename, timeout=30, engine='auto'):
     """
     Recalculate formulas in Excel file and report any errors
     
     Args:
         filename: Path to Excel file
         timeout: Maximum time to wait for recalculation (seconds)
+        engine: 'libreoffice', 'python' for the built-in evaluator (common
+            functions only, see evaluator.py), or 'auto' to use LibreOffice
+            and fall back to the evaluator when soffice is missing, fails or
+            does not finish in time
     
     Returns:
         dict with error locations and counts
@@ -64,9 +114,14 @@ def recalc(filename, timeout=30):
     if not Path(filename).exists():
         return {'error': f'File {filename} does not exist'}
     
+    if engine == 'python' or (engine == 'auto' and shutil.which('soffice') is None):
+        return recalc_in_python(filename)
+    
     abs_path = str(Path(filename).absolute())
     
     if not setup_libreoffice_macro():
+        if engine == 'auto':
+            return recalc_in_python(filename)
         return {'error': 'Failed to setup LibreOffice macro'}
     
     cmd = [
@@ -75,51 +130,480 @@ def recalc(filename, timeout=30):
         abs_path
     ]
     
-    # Handle timeout command differences between Linux and macOS
-    if platform.system() != 'Windows':
-        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
-        if platform.system() == 'Darwin':
-            # Check if gtimeout is available on macOS
-            try:
-                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
-                timeout_cmd = 'gtimeout'
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
+    with snapshot(filename) as original:
+        try:
+            result = run_with_timeout(cmd, timeout)
+        except subprocess.TimeoutExpired:
+            if engine == 'auto':
+                return recalc_in_python(filename, original)
+            # soffice may have been killed while saving
+            shutil.copyfile(original, filename)
+            return check_workbook(filename, original=original)
+        
+        if result.returncode != 0:
+            if engine == 'auto':
+                return recalc_in_python(filename, original)
+            error_msg = result.stderr or 'Unknown error during recalculation'
+            if 'Module1' in error_msg or 'RecalculateAndSave' not in error_msg:
+                return {'error': 'LibreOffice macro not configured properly'}
+            else:
+                return {'error': error_msg}
         
-        if timeout_cmd:
-            cmd = [timeout_cmd, str(timeout)] + cmd
+        return check_workbook(filename, original=original)
+
+
+def run_with_timeout(cmd, timeout):
+    """
+    Run a command, killing it and every process it started if it is still
+    running after timeout seconds (soffice hands the work to soffice.bin)
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    Raises:
+        subprocess.TimeoutExpired once the processes have been killed
+    """
+    posix = os.name == 'posix'
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        start_new_session=posix,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        with contextlib.suppress(ProcessLookupError):
+            if posix:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        proc.communicate()
+        raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def recalc_in_python(filename, original=None):
+    """
+    Recalculate with the built-in formula evaluator and report errors as
+    recalc() does, adding the formulas it could not evaluate
     
-    if result.returncode != 0 and result.returncode != 124:  # 124 is timeout exit code
-        error_msg = result.stderr or 'Unknown error during recalculation'
-        if 'Module1' in error_msg or 'RecalculateAndSave' not in error_msg:
-            return {'error': 'LibreOffice macro not configured properly'}
+    Args:
+        filename: Path to Excel file
+        original: Copy of the file from before recalculation, if already made;
+            it is copied back over filename first, since an office that was
+            killed or failed may have left the file half-written
+    
+    Returns:
+        dict with error locations and counts, and 'engine': 'python'
+    """
+    from evaluator import evaluate_workbook  # evaluator imports this module
+    
+    with contextlib.ExitStack() as stack:
+        if original is None:
+            original = stack.enter_context(snapshot(filename))
         else:
-            return {'error': error_msg}
+            shutil.copyfile(original, filename)
+        try:
+            stats = evaluate_workbook(filename)
+        except Exception as e:
+            return {'error': f'Formula evaluation failed: {e}'}
+        result = check_workbook(filename, original=original)
+    if 'error' in result:
+        return result
+    result['engine'] = 'python'
+    if stats['not_evaluated']['count']:
+        result['not_evaluated'] = stats['not_evaluated']
+    if stats['circular']['count']:
+        result['circular_references'] = stats['circular']
+    return result
+
+
+@contextlib.contextmanager
+def snapshot(filename):
+    """Temporary copy of a file, to compare with once it has been recalculated"""
+    fd, path = tempfile.mkstemp(suffix=Path(filename).suffix)
+    os.close(fd)
+    try:
+        shutil.copyfile(filename, path)
+        yield path
+    finally:
+        os.unlink(path)
+
+
+def _part_path(base, target):
+    """Resolve a relationship target against the part it belongs to"""
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+
+
+def _rels(zf, part):
+    """Map rIds to (type, part path) for a part's relationships"""
+    rels_path = posixpath.join(
+        posixpath.dirname(part), '_rels', posixpath.basename(part) + '.rels'
+    )
+    try:
+        xml = zf.read(rels_path)
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in ET.fromstring(xml):
+        if rel.get('TargetMode') != 'External':
+            rels[rel.get('Id')] = (rel.get('Type'), _part_path(part, rel.get('Target')))
+    return rels
+
+
+def string_text(element):
+    """Plain text of a shared or inline string, without phonetic runs"""
+    parts = []
+    for child in element:
+        if child.tag == T_TAG:
+            parts.append(child.text or '')
+        elif child.tag == RUN_TAG:
+            parts.append(child.findtext(T_TAG) or '')
+    return ''.join(parts)
+
+
+def _classify(text):
+    """
+    (first Excel error in text or None, whether text reads as a formula),
+    or None when neither applies
+    """
+    if not text:
+        return None
+    err = next((err for err in EXCEL_ERRORS if err in text), None)
+    is_formula_text = text[0] == '='
+    if err or is_formula_text:
+        return err, is_formula_text
+    return None
+
+
+def read_workbook_parts(zf):
+    """
+    Find the worksheets, shared strings and defined names of an open .xlsx
+    archive
+    
+    Returns:
+        (sheets, shared_strings_path, names) where sheets lists (name, part
+        path) in workbook order, shared_strings_path is None if there are no
+        shared strings, and names maps upper-cased defined names to formulas
+    """
+    workbook_path = next(
+        path for rel_type, path in _rels(zf, '').values()
+        if rel_type.endswith('/officeDocument')
+    )
+    workbook_rels = _rels(zf, workbook_path)
+    workbook = ET.fromstring(zf.read(workbook_path))
+    sheets = []
+    for sheet in workbook.iter(SHEET_TAG):
+        rel_type, path = workbook_rels[sheet.get(REL_ID_ATTR)]
+        # Chartsheets and dialog sheets have no cells
+        if rel_type.endswith('/worksheet'):
+            sheets.append((sheet.get('name'), path))
+    shared_strings_path = next(
+        (path for rel_type, path in workbook_rels.values()
+         if rel_type.endswith('/sharedStrings')),
+        None,
+    )
+    names = {
+        name.get('name').upper(): name.text
+        for name in workbook.iter(DEFINED_NAME_TAG)
+        if name.text and not name.get('name').startswith('_xlnm.')
+    }
+    return sheets, shared_strings_path, names
+
+
+def scan_shared_strings(zf, path):
+    """
+    Classify the shared strings table without keeping the strings
+    
+    Returns:
+        list with _classify's result for each shared string
+    """
+    flags = []
+    if path is None:
+        return flags
+    # Share one tuple per kind of flag instead of one per string
+    kinds = {}
+    with zf.open(path) as f:
+        for _, element in ET.iterparse(f):
+            if element.tag == SI_TAG:
+                flag = _classify(string_text(element))
+                flags.append(kinds.setdefault(flag, flag))
+                element.clear()
+    return flags
+
+
+def scan_sheet(zf, path, sheet_name, shared_strings):
+    """
+    Stream one worksheet's XML, collecting errors and counting formulas
+    
+    Cells holding text that contains an Excel error are reported, like the
+    error values LibreOffice writes (t="e"). Formulas are the <f> elements
+    other than array and data table formulas, which openpyxl does not read
+    as formula strings; text starting with '=' also counts, as it did when
+    scanning with openpyxl.
+    
+    Returns:
+        (error_details, formula_count, error_cells) where error_details maps
+        each error to [count, first locations], with only MAX_LOCATIONS
+        locations kept, and error_cells lists (row, column, error, formula)
+        for every error, formula being None for values
+    """
+    error_details = {}
+    error_cells = []
+    formula_count = 0
+    row_number = 0
+    column_number = 0
+    sheet_data = None
+    # Text of shared formulas by index, with the cell it is written for
+    shared_formulas = {}
+    # Array formulas spanning several cells; only the first cell has <f>
+    array_formulas = []
+
+    def add_error(err, reference, formula):
+        details = error_details.setdefault(err, [0, []])
+        details[0] += 1
+        if len(details[1]) < MAX_LOCATIONS:
+            reference = reference or cell_name(row_number, column_number)
+            details[1].append(f"{sheet_name}!{reference}")
+        error_cells.append((row_number, column_number, err, formula_text(formula)))
+
+    def formula_text(formula):
+        if formula is None:
+            for (top, left, bottom, right), text in array_formulas:
+                if top <= row_number <= bottom and left <= column_number <= right:
+                    return text
+            return None
+        if formula.get('t') == 'shared' and not formula.text:
+            master = shared_formulas.get(formula.get('si'))
+            if master is None:
+                return None
+            master_row, master_column, text = master
+            return translate(
+                text, row_number - master_row, column_number - master_column
+            )
+        if formula.get('t') == 'dataTable':
+            return None
+        return formula.text
+
+    with zf.open(path) as f:
+        for event, element in ET.iterparse(f, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == ROW_TAG:
+                    row = element.get('r')
+                    row_number = int(row) if row else row_number + 1
+                    column_number = 0
+                elif tag == SHEET_DATA_TAG:
+                    sheet_data = element
+                continue
+            if tag == CELL_TAG:
+                reference = element.get('r')
+                if reference:
+                    column_number = column_index(reference.rstrip('0123456789'))
+                else:
+                    column_number += 1
+                cell_type = element.get('t')
+
+                formula = element.find(FORMULA_TAG)
+                if formula is not None:
+                    formula_type = formula.get('t')
+                    if formula_type not in NON_STRING_FORMULAS:
+                        formula_count += 1
+                    if formula_type == 'shared' and formula.text:
+                        shared_formulas[formula.get('si')] = (
+                            row_number, column_number, formula.text
+                        )
+                    elif formula_type == 'array' and ':' in formula.get('ref', ''):
+                        first, last = formula.get('ref').split(':')
+                        bounds = split_cell(first) + split_cell(last)
+                        array_formulas.append((bounds, formula.text))
+
+                if cell_type == 's':
+                    value = element.findtext(VALUE_TAG)
+                    flag = shared_strings[int(value)] if value else None
+                elif cell_type in ('e', 'str'):
+                    flag = _classify(element.findtext(VALUE_TAG))
+                elif cell_type == 'inlineStr':
+                    inline = element.find(INLINE_STRING_TAG)
+                    flag = None if inline is None else _classify(string_text(inline))
+                else:
+                    flag = None
+
+                if flag:
+                    err, is_formula_text = flag
+                    if err:
+                        add_error(err, reference, formula)
+                    if is_formula_text and formula is None:
+                        formula_count += 1
+            elif tag == ROW_TAG and sheet_data is not None:
+                # Drop finished rows so memory stays flat however long the sheet is
+                sheet_data.clear()
+    return error_details, formula_count, error_cells
+
+
+def _scan_sheet_task(task):
+    filename, path, sheet_name, shared_strings = task
+    with zipfile.ZipFile(filename) as zf:
+        return scan_sheet(zf, path, sheet_name, shared_strings)
+
+
+def scan_sheets_parallel(filename, sheets, sizes, shared_strings, jobs):
+    """
+    Scan worksheets in worker processes that each open the archive themselves
+    
+    Sheets are handed out largest first, so the total time stays close to
+    that of the largest sheet instead of waiting on it at the end.
+    
+    Returns:
+        scan_sheet results in workbook order
+    """
+    order = sorted(range(len(sheets)), key=lambda idx: sizes[idx], reverse=True)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            idx: executor.submit(
+                _scan_sheet_task,
+                (str(filename), sheets[idx][1], sheets[idx][0], shared_strings),
+            )
+            for idx in order
+        }
+        return [futures[idx].result() for idx in range(len(sheets))]
+
+
+def iter_formula_values(zf, path):
+    """
+    Stream the cached results of a worksheet's formulas
+    
+    Yields:
+        (row, column, value type, value) in sheet order; value is None for
+        formulas without a cached result
+    """
+    row_number = 0
+    column_number = 0
+    sheet_data = None
+    with zf.open(path) as f:
+        for event, element in ET.iterparse(f, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == ROW_TAG:
+                    row = element.get('r')
+                    row_number = int(row) if row else row_number + 1
+                    column_number = 0
+                elif tag == SHEET_DATA_TAG:
+                    sheet_data = element
+                continue
+            if tag == CELL_TAG:
+                reference = element.get('r')
+                if reference:
+                    column_number = column_index(reference.rstrip('0123456789'))
+                else:
+                    column_number += 1
+                if element.find(FORMULA_TAG) is not None:
+                    yield (
+                        row_number,
+                        column_number,
+                        element.get('t', 'n'),
+                        element.findtext(VALUE_TAG) or None,
+                    )
+            elif tag == ROW_TAG and sheet_data is not None:
+                sheet_data.clear()
+
+
+def _same_value(before, after):
+    if before[2] != after[2]:
+        return False
+    if before[2] == 'n':
+        try:
+            return math.isclose(float(before[3]), float(after[3]), rel_tol=1e-12)
+        except (TypeError, ValueError):
+            pass
+    return before[3] == after[3]
+
+
+def compare_formula_values(original, filename):
+    """
+    Find the formulas whose cached results differ between two versions of
+    a workbook, walking both copies of each sheet side by side
+    
+    Returns:
+        ([count, first locations] of formulas whose value changed, number of
+        formulas that had no cached value before)
+    """
+    changed = [0, []]
+    computed = 0
+    with zipfile.ZipFile(original) as before_zf, zipfile.ZipFile(filename) as after_zf:
+        before_sheets = dict(read_workbook_parts(before_zf)[0])
+        for sheet_name, path in read_workbook_parts(after_zf)[0]:
+            if sheet_name not in before_sheets:
+                continue
+            before_cells = iter_formula_values(before_zf, before_sheets[sheet_name])
+            before = next(before_cells, None)
+            for after in iter_formula_values(after_zf, path):
+                # Skip formulas that are gone from the recalculated copy
+                while before is not None and before[:2] < after[:2]:
+                    before = next(before_cells, None)
+                if before is None or before[:2] != after[:2]:
+                    continue
+                if before[3] is None:
+                    computed += after[3] is not None
+                elif not _same_value(before, after):
+                    changed[0] += 1
+                    if len(changed[1]) < MAX_LOCATIONS:
+                        changed[1].append(f"{sheet_name}!{cell_name(*after[:2])}")
+    return changed, computed
+
+
+def check_workbook(filename, jobs=None, original=None):
+    """
+    Scan a recalculated Excel file for formula errors
+    
+    Reads each worksheet's XML in a single streaming pass, so memory use does
+    not grow with the number of cells. Workbooks with several large sheets
+    are scanned one sheet per worker process. Cascaded errors are traced back
+    to the cells they start from (root_causes).
     
+    Args:
+        filename: Path to Excel file
+        jobs: Number of worker processes (default: one per CPU when the sheets
+            hold at least PARALLEL_SCAN_MIN_BYTES of XML, otherwise 1)
+        original: Copy of the file from before recalculation; when given, the
+            formulas whose values changed are reported too
+    
+    Returns:
+        dict with error locations and counts
+    """
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
-        wb = load_workbook(filename, data_only=True)
+        error_details = {err: [0, []] for err in EXCEL_ERRORS}
+        formula_count = 0
         
-        excel_errors = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
-        error_details = {err: [] for err in excel_errors}
-        total_errors = 0
+        with zipfile.ZipFile(filename) as zf:
+            sheets, shared_strings_path, names = read_workbook_parts(zf)
+            shared_strings = scan_shared_strings(zf, shared_strings_path)
+            sizes = [zf.getinfo(path).file_size for _, path in sheets]
+            if jobs is None:
+                large = sum(sizes) >= PARALLEL_SCAN_MIN_BYTES
+                jobs = (os.cpu_count() or 1) if large else 1
+            jobs = max(1, min(jobs, len(sheets)))
+            if jobs == 1:
+                sheet_results = [
+                    scan_sheet(zf, path, sheet_name, shared_strings)
+                    for sheet_name, path in sheets
+                ]
+        if jobs > 1:
+            sheet_results = scan_sheets_parallel(
+                filename, sheets, sizes, shared_strings, jobs
+            )
         
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            # Check ALL rows and columns - no limits
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value is not None and isinstance(cell.value, str):
-                        for err in excel_errors:
-                            if err in cell.value:
-                                location = f"{sheet_name}!{cell.coordinate}"
-                                error_details[err].append(location)
-                                total_errors += 1
-                                break
+        error_cells = []
+        for (sheet_name, _), (sheet_errors, sheet_formulas, sheet_error_cells) in zip(
+            sheets, sheet_results
+        ):
+            for err, (count, locations) in sheet_errors.items():
+                details = error_details[err]
+                details[0] += count
+                details[1].extend(locations[:MAX_LOCATIONS - len(details[1])])
+            formula_count += sheet_formulas
+            error_cells.extend((sheet_name,) + cell for cell in sheet_error_cells)
         
-        wb.close()
+        total_errors = sum(count for count, _ in error_details.values())
         
         # Build result summary
         result = {
@@ -129,50 +613,380 @@ def recalc(filename, timeout=30):
         }
         
         # Add non-empty error categories
-        for err_type, locations in error_details.items():
-            if locations:
+        for err_type, (count, locations) in error_details.items():
+            if count:
                 result['error_summary'][err_type] = {
-                    'count': len(locations),
-                    'locations': locations[:20]  # Show up to 20 locations
+                    'count': count,
+                    'locations': locations  # Show up to 20 locations
                 }
         
-        # Add formula count for context - also check ALL cells
-        wb_formulas = load_workbook(filename, data_only=False)
-        formula_count = 0
-        for sheet_name in wb_formulas.sheetnames:
-            ws = wb_formulas[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                        formula_count += 1
-        wb_formulas.close()
+        if error_cells:
+            roots = find_root_causes(error_cells, names)
+            result['root_causes'] = {'count': len(roots), 'cells': []}
+            for idx, dependent_errors in roots[:MAX_LOCATIONS]:
+                sheet_name, row, column, err, formula = error_cells[idx]
+                location = f"{sheet_name}!{cell_name(row, column)}"
+                cell = {'location': location, 'error': err}
+                if formula is not None:
+                    cell['formula'] = '=' + formula
+                cell['dependent_errors'] = dependent_errors
+                result['root_causes']['cells'].append(cell)
         
         result['total_formulas'] = formula_count
         
+        if original is not None:
+            changed, computed = compare_formula_values(original, filename)
+            result['changed_formulas'] = {
+                'count': changed[0],
+                'locations': changed[1]
+            }
+            result['newly_computed_formulas'] = computed
+        
         return result
         
     except Exception as e:
         return {'error': str(e)}
 
 
+def server_directory():
+    """
+    Directory only this user can access, holding the recalculation server's
+    socket and key ($XDG_RUNTIME_DIR/recalc, or recalc-<user> in the temp
+    directory; %LOCALAPPDATA%\\recalc on Windows)
+    
+    Raises:
+        PermissionError if the directory belongs to another user or other
+        users can access it
+    """
+    if platform.system() == 'Windows':
+        # The user profile is only accessible to its owner
+        path = Path(os.environ.get('LOCALAPPDATA') or Path.home()) / 'recalc'
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        path = Path(os.environ['XDG_RUNTIME_DIR']) / 'recalc'
+    else:
+        path = Path(tempfile.gettempdir()) / f'recalc-{getpass.getuser()}'
+    with contextlib.suppress(FileExistsError):
+        path.mkdir(mode=0o700)
+    info = os.lstat(path)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise PermissionError(f'{path} must be a directory only its owner can access')
+    return path
+
+
+def default_server_address():
+    """Local socket path (a named pipe on Windows) of the recalculation server"""
+    if os.environ.get(SERVER_ENV):
+        return os.environ[SERVER_ENV]
+    if platform.system() == 'Windows':
+        return rf'\\.\pipe\recalc-{getpass.getuser()}'
+    return str(server_directory() / 'server.sock')
+
+
+def server_key(create=False):
+    """
+    Secret the server and its clients authenticate each other with, kept in
+    server_directory()
+    
+    Args:
+        create: Replace the key with a new one (when a server starts)
+    
+    Returns:
+        the key, or None if no server has created one
+    """
+    path = server_directory() / 'authkey'
+    if not create:
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+    key = os.urandom(32)
+    tmp_path = path.with_name(f'authkey.{os.getpid()}.tmp')
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(tmp_path)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    os.replace(tmp_path, path)
+    return key
+
+
+class OfficeInstance:
+    """A headless soffice process kept running and driven over a UNO bridge"""
+
+    def __init__(self, index):
+        self.name = f'recalc-{os.getpid()}-{index}'
+        self.profile_dir = None
+        self.process = None
+        self.desktop = None
+
+    def start(self, timeout=60):
+        # The uno module ships with LibreOffice (python3-uno on Debian/Ubuntu)
+        import uno
+        from com.sun.star.connection import NoConnectException
+
+        if self.profile_dir is None:
+            # Each running office needs a user profile of its own
+            self.profile_dir = tempfile.mkdtemp(prefix=f'{self.name}-')
+        self.process = subprocess.Popen(
+            [
+                'soffice', '--headless', '--invisible', '--norestore', '--nologo',
+                '--nodefault',
+                f'-env:UserInstallation={Path(self.profile_dir).as_uri()}',
+                f'--accept=pipe,name={self.name};urp;StarOffice.ComponentContext',
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context
+        )
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f'uno:pipe,name={self.name};urp;StarOffice.ComponentContext'
+                )
+                break
+            except NoConnectException:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError('Could not connect to LibreOffice')
+                time.sleep(0.2)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.frame.Desktop', context
+        )
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.desktop.terminate()
+                self.process.wait(timeout=10)
+            except Exception:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        self.desktop = None
+
+    def recalculate(self, filename, timeout):
+        """
+        Recalculate and save a workbook, restarting the office if it hangs
+        
+        Raises:
+            subprocess.TimeoutExpired if the office was killed after timeout
+            seconds, or the UNO error if loading or saving failed
+        """
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        if self.process is None or self.process.poll() is not None:
+            self.stop()
+            self.start()
+
+        hidden = PropertyValue()
+        hidden.Name = 'Hidden'
+        hidden.Value = True
+        # A stuck document would block this instance for good, so kill it
+        # after the timeout
+        watchdog = threading.Timer(timeout, self.process.kill)
+        watchdog.start()
+        try:
+            doc = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(filename), '_blank', 0, (hidden,)
+            )
+            try:
+                doc.calculateAll()
+                doc.store()
+            finally:
+                doc.close(True)
+        except Exception:
+            if watchdog.is_alive():
+                raise
+            self.stop()
+            raise subprocess.TimeoutExpired(filename, timeout) from None
+        finally:
+            watchdog.cancel()
+
+    def cleanup(self):
+        self.stop()
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class RecalcServer:
+    """
+    Recalculates workbooks sent over a local socket on a pool of resident
+    LibreOffice instances, so office startup is paid once per instance
+    
+    Like recalc(engine='auto'), a workbook the office fails on or does not
+    finish in time is recalculated with the Python evaluator instead
+    """
+
+    def __init__(self, address, pool_size):
+        self.address = address
+        self.pool_size = pool_size
+        self.instances = [OfficeInstance(idx) for idx in range(pool_size)]
+        self.idle = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=pool_size)
+
+    def recalc(self, filename, timeout):
+        if not Path(filename).exists():
+            return {'error': f'File {filename} does not exist'}
+        with snapshot(filename) as original:
+            instance = self.idle.get()
+            try:
+                instance.recalculate(filename, timeout)
+                failed = False
+            except Exception:
+                failed = True
+            finally:
+                self.idle.put(instance)
+            if failed:
+                return recalc_in_python(filename, original)
+            return check_workbook(filename, original=original)
+
+    def handle(self, conn):
+        """Answer one request: JSON {'files': [...], 'timeout': seconds}"""
+        with conn:
+            try:
+                request = json.loads(conn.recv_bytes())
+                futures = [
+                    self.executor.submit(self.recalc, filename, request['timeout'])
+                    for filename in request['files']
+                ]
+                results = [future.result() for future in futures]
+                conn.send_bytes(json.dumps(results).encode())
+            except (EOFError, OSError):
+                pass  # Client went away
+
+    def serve(self):
+        address = self.address
+        if not address.startswith('\\\\'):
+            # Replace the socket of a server that is no longer running
+            try:
+                Client(address).close()
+                raise RuntimeError(
+                    f'A recalculation server is already running at {address}'
+                )
+            except (FileNotFoundError, ConnectionRefusedError):
+                if os.path.exists(address):
+                    os.unlink(address)
+
+        list(self.executor.map(OfficeInstance.start, self.instances))
+        for instance in self.instances:
+            self.idle.put(instance)
+
+        listener = Listener(address, authkey=server_key(create=True))
+        if not address.startswith('\\\\'):
+            os.chmod(address, 0o600)
+        print(
+            f'Recalculation server with {self.pool_size} LibreOffice instance(s) '
+            f'listening on {address}',
+            flush=True,
+        )
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, AssertionError, EOFError, ConnectionError):
+                    continue  # Not a client holding the key
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            for instance in self.instances:
+                instance.cleanup()
+
+
+def serve(pool_size=None, address=None):
+    """Run a recalculation server until interrupted"""
+    pool_size = pool_size or min(4, os.cpu_count() or 1)
+    server = RecalcServer(address or default_server_address(), pool_size)
+    # Stop the office instances on kill as well as on Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+
+def recalc_on_server(filenames, timeout=30, address=None):
+    """
+    Recalculate files on a running recalculation server
+    
+    Args:
+        filenames: Paths to Excel files
+        timeout: Maximum time to wait for each recalculation (seconds)
+        address: Server address (default: default_server_address())
+    
+    Returns:
+        list of result dicts like recalc's, or None if no server is running
+        or the one listening does not hold this user's key
+    """
+    try:
+        authkey = server_key()
+        if authkey is None:
+            return None
+        conn = Client(address or default_server_address(), authkey=authkey)
+    except (OSError, EOFError, AuthenticationError, AssertionError):
+        # Python before 3.12 asserts on a peer that sends no challenge
+        return None
+    with conn:
+        conn.send_bytes(json.dumps({
+            'files': [str(Path(f).absolute()) for f in filenames],
+            'timeout': timeout,
+        }).encode())
+        return json.loads(conn.recv_bytes())
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python recalc.py <excel_file> [timeout_seconds]")
+        print("Usage: python recalc.py [--python] <excel_file>... [timeout_seconds]")
+        print("       python recalc.py --serve [pool_size]")
         print("\nRecalculates all formulas in an Excel file using LibreOffice")
+        print("\nWithout LibreOffice, or when it fails or times out, formulas are")
+        print("evaluated in Python (common functions only); --python always does that.")
+        print("\nWith --serve, keeps pool_size LibreOffice instances running (default: up")
+        print("to 4) and recalculates workbooks sent by later recalc.py calls on them,")
+        print(f"several at a time. Set {SERVER_ENV} to use a different socket.")
         print("\nReturns JSON with error details:")
         print("  - status: 'success' or 'errors_found'")
         print("  - total_errors: Total number of Excel errors found")
         print("  - total_formulas: Number of formulas in the file")
         print("  - error_summary: Breakdown by error type with locations")
         print("    - #VALUE!, #DIV/0!, #REF!, #NAME?, #NULL!, #NUM!, #N/A")
+        print("With several files, returns an object mapping each file to its result")
         sys.exit(1)
     
-    filename = sys.argv[1]
-    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    if sys.argv[1] == '--serve':
+        serve(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        return
     
-    result = recalc(filename, timeout)
-    print(json.dumps(result, indent=2))
-
+    filenames = sys.argv[1:]
+    engine = 'auto'
+    if '--python' in filenames:
+        filenames.remove('--python')
+        engine = 'python'
+    timeout = 30
+    if len(filenames) > 1 and filenames[-1].isdigit():
+        timeout = int(filenames.pop())
+    
+    results = None
+    if engine == 'auto':
+        results = recalc_on_server(filenames, timeout)
+    if results is None:
+        results = [recalc(filename, timeout, engine) for filename in filenames]
+    
+    if len(filenames) == 1:
+        print(json.dumps(results[0], indent=2))
+    else:
+        print(json.dumps(dict(zip(filenames, results)), indent=2))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,573 @@
+import contextlib
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Pipe
+from pathlib import Path
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+
+from evaluator import evaluate_workbook
+from recalc import (
+    EXCEL_ERRORS,
+    RecalcServer,
+    check_workbook,
+    recalc,
+    recalc_on_server,
+    server_directory,
+    server_key,
+)
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def check_workbook_openpyxl(filename):
+    """Reference implementation loading the workbook twice with openpyxl."""
+    wb = load_workbook(filename, data_only=True)
+    error_details = {err: [] for err in EXCEL_ERRORS}
+    total_errors = 0
+    for sheet_name in wb.sheetnames:
+        for row in wb[sheet_name].iter_rows():
+            for cell in row:
+                if cell.value is not None and isinstance(cell.value, str):
+                    for err in EXCEL_ERRORS:
+                        if err in cell.value:
+                            error_details[err].append(f"{sheet_name}!{cell.coordinate}")
+                            total_errors += 1
+                            break
+    wb.close()
+    result = {
+        "status": "success" if total_errors == 0 else "errors_found",
+        "total_errors": total_errors,
+        "error_summary": {},
+    }
+    for err_type, locations in error_details.items():
+        if locations:
+            result["error_summary"][err_type] = {
+                "count": len(locations),
+                "locations": locations[:20],
+            }
+    wb = load_workbook(filename, data_only=False)
+    formula_count = 0
+    for sheet_name in wb.sheetnames:
+        for row in wb[sheet_name].iter_rows():
+            for cell in row:
+                value = cell.value
+                if value and isinstance(value, str) and value.startswith("="):
+                    formula_count += 1
+    wb.close()
+    result["total_formulas"] = formula_count
+    return result
+
+
+def without_root_causes(result):
+    """check_workbook's result without the report openpyxl has no counterpart for."""
+    return {key: value for key, value in result.items() if key != "root_causes"}
+
+
+def write_xlsx(path, sheets, shared_strings=(), names=()):
+    """Write a minimal .xlsx from raw <sheetData> contents and <si> elements."""
+    overrides = [
+        ("/xl/workbook.xml", "sheet.main+xml"),
+        ("/xl/sharedStrings.xml", "sharedStrings+xml"),
+    ] + [
+        (f"/xl/worksheets/sheet{n}.xml", "worksheet+xml")
+        for n in range(1, len(sheets) + 1)
+    ]
+    content_types = (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        + "".join(
+            f'<Override PartName="{name}" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.spreadsheetml.{kind}"/>'
+            for name, kind in overrides
+        )
+        + "</Types>"
+    )
+    office_document = f"{REL_NS}/officeDocument"
+    workbook = (
+        f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheets>'
+        + "".join(
+            f'<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+            for n, (name, _) in enumerate(sheets, start=1)
+        )
+        + "</sheets><definedNames>"
+        + "".join(
+            f'<definedName name="{name}">{text}</definedName>' for name, text in names
+        )
+        + "</definedNames></workbook>"
+    )
+    workbook_rels = (
+        f'<Relationships xmlns="{PKG_REL_NS}">'
+        + "".join(
+            f'<Relationship Id="rId{n}" Type="{REL_NS}/worksheet" '
+            f'Target="worksheets/sheet{n}.xml"/>'
+            for n in range(1, len(sheets) + 1)
+        )
+        + f'<Relationship Id="rIdS" Type="{REL_NS}/sharedStrings" '
+        'Target="/xl/sharedStrings.xml"/></Relationships>'
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr(
+            "_rels/.rels",
+            f'<Relationships xmlns="{PKG_REL_NS}"><Relationship Id="rId1" '
+            f'Type="{office_document}" Target="xl/workbook.xml"/></Relationships>',
+        )
+        zf.writestr("xl/workbook.xml", workbook)
+        zf.writestr("xl/_rels/workbook.xml.rels", workbook_rels)
+        zf.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="{MAIN_NS}">{"".join(shared_strings)}</sst>',
+        )
+        for n, (_, sheet_data) in enumerate(sheets, start=1):
+            zf.writestr(
+                f"xl/worksheets/sheet{n}.xml",
+                f'<worksheet xmlns="{MAIN_NS}">'
+                f"<sheetData>{sheet_data}</sheetData></worksheet>",
+            )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCheckWorkbook(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_matches_openpyxl(self, path):
+        expected = check_workbook_openpyxl(path)
+        self.assertEqual(without_root_causes(check_workbook(path)), expected)
+        return expected
+
+    def test_openpyxl_workbook(self):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Inputs"
+        ws["A1"] = 10
+        ws["A2"] = "=A1*2"
+        ws["B2"] = "#DIV/0!"
+        ws["C3"] = "Lookup failed: #N/A"
+        ws = wb.create_sheet("Model")
+        for row in range(1, 40):
+            ws.cell(row=row, column=row % 5 + 1, value="#REF!")
+            ws.cell(row=row, column=8, value=f"=SUM(A{row}:E{row})")
+        wb.create_chartsheet("Chart")
+        path = self.dir / "book.xlsx"
+        wb.save(path)
+
+        # Chartsheets have no cells; openpyxl cannot scan them at all
+        result = check_workbook(path)
+        self.assertEqual(result["total_formulas"], 40)
+        self.assertEqual(result["error_summary"]["#REF!"]["count"], 39)
+        self.assertEqual(len(result["error_summary"]["#REF!"]["locations"]), 20)
+        del wb["Chart"]
+        wb.save(path)
+        self.assertEqual(check_workbook(path), result)
+        self.assert_matches_openpyxl(path)
+
+    def test_raw_cell_types(self):
+        path = self.dir / "raw.xlsx"
+        shared_strings = [
+            "<si><t>plain</t></si>",
+            "<si><t>=not a formula</t></si>",
+            # Phonetic runs are not part of the text
+            "<si><r><t>Value is </t></r><r><t>#NUM!</t></r>"
+            '<rPh sb="0" eb="1"><t>#REF!</t></rPh></si>',
+            "<si><t>=#NULL!</t></si>",
+            "<si><t></t></si>",
+        ]
+        first = (
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+            '<c r="C1" t="s"><v>2</v></c><c r="D1" t="s"><v>3</v></c>'
+            '<c r="E1" t="s"><v>4</v></c></row>'
+            # Formulas with cached error and string results
+            '<row r="3"><c r="A3" t="e"><f>1/0</f><v>#DIV/0!</v></c>'
+            '<c r="B3" t="str"><f>"x"&amp;NA()</f><v>#N/A</v></c>'
+            '<c r="C3" t="str"><f>"="&amp;1</f><v>=1</v></c>'
+            '<c r="D3" t="str"><v>=text</v></c><c r="E3"><v>4</v></c></row>'
+            # Shared formulas, including followers with no text
+            '<row r="4"><c r="A4"><f t="shared" ref="A4:C4" si="0">A3+1</f><v>1</v></c>'
+            '<c r="B4"><f t="shared" si="0"/><v>2</v></c>'
+            '<c r="C4"><f t="shared" si="0"/><v>3</v></c>'
+            '<c r="D4"><f t="shared" si="7"/><v>3</v></c></row>'
+            # Array and data table formulas are not read as formula strings
+            '<row r="5"><c r="A5"><f t="array" ref="A5:A6">SUM(B1:B2)</f><v>1</v></c>'
+            '<c r="B5"><f t="dataTable" ref="B5:B6" r1="A1"/><v>1</v></c>'
+            '<c r="C5" t="e"><f t="array" ref="C5">1/0</f><v>#DIV/0!</v></c></row>'
+            # Inline strings, including rich text and one without <is>
+            '<row r="6"><c r="A6" t="inlineStr"><is><t>#VALUE! inline</t></is></c>'
+            '<c r="B6" t="inlineStr"><is><r><t>=</t></r><r><t>inline</t></r></is></c>'
+            '<c r="C6" t="inlineStr"/><c r="D6" t="inlineStr"><is><t/></is></c>'
+            '<c r="E6" t="b"><v>1</v></c><c r="F6" t="e"><v></v></c></row>'
+        )
+        # Rows and cells without references continue from the previous ones
+        second = (
+            '<row><c t="e"><v>#NAME?</v></c><c t="s"><v>2</v></c></row>'
+            '<row r="10"><c r="C10" t="e"><v>#N/A</v></c>'
+            '<c t="e"><v>#REF!</v></c></row>'
+            '<row><c r="AA11" t="e"><v>#N/A</v></c><c><f>AA11</f><v>0</v></c>'
+            '<c t="str"><v>#NULL!</v></c></row>'
+        )
+        write_xlsx(path, [("Raw", first), ("No refs", second)], shared_strings)
+        expected = self.assert_matches_openpyxl(path)
+        self.assertEqual(expected["total_formulas"], 12)
+        self.assertEqual(
+            expected["error_summary"]["#NULL!"]["locations"], ["Raw!D1", "No refs!AC11"]
+        )
+
+    def test_large_random_workbook(self):
+        rng = random.Random(0)
+        path = self.dir / "random.xlsx"
+        wb = Workbook()
+        for sheet_idx in range(3):
+            ws = wb.active if sheet_idx == 0 else wb.create_sheet()
+            for row in range(1, 301):
+                for col in range(1, 9):
+                    roll = rng.random()
+                    if roll < 0.05:
+                        ws.cell(row=row, column=col, value=rng.choice(EXCEL_ERRORS))
+                    elif roll < 0.3:
+                        ws.cell(row=row, column=col, value=f"=A{row}+{col}")
+                    elif roll < 0.6:
+                        ws.cell(row=row, column=col, value=f"text {rng.randint(0, 50)}")
+                    else:
+                        ws.cell(row=row, column=col, value=rng.random())
+        wb.save(path)
+        self.assert_matches_openpyxl(path)
+
+    def test_root_causes(self):
+        path = self.dir / "cascade.xlsx"
+        inputs = (
+            '<row r="2"><c r="B2" t="e"><f>#REF!*2</f><v>#REF!</v></c></row>'
+            '<row r="3"><c r="B3"><v>5</v></c></row>'
+            '<row r="4"><c r="B4" t="e"><f>B3/0</f><v>#DIV/0!</v></c></row>'
+        )
+        model = (
+            '<row r="1"><c r="A1" t="e">'
+            '<f t="shared" ref="A1:A5" si="0">Inputs!$B$2+G1</f><v>#REF!</v></c>'
+            '<c r="B1" t="e"><f>SUM(A1:A5)</f><v>#REF!</v></c>'
+            '<c r="C1" t="e"><f>Rate*2</f><v>#DIV/0!</v></c>'
+            '<c r="D1" t="e"><v>#N/A</v></c>'
+            '<c r="E1" t="e"><f>E2</f><v>#NUM!</v></c>'
+            '<c r="F1" t="e"><f t="array" ref="F1:F3">Inputs!B4*{1;2;3}</f>'
+            "<v>#DIV/0!</v></c></row>"
+            '<row r="2"><c r="A2" t="e"><f t="shared" si="0"/><v>#REF!</v></c>'
+            '<c r="E2" t="e"><f>E1</f><v>#NUM!</v></c>'
+            '<c r="F2" t="e"><v>#DIV/0!</v></c></row>'
+            '<row r="3"><c r="A3" t="e"><f t="shared" si="0"/><v>#REF!</v></c>'
+            '<c r="F3" t="e"><v>#DIV/0!</v></c></row>'
+            '<row r="4"><c r="A4" t="e"><f t="shared" si="0"/><v>#REF!</v></c></row>'
+            '<row r="5"><c r="A5" t="e"><f t="shared" si="0"/><v>#REF!</v></c></row>'
+        )
+        write_xlsx(
+            path,
+            [("Inputs", inputs), ("My Model", model)],
+            names=[("Rate", "Inputs!$B$4")],
+        )
+        result = check_workbook(path)
+        self.assertEqual(result["total_errors"], 15)
+        self.assertEqual(
+            result["root_causes"],
+            {
+                "count": 4,
+                "cells": [
+                    {
+                        "location": "Inputs!B2",
+                        "error": "#REF!",
+                        "formula": "=#REF!*2",
+                        "dependent_errors": 6,
+                    },
+                    {
+                        "location": "Inputs!B4",
+                        "error": "#DIV/0!",
+                        "formula": "=B3/0",
+                        "dependent_errors": 4,
+                    },
+                    # Errors feeding each other have no root; one is reported
+                    {
+                        "location": "My Model!E1",
+                        "error": "#NUM!",
+                        "formula": "=E2",
+                        "dependent_errors": 1,
+                    },
+                    {"location": "My Model!D1", "error": "#N/A", "dependent_errors": 0},
+                ],
+            },
+        )
+        self.assertNotIn("root_causes", check_workbook(self.make_clean_workbook()))
+
+    def make_clean_workbook(self):
+        path = self.dir / "clean.xlsx"
+        wb = Workbook()
+        wb.active["A1"] = 1
+        wb.active["A2"] = "=A1+1"
+        wb.save(path)
+        return path
+
+    def test_changed_formulas(self):
+        before = self.dir / "before.xlsx"
+        after = self.dir / "after.xlsx"
+        sheet = (
+            '<row r="1"><c r="A1"><v>2</v></c><c r="B1"><f>A1*2</f><v>4</v></c>'
+            '<c r="C1"><f>A1/3</f><v>0.66666666666666663</v></c>'
+            '<c r="D1" t="str"><f>"x"&amp;A1</f><v>x2</v></c></row>'
+            '<row r="2"><c r="A2"><f>A1+1</f></c><c r="B2"><f>B1</f><v>4</v></c></row>'
+            '<row r="3"><c r="A3"><f>A1</f><v>2</v></c></row>'
+        )
+        other = '<row r="1"><c r="A1"><v>1</v></c></row>'
+        write_xlsx(before, [("Other", other), ("S", sheet)])
+        recalculated = (
+            '<row r="1"><c r="A1"><v>3</v></c><c r="B1"><f>A1*2</f><v>6</v></c>'
+            '<c r="C1"><f>A1/3</f><v>0.666666666666667</v></c>'
+            '<c r="D1" t="str"><f>"x"&amp;A1</f><v>x3</v></c></row>'
+            '<row r="2"><c r="A2"><f>A1+1</f><v>4</v></c>'
+            '<c r="B2"><f>B1</f><v>6</v></c></row>'
+            '<row r="4"><c r="A4"><f>A1</f><v>3</v></c></row>'
+        )
+        write_xlsx(after, [("S", recalculated)])
+
+        result = check_workbook(after, original=before)
+        self.assertEqual(
+            result["changed_formulas"],
+            {"count": 3, "locations": ["S!B1", "S!D1", "S!B2"]},
+        )
+        self.assertEqual(result["newly_computed_formulas"], 1)
+        self.assertNotIn("changed_formulas", check_workbook(after))
+
+    def test_parallel_scan_matches_sequential(self):
+        path = self.dir / "sheets.xlsx"
+        wb = Workbook()
+        wb.active.title = "Empty"
+        for sheet_idx in range(5):
+            ws = wb.create_sheet(f"Sheet {sheet_idx}")
+            # Uneven sizes, with errors in every sheet to merge in order
+            for row in range(1, 200 * (sheet_idx + 1)):
+                ws.append([row, f"=A{row}*2", "#REF!" if row % 30 == 0 else "ok"])
+        wb.save(path)
+
+        sequential = check_workbook(path, jobs=1)
+        self.assertEqual(sequential["error_summary"]["#REF!"]["count"], 97)
+        for jobs in (2, 8):
+            self.assertEqual(check_workbook(path, jobs=jobs), sequential)
+        self.assertEqual(check_workbook(path), sequential)
+        self.assertEqual(check_workbook_openpyxl(path), without_root_causes(sequential))
+
+    def test_benchmark_parallel(self):
+        """Print scan timings for a 4-sheet workbook, serial and on all CPUs."""
+        path = self.dir / "model.xlsx"
+        wb = Workbook(write_only=True)
+        for sheet_idx in range(4):
+            ws = wb.create_sheet(f"Sheet {sheet_idx}")
+            for row in range(1, 5001 * (sheet_idx + 1)):
+                ws.append([row, f"=A{row}*2", "label"] + [row / 3] * 5)
+        wb.save(path)
+
+        timings = {}
+        for jobs in (1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            check_workbook(path, jobs=jobs)
+            timings[jobs] = time.perf_counter() - start
+        summary = ", ".join(
+            f"{jobs} job(s) {t * 1000:.0f} ms" for jobs, t in timings.items()
+        )
+        print(f"\n4 sheets, 400,000 cells: {summary}")
+
+    def test_benchmark(self):
+        """Print scan timings for a 100,000-cell workbook."""
+        path = self.dir / "big.xlsx"
+        wb = Workbook()
+        ws = wb.active
+        for row in range(1, 10001):
+            error = "#N/A" if row % 100 == 0 else 0
+            ws.append([row, row * 2, f"=A{row}+B{row}", "label", error] + [row / 3] * 5)
+        wb.save(path)
+
+        start = time.perf_counter()
+        expected = check_workbook_openpyxl(path)
+        openpyxl_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = check_workbook(path)
+        streaming_time = time.perf_counter() - start
+
+        print(
+            f"\n100,000 cells: openpyxl {openpyxl_time * 1000:.0f} ms, "
+            f"streaming {streaming_time * 1000:.0f} ms"
+        )
+        self.assertEqual(without_root_causes(actual), expected)
+
+
+class StubOffice:
+    """OfficeInstance stand-in that computes formulas in Python.
+
+    Workbooks named slow-* take a moment, hang-* time out and broken-* make the
+    office fail, as a stuck or crashing LibreOffice would. killed-* time out
+    halfway through saving, leaving a truncated file.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    def start(self, timeout=60):
+        pass
+
+    def cleanup(self):
+        pass
+
+    def recalculate(self, filename, timeout):
+        name = Path(filename).name
+        if name.startswith("slow"):
+            time.sleep(0.3)
+        if name.startswith("hang"):
+            raise subprocess.TimeoutExpired(filename, timeout)
+        if name.startswith("killed"):
+            with open(filename, "r+b") as f:
+                f.truncate(100)
+            raise subprocess.TimeoutExpired(filename, timeout)
+        if name.startswith("broken"):
+            raise RuntimeError("LibreOffice crashed")
+        evaluate_workbook(filename)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRecalcServer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        with mock.patch("recalc.OfficeInstance", StubOffice):
+            self.server = RecalcServer(str(self.dir / "server.sock"), pool_size=2)
+        for instance in self.server.instances:
+            self.server.idle.put(instance)
+
+    def tearDown(self):
+        self.server.executor.shutdown()
+        self.tmpdir.cleanup()
+
+    def workbook(self, name, divisor=0):
+        path = self.dir / name
+        wb = Workbook()
+        wb.active["A1"] = divisor
+        wb.active["A2"] = "=1/A1"
+        wb.save(path)
+        return str(path)
+
+    def request(self, files, timeout=5):
+        client, server_end = Pipe()
+        thread = threading.Thread(target=self.server.handle, args=(server_end,))
+        thread.start()
+        with client:
+            client.send_bytes(json.dumps({"files": files, "timeout": timeout}).encode())
+            results = json.loads(client.recv_bytes())
+        thread.join()
+        return results
+
+    def test_results_in_request_order(self):
+        files = [
+            self.workbook("slow.xlsx"),
+            self.workbook("fast.xlsx", divisor=4),
+            str(self.dir / "missing.xlsx"),
+        ]
+        slow, fast, missing = self.request(files)
+        self.assertEqual(slow["total_errors"], 1)
+        self.assertEqual(slow["error_summary"]["#DIV/0!"]["locations"], ["Sheet!A2"])
+        self.assertEqual(fast["status"], "success")
+        self.assertEqual(fast["newly_computed_formulas"], 1)
+        self.assertNotIn("engine", fast)
+        self.assertIn("does not exist", missing["error"])
+        self.assertEqual(self.server.idle.qsize(), 2)
+
+    def test_timeout_and_failure_fall_back_to_python(self):
+        expected = recalc(self.workbook("reference.xlsx"), engine="python")
+        for name in ("hang.xlsx", "killed.xlsx", "broken.xlsx"):
+            with self.subTest(name=name):
+                (result,) = self.request([self.workbook(name)], timeout=1)
+                self.assertEqual(result["engine"], "python")
+                self.assertEqual(result["error_summary"], expected["error_summary"])
+                self.assertEqual(result["newly_computed_formulas"], 1)
+        # Instances are back in the pool after failing
+        self.assertEqual(self.server.idle.qsize(), 2)
+
+    def private_directory(self):
+        """Point server_directory() at a fresh directory under the test's."""
+        runtime = tempfile.mkdtemp(dir=self.dir)
+        patcher = mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": runtime})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return Path(runtime) / "recalc"
+
+    def test_recalc_on_server(self):
+        self.private_directory()
+        address = str(self.dir / "server.sock")
+        self.assertIsNone(recalc_on_server(["a.xlsx"], address=address))
+
+        listener = Listener(address, authkey=server_key(create=True))
+        thread = threading.Thread(target=lambda: self.server.handle(listener.accept()))
+        thread.start()
+        try:
+            files = [self.workbook("slow.xlsx"), self.workbook("ok.xlsx", 2)]
+            # Paths are sent absolute, since the server may run elsewhere
+            files[1] = os.path.relpath(files[1])
+            results = recalc_on_server(files, timeout=5, address=address)
+        finally:
+            thread.join()
+            listener.close()
+        self.assertEqual([r["status"] for r in results], ["errors_found", "success"])
+
+    def test_ignores_servers_without_the_key(self):
+        directory = self.private_directory()
+        server_key(create=True)
+        self.assertEqual(directory.stat().st_mode & 0o777, 0o700)
+        self.assertEqual((directory / "authkey").stat().st_mode & 0o777, 0o600)
+        marker = self.dir / "payload-ran"
+
+        class Payload:
+            def __reduce__(self):
+                return os.mkdir, (str(marker),)
+
+        def impostor(listener):
+            with contextlib.suppress(AuthenticationError, EOFError, OSError):
+                with listener.accept() as conn:
+                    conn.send(Payload())
+
+        for name, authkey in (("plain", None), ("wrong-key", b"guessed")):
+            with self.subTest(name=name):
+                address = str(self.dir / f"{name}.sock")
+                listener = Listener(address, authkey=authkey)
+                thread = threading.Thread(target=impostor, args=(listener,))
+                thread.start()
+                try:
+                    results = recalc_on_server(["a.xlsx"], address=address)
+                finally:
+                    thread.join()
+                    listener.close()
+                self.assertIsNone(results)
+                self.assertFalse(marker.exists())
+
+    def test_server_directory_must_be_private(self):
+        directory = self.private_directory()
+        directory.mkdir(mode=0o755)
+        os.chmod(directory, 0o755)
+        with self.assertRaises(PermissionError):
+            server_directory()
+        self.assertIsNone(recalc_on_server(["a.xlsx"]))
+        os.chmod(directory, 0o700)
+        self.assertEqual(server_directory(), directory)
+
+
+if __name__ == "__main__":
+    unittest.main()